@@ -1,18 +1,200 @@
+import time
+
+STARTED = time.perf_counter()
+
 import tkinter as tk
-from tkinter import filedialog, colorchooser, font, simpledialog, messagebox
+from array import array
+from itertools import accumulate
+import bisect
+import codecs
+import importlib
+import io
 import json
 import os
+import queue
+import re
+import sys
+import tempfile
+import threading
+import zlib
+
+from zenedit import textops
+from zenedit.fonts import FontService
+from zenedit.instrument import Instrumentation, StartupProfile
+from zenedit.piece_table import PieceTable
+from zenedit.undo import UndoHistory
+
+class LazyModule:
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attribute):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attribute)
+
+filedialog = LazyModule("tkinter.filedialog")
+colorchooser = LazyModule("tkinter.colorchooser")
+simpledialog = LazyModule("tkinter.simpledialog")
+messagebox = LazyModule("tkinter.messagebox")
+mmap = LazyModule("mmap")
+multiprocessing = LazyModule("multiprocessing")
+futures = LazyModule("concurrent.futures")
+compression = LazyModule("zenedit.compression")
+findfiles = LazyModule("zenedit.findfiles")
+highlight = LazyModule("zenedit.highlight")
+session = LazyModule("zenedit.session")
 
 class ZenEdit:
-    def __init__(self, root):
+    def __init__(self, root, startup_profile=None):
         self.root = root
+        self.startup_profile = startup_profile
+        self.startup_pending = True
         self.root.geometry("800x495")
         self.root.title("ZenEdit")
+        self.tk_astral_units = int(self.root.tk.call("string", "length", "\U0001F600"))
         self.config_file = "editor_config.json"
-        self.auto_save_file = "default_autosave.txt"
+        self.current_file_path = None
         self.auto_save_enabled = tk.BooleanVar(value=True)
         self.auto_save_enabled.trace('w', self.update_config_auto_save)
         self.auto_save_interval = 5000
+        self.auto_save_debounce = 1000
+        self.edit_generation = 0
+        self.auto_save_generation = 0
+        self.last_edit_time = 0.0
+        self.save_chunk_size = 1024 * 1024
+        umask = os.umask(0)
+        os.umask(umask)
+        self.new_file_mode = 0o666 & ~umask
+        self.save_poll_interval = 50
+        self.save_jobs = queue.Queue()
+        self.save_results = queue.Queue()
+        self.save_worker = None
+        self.saves_pending = 0
+        self.load_first_chunk_size = 64 * 1024
+        self.load_chunk_size = 1024 * 1024
+        self.load_poll_interval = 10
+        self.load_batch_time = 0.03
+        self.loading = False
+        self.loaded_size = None
+        self.file_encoding = None
+        self.file_compression = None
+        self.follow = None
+        self.follow_partial = False
+        self.follow_id = None
+        self.follow_applying = False
+        self.follow_poll_interval = 250
+        self.follow_read_limit = 1024 * 1024
+        self.disk_stat = None
+        self.disk_warned = None
+        self.watch_id = None
+        self.watch_interval = 1000
+        self.reload_job = None
+        self.reload_results = queue.Queue()
+        self.reload_poll_interval = 20
+        self.viewer_mmap = None
+        self.viewer_search_cancel = None
+        self.viewer_window = 400
+        self.viewer_max_bytes = 4 * 1024 * 1024
+        self.viewer_index_block = 8 * 1024 * 1024
+        self.tabs = []
+        self.active_tab = None
+        self.tab_counter = 0
+        self.session_journal = None
+        self.session_root = os.path.join(os.path.expanduser("~"), ".zenedit", "sessions")
+        self.session_flush_interval = 250
+        self.session_checkpoint_records = 1000
+        self.session_checkpoint_bytes = 4 * 1024 * 1024
+        self.session_checkpoint_due = False
+        self.session_state = None
+        self.undo_applying = False
+        self.search_pattern = None
+        self.search_matches = []
+        self.search_dirty = None
+        self.search_rebuild = False
+        self.search_multiline = False
+        self.search_pending_edits = 0
+        self.search_current = None
+        self.search_status = None
+        self.search_rescan_id = None
+        self.search_highlight_id = None
+        self.search_debounce = 150
+        self.pending_goto = None
+        self.find_pool = None
+        self.find_workers = max(1, os.cpu_count() or 1)
+        self.find_indexes = {}
+        self.find_index_root = os.path.join(os.path.expanduser("~"), ".zenedit", "index")
+        self.find_lock = threading.Lock()
+        self.find_cancel = None
+        self.find_poll_id = None
+        self.find_poll_interval = 50
+        self.highlight_lexer = None
+        self.highlight_states = []
+        self.highlight_valid = 0
+        self.highlight_dirty_last = 0
+        self.highlight_generation = 0
+        self.highlight_tagged = None
+        self.highlight_job = False
+        self.highlight_pending = False
+        self.highlight_invalid_line = sys.maxsize
+        self.highlight_results = queue.Queue()
+        self.highlight_id = None
+        self.highlight_delay = 30
+        self.highlight_poll_interval = 15
+        self.highlight_margin = 50
+        self.line_numbers_id = None
+        self.minimap_lengths = None
+        self.minimap_dirty = None
+        self.minimap_rebuild = False
+        self.minimap_pending_edits = 0
+        self.minimap_id = None
+        self.minimap_bands = []
+        self.minimap_layout = None
+        self.minimap_line_count = 0
+        self.minimap_color = None
+        self.minimap_delay = 50
+        self.minimap_width = 80
+        self.minimap_row_height = 2
+        self.minimap_columns = 120
+        self.line_word_counts = None
+        self.total_words = 0
+        self.total_chars = 0
+        self.stats_dirty = None
+        self.stats_rebuild = False
+        self.stats_pending_edits = 0
+        self.stats_update_id = None
+        self.status_bar_id = None
+        self.effects = {}
+        self.effects_id = None
+        self.effects_frame_interval = 16
+        self.config_flush_delay = 500
+        self.config_flush_id = None
+        self.config_dirty = False
+        self.config_generation = 0
+        self.config_lock = threading.Lock()
+        self.config_writer = None
+        self.instrumentation = Instrumentation()
+        self.instrumented_calls = (
+            "save_file", "undo_text", "redo_text", "select_all", "cut_text", "copy_text", "paste_text",
+            "new_tab", "close_tab", "cycle_tab", "quit", "toggle_border_visibility", "toggle_line_numbers",
+            "toggle_minimap",
+            "show_word_char_count", "search_text", "goto_line", "replace_text", "find_in_files", "new_file", "open_file",
+            "cancel_load", "toggle_follow_mode", "toggle_menu_view", "toggle_full_screen",
+            "auto_save", "start_blinking", "blink_frame", "reveal_characters", "run_effects", "flush_session",
+            "flush_config", "poll_load_queue", "poll_save_results", "poll_line_index", "poll_highlight", "poll_find_results",
+            "poll_follow", "check_file_changes", "poll_reload",
+            "redraw_line_numbers", "refresh_minimap", "update_status_bar", "refresh_stats", "rescan_search_index",
+            "highlight_visible_matches", "shift_viewer_window"
+        )
+        self.stall_check_id = None
+        self.stall_check_interval = 100
+        self.stall_threshold = 0.05
+        self.stall_check_due = 0.0
+        self.performance_overlay = None
+        self.performance_overlay_id = None
+        self.performance_overlay_interval = 500
+        self.performance_overlay_window = 10.0
         self.default_config = {
             "root_bg_color": "#1e1e1e",
             "font_family": "Arial",
@@ -31,29 +213,114 @@ class ZenEdit:
             "border_thickness": 1,
             "border_color": "#ffffff",
             "padding": 0,
-            "insertwidth": 2
+            "insertwidth": 2,
+            "auto_save_journal": False,
+            "large_file_threshold": 256 * 1024 * 1024,
+            "show_line_numbers": False,
+            "show_status_bar": True,
+            "show_minimap": False,
+            "auto_save_enabled": True,
+            "tab_memory_budget": 64 * 1024 * 1024,
+            "undo_memory_limit": 16 * 1024 * 1024,
+            "undo_spill_limit": 256 * 1024 * 1024,
+            "syntax_highlighting": True,
+            "find_use_index": True,
+            "find_max_file_size": 64 * 1024 * 1024,
+            "find_max_index_size": 16 * 1024 * 1024,
+            "find_max_results": 10000,
+            "follow_max_lines": 100000,
+            "watch_external_changes": True,
+            "compression_level": 6,
+            "instrumentation": False
         }
         self.config = self.default_config.copy()
         self.fullScreenState = False
         self.effect_tw_active = False
         self.root_bg_image_visible = False
         self.load_config()
+        self.mark_startup("config loaded")
+        if self.auto_save_enabled.get() != self.config["auto_save_enabled"]:
+            self.auto_save_enabled.set(self.config["auto_save_enabled"])
+        self.setup_instrumentation()
         self.setup_ui()
 
     def load_config(self):
         try:
             with open(self.config_file, "r") as file:
                 file_config = json.load(file)
-                self.config.update(file_config)
-        except FileNotFoundError:
+                self.config.update({key: value for key, value in file_config.items()
+                                    if self.validate_config_value(key, value)})
+        except (FileNotFoundError, ValueError, AttributeError):
             self.config = self.default_config.copy()
 
+    def validate_config_value(self, key, value):
+        if key not in self.default_config:
+            return False
+        default = self.default_config[key]
+        if isinstance(default, bool):
+            return isinstance(value, bool)
+        if isinstance(default, (int, float)):
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        return isinstance(value, type(default))
+
+    def setup_instrumentation(self):
+        for name in self.instrumented_calls:
+            setattr(self, name, self.instrumentation.wrap(name, getattr(self, name)))
+        self.text_proxy = self.instrumentation.wrap("text_proxy", self.text_proxy, detail=True)
+        self.set_instrumentation(self.config["instrumentation"])
+
+    def set_instrumentation(self, enabled):
+        self.instrumentation.enabled = enabled
+        if enabled and not self.stall_check_id:
+            self.stall_check_due = time.perf_counter() + self.stall_check_interval / 1000
+            self.stall_check_id = self.root.after(self.stall_check_interval, self.check_event_loop_stall)
+        elif not enabled and self.stall_check_id:
+            self.root.after_cancel(self.stall_check_id)
+            self.stall_check_id = None
+
+    def check_event_loop_stall(self):
+        now = time.perf_counter()
+        late = now - self.stall_check_due
+        if late >= self.stall_threshold:
+            self.instrumentation.record("stall", "event loop stall", self.stall_check_due, late)
+        self.stall_check_due = now + self.stall_check_interval / 1000
+        self.stall_check_id = self.root.after(self.stall_check_interval, self.check_event_loop_stall)
+
     def setup_ui(self):
-        self.setup_icon()
+        self.menu = tk.Menu(self.root)
         self.setup_frame_and_text_area()
-        self.setup_menus()
+        self.setup_tabs()
+        self.setup_status_bar()
         self.setup_bindings()
-        self.auto_save()
+        self.text_area.focus_set()
+        self.text_area.bind("<Map>", self.on_first_map, add="+")
+        self.auto_save_id = self.root.after(self.auto_save_interval, self.auto_save)
+        self.mark_startup("text area ready")
+
+    def on_first_map(self, event=None):
+        if self.startup_pending:
+            self.startup_pending = False
+            self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        self.mark_startup("first paint")
+        self.setup_icon()
+        self.setup_menus()
+        self.setup_highlight_tags()
+        self.mark_startup("icon and menus")
+        self.setup_session()
+        self.mark_startup("session journal")
+        self.watch_id = self.root.after(self.watch_interval, self.check_file_changes)
+        if self.startup_profile is not None:
+            self.root.after_idle(self.report_startup)
+
+    def mark_startup(self, label):
+        if self.startup_profile is not None:
+            self.startup_profile.mark(label)
+
+    def report_startup(self):
+        self.mark_startup("idle, ready for input")
+        self.startup_profile.report()
 
     def setup_icon(self):
         try:
@@ -64,23 +331,36 @@ class ZenEdit:
         except Exception:
             pass
 
+    def setup_highlight_tags(self):
+        for token, style in highlight.TOKEN_STYLES.items():
+            self.text_area.tag_configure("hl_" + token, **style)
+            self.text_area.tag_lower("hl_" + token)
+
+    def setup_status_bar(self):
+        self.status_bar = tk.Label(self.root, anchor="w", padx=8, bg=self.config["root_bg_color"], fg=self.config["fg_color"])
+        if self.config["show_status_bar"]:
+            self.status_bar.pack(side="bottom", fill="x", before=self.frame)
+            self.rebuild_stats()
+
+    def setup_tabs(self):
+        self.tab_bar = tk.Frame(self.root, bg=self.config["root_bg_color"])
+        self.tab_bar_layout = None
+        self.active_tab = self.create_tab()
+        self.text_area.bind("<<Modified>>", lambda event: self.update_tab_bar(), add="+")
+
     def setup_frame_and_text_area(self):
         self.frame = tk.Frame(self.root, bg=self.config["bg_color"])
         self.frame.pack(expand=True)
         self.frame.config(width=self.config["text_width"], height=self.config["text_height"])
         self.frame.pack_propagate(False)
 
-        self.current_font = font.Font(
-            family=self.config["font_family"],
-            size=self.config["font_size"],
-            weight="bold" if self.config["font_bold"] else "normal",
-            slant="italic" if self.config["font_italic"] else "roman"
-        )
+        self.fonts = FontService(self.root, self.config["font_family"], self.config["font_size"],
+                                 self.config["font_bold"], self.config["font_italic"])
+        self.current_font = self.fonts.font
 
         self.text_area = tk.Text(
             self.frame,
             font=self.current_font,
-            undo=True,
             bg=self.config["bg_color"],
             fg=self.config["fg_color"],
             insertbackground=self.config["caret_cursor_color"],
@@ -92,20 +372,304 @@ class ZenEdit:
             highlightbackground=self.config["border_color"],
             highlightcolor=self.config["border_color"],
             selectbackground=self.config["selection_color"],
-            selectforeground=self.config["selection_text_color"]
+            selectforeground=self.config["selection_text_color"],
+            yscrollcommand=self.on_text_scroll
         )
         self.text_area.pack(side="top", fill="both", expand=True)
+        self.document = PieceTable()
+        self.undo_history = self.create_undo_history()
+        self.setup_text_proxy()
+
+        self.line_numbers = tk.Canvas(self.frame, width=0, bg=self.config["bg_color"], highlightthickness=0)
+        self.text_area.bind("<<Change>>", self.schedule_line_numbers, add="+")
+        self.text_area.bind("<<Change>>", self.schedule_status_bar, add="+")
+        self.text_area.bind("<<Change>>", self.schedule_highlight, add="+")
+        self.text_area.bind("<Configure>", self.schedule_line_numbers, add="+")
+        if self.config["show_line_numbers"]:
+            self.line_numbers.pack(side="left", fill="y", before=self.text_area)
+        self.minimap = tk.Canvas(self.frame, width=self.minimap_width, bg=self.config["bg_color"], highlightthickness=0)
+        self.minimap.bind("<Configure>", lambda event: self.schedule_minimap(), add="+")
+        self.minimap.bind("<Button-1>", self.on_minimap_click)
+        self.minimap.bind("<B1-Motion>", self.on_minimap_click)
+        if self.config["show_minimap"]:
+            self.minimap.pack(side="right", fill="y", before=self.text_area)
+            self.minimap_rebuild = True
+            self.minimap_lengths = array('I')
+
+    def setup_text_proxy(self):
+        widget = str(self.text_area)
+        self.text_area_orig = widget + "_orig"
+        self.root.tk.call("rename", widget, self.text_area_orig)
+        self.root.tk.createcommand(widget, self.text_proxy)
+
+    def text_proxy(self, command, *args):
+        if command == "insert" and len(args) >= 2:
+            self.on_text_edit("insert", self.resolve_edit_index(args[0]), "".join(args[1::2]))
+        elif command == "delete" and 1 <= len(args) <= 2:
+            start = self.resolve_edit_index(args[0])
+            end = self.resolve_edit_index(args[1] if len(args) == 2 else f"{start}+1c")
+            if self.root.tk.call(self.text_area_orig, "compare", start, "<", end):
+                self.on_text_edit("delete", start, end)
+        elif command == "replace" and len(args) >= 3:
+            start = self.resolve_edit_index(args[0])
+            end = self.resolve_edit_index(args[1])
+            self.on_text_edit("delete", start, end)
+            self.on_text_edit("insert", start, "".join(args[2::2]))
+        elif command == "edit" and args[:1] in (("undo",), ("redo",)):
+            if args[0] == "undo":
+                self.undo_text()
+            else:
+                self.redo_text()
+            return ""
+        result = self.root.tk.call((self.text_area_orig, command) + args)
+        if (command in ("insert", "delete", "replace", "see") or (command in ("xview", "yview") and args)
+                or (command == "mark" and args[:2] == ("set", "insert"))):
+            self.text_area.event_generate("<<Change>>", when="tail")
+        return result
+
+    def resolve_edit_index(self, index):
+        index = self.root.tk.call(self.text_area_orig, "index", index)
+        if self.root.tk.call(self.text_area_orig, "compare", index, "==", "end"):
+            index = self.root.tk.call(self.text_area_orig, "index", "end-1c")
+        return str(index)
+
+    def on_text_edit(self, op, start, arg):
+        self.edit_generation += 1
+        self.last_edit_time = time.monotonic()
+        offset = self.index_offset(start)
+        record = not self.loading and self.viewer_mmap is None
+        if op == "insert":
+            if record and not self.undo_applying and not self.follow_applying:
+                self.undo_history.record(op, offset, arg)
+            if record and self.session_journal is not None and not self.follow_applying:
+                self.record_session(session.INSERT, offset, payload=arg)
+            self.document.insert(offset, arg)
+        else:
+            end = self.index_offset(arg)
+            if record and not self.undo_applying and not self.follow_applying:
+                self.undo_history.record(op, offset, self.document.get(offset, end))
+            if record and self.session_journal is not None and not self.follow_applying:
+                self.record_session(session.DELETE, offset, end)
+            self.document.delete(offset, end)
+        if record and self.highlight_lexer is not None:
+            self.update_highlight_for_edit(op, start, arg)
+        if self.search_pattern is not None:
+            self.update_search_index_for_edit(op, start, arg)
+        if self.line_word_counts is not None:
+            self.update_stats_for_edit(op, start, arg)
+        if self.minimap_lengths is not None:
+            self.update_minimap_for_edit(op, start, arg)
+
+    def on_text_resync(self, document):
+        self.edit_generation += 1
+        self.last_edit_time = time.monotonic()
+        self.document = document
+        self.reset_highlight()
+        if self.search_pattern is not None:
+            self.search_rebuild = True
+            if not self.search_rescan_id:
+                self.search_rescan_id = self.root.after_idle(self.rescan_search_index)
+        if self.line_word_counts is not None:
+            self.stats_rebuild = True
+            if not self.stats_update_id:
+                self.stats_update_id = self.root.after_idle(self.refresh_stats)
+        if self.minimap_lengths is not None:
+            self.minimap_rebuild = True
+            self.schedule_minimap()
+
+    def index_offset(self, index):
+        line, column = map(int, index.split("."))
+        start = self.document.line_start(line)
+        if column and self.tk_astral_units == 2:
+            column = textops.char_column(self.document.get(start, start + column), column)
+        return min(start + column, self.document.line_end(line))
+
+    def offset_index(self, offset):
+        line, column = self.document.position(offset)
+        if column and self.tk_astral_units == 2:
+            column = textops.tk_column(self.document.get(offset - column, offset))
+        return f"{line}.{column}"
+
+    def create_undo_history(self):
+        return UndoHistory(self.config["undo_memory_limit"], self.config["undo_spill_limit"])
+
+    def buffer_text(self):
+        return self.document.get()
+
+    def buffer_lines(self, first, last):
+        return self.document.lines(first, last)
+
+    def edit_line_span(self, op, start, arg):
+        line = int(start.split(".")[0])
+        if op == "delete":
+            last = int(arg.split(".")[0])
+            return line, last, line - last
+        return line, line, arg.count("\n")
+
+    def merge_dirty_lines(self, dirty, op, line, last, shift):
+        dirty_last = line if op == "delete" else line + shift
+        if not dirty:
+            return line, dirty_last
+
+        def adjust(value):
+            if value > last:
+                return value + shift
+            return min(value, line) if op == "delete" else value
+
+        return min(adjust(dirty[0]), line), max(adjust(dirty[1]), dirty_last)
+
+    def on_text_scroll(self, first, last):
+        self.on_viewer_scroll(first, last)
+        if self.minimap_lengths is not None and self.minimap_layout is not None:
+            self.draw_minimap_viewport(float(first), float(last))
+        if self.search_pattern is not None and not self.search_highlight_id:
+            self.search_highlight_id = self.root.after_idle(self.highlight_visible_matches)
+        self.schedule_highlight()
+
+    def schedule_highlight(self, event=None):
+        if not self.highlight_id:
+            self.highlight_id = self.root.after(self.highlight_delay, self.run_highlight)
+
+    def reset_highlight(self):
+        self.highlight_generation += 1
+        self.highlight_states = [self.highlight_lexer.initial_state] if self.highlight_lexer else []
+        self.highlight_valid = len(self.highlight_states)
+        self.highlight_dirty_last = 0
+        self.highlight_tagged = None
+        for token in highlight.TOKEN_STYLES:
+            self.text_area.tag_remove("hl_" + token, "1.0", tk.END)
+        self.schedule_highlight()
+
+    def update_highlight_for_edit(self, op, start, arg):
+        line, last, shift = self.edit_line_span(op, start, arg)
+        states = self.highlight_states
+        if op == "delete":
+            del states[line:last]
+        elif shift and len(states) > line:
+            states[line:line] = [None] * shift
+        self.highlight_valid = min(self.highlight_valid, line)
+        if self.highlight_dirty_last > last:
+            self.highlight_dirty_last += shift
+        self.highlight_dirty_last = max(self.highlight_dirty_last, line if op == "delete" else line + shift)
+        self.highlight_invalid_line = min(self.highlight_invalid_line, line)
+        self.highlight_tagged = None
+
+    def run_highlight(self):
+        self.highlight_id = None
+        if self.highlight_job:
+            self.highlight_pending = True
+            return
+        if self.loading:
+            return
+        lexer = None
+        if self.config["syntax_highlighting"] and self.viewer_mmap is None:
+            lexer = highlight.lexer_for_path(self.current_file_path)
+        if type(lexer) is not type(self.highlight_lexer):
+            self.highlight_lexer = lexer
+            self.reset_highlight()
+        if lexer is None:
+            return
+        height = self.text_area.winfo_height()
+        first = max(1, int(self.text_area.index("@0,0").split(".")[0]) - self.highlight_margin)
+        last = min(self.document.line_count, int(self.text_area.index(f"@0,{height}").split(".")[0]) + self.highlight_margin)
+        if self.highlight_tagged and self.highlight_tagged[0] <= first and last <= self.highlight_tagged[1]:
+            return
+        start_line = min(first, self.highlight_valid)
+        job = (self.highlight_generation, lexer, self.document.snapshot(), start_line, first, last,
+               self.highlight_states[start_line - 1], self.highlight_states[start_line:last + 1], self.highlight_dirty_last)
+        self.highlight_job = True
+        self.highlight_invalid_line = sys.maxsize
+        threading.Thread(target=self.highlight_worker, args=job, daemon=True).start()
+        self.root.after(self.highlight_poll_interval, self.poll_highlight)
+
+    def highlight_worker(self, generation, lexer, document, start_line, first, last, state, cached, dirty_last):
+        try:
+            result = highlight.lex_lines(lexer, document, start_line, first, last, state, cached, dirty_last,
+                                         self.tk_astral_units == 2)
+        except Exception:
+            result = None
+        self.highlight_results.put((generation, start_line, first, last, result))
+
+    def poll_highlight(self):
+        try:
+            generation, start_line, first, last, result = self.highlight_results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.highlight_poll_interval, self.poll_highlight)
+            return
+        self.highlight_job = False
+        if (result is not None and generation == self.highlight_generation
+                and not self.loading and self.viewer_mmap is None):
+            self.apply_highlight(start_line, first, last, *result)
+        if self.highlight_pending:
+            self.highlight_pending = False
+            self.schedule_highlight()
+
+    def apply_highlight(self, start_line, first, last, new_states, converged, tokens):
+        limit = self.highlight_invalid_line
+        states = self.highlight_states
+        index = start_line
+        for state in new_states:
+            if index >= limit or index > len(states):
+                break
+            if index == len(states):
+                states.append(state)
+            else:
+                states[index] = state
+            index += 1
+        if start_line <= self.highlight_valid:
+            self.highlight_valid = max(self.highlight_valid, min(len(states), limit) if converged else index)
+        if not converged:
+            self.highlight_dirty_last = max(self.highlight_dirty_last, index)
+        last = min(last, limit - 1)
+        if last < first:
+            return
+        ranges = {}
+        for line, line_tokens in enumerate(tokens[:last - first + 1], first):
+            for start, end, token in line_tokens:
+                ranges.setdefault(token, []).extend((f"{line}.{start}", f"{line}.{end}"))
+        for token in highlight.TOKEN_STYLES:
+            self.text_area.tag_remove("hl_" + token, f"{first}.0", f"{last + 1}.0")
+        for token, indices in ranges.items():
+            self.text_area.tag_add("hl_" + token, *indices)
+        if limit == sys.maxsize:
+            self.highlight_tagged = (first, last)
 
     def update_config_auto_save(self, *args):
         self.update_config("auto_save_enabled", self.auto_save_enabled.get())
 
     def update_config(self, key, value):
+        if not self.validate_config_value(key, value):
+            raise ValueError(f"Invalid value for setting {key!r}: {value!r}")
         self.config[key] = value
         self.save_config()
 
     def save_config(self):
-        with open(self.config_file, 'w') as file:
-            json.dump(self.config, file, indent=4)
+        self.config_dirty = True
+        if self.config_flush_id:
+            self.root.after_cancel(self.config_flush_id)
+        self.config_flush_id = self.root.after(self.config_flush_delay, self.flush_config)
+
+    def flush_config(self, wait=False):
+        if self.config_flush_id:
+            self.root.after_cancel(self.config_flush_id)
+            self.config_flush_id = None
+        if self.config_dirty:
+            self.config_dirty = False
+            self.config_generation += 1
+            self.config_writer = threading.Thread(target=self.write_config, daemon=True,
+                                                  args=(json.dumps(self.config, indent=4), self.config_generation))
+            self.config_writer.start()
+        if wait and self.config_writer:
+            self.config_writer.join()
+
+    def write_config(self, text, generation):
+        with self.config_lock:
+            if generation != self.config_generation:
+                return
+            try:
+                self.write_file_atomic(self.config_file, text)
+            except OSError:
+                pass
 
     def setup_bindings(self):
         self.text_area.bind("<Control-s>", self.save_file)
@@ -122,11 +686,20 @@ class ZenEdit:
         self.text_area.bind("<Control-C>", self.copy_text)
         self.text_area.bind("<Control-v>", self.paste_text)
         self.text_area.bind("<Control-V>", self.paste_text)
+        self.text_area.bind("<Control-t>", self.new_tab)
+        self.text_area.bind("<Control-T>", self.new_tab)
+        self.text_area.bind("<Control-w>", lambda event: self.close_tab() or "break")
+        self.text_area.bind("<Control-W>", lambda event: self.close_tab() or "break")
+        self.text_area.bind("<Control-Tab>", lambda event: self.cycle_tab(1))
+        self.text_area.bind("<Control-Shift-Tab>", lambda event: self.cycle_tab(-1))
+        self.text_area.bind("<Control-ISO_Left_Tab>", lambda event: self.cycle_tab(-1))
     
         self.root.bind("<Control-q>", lambda event: self.quit())
         self.root.bind("<Control-Q>", lambda event: self.quit())
         self.root.bind("<F2>", lambda event: self.toggle_border_visibility())
         self.root.bind("<F5>", lambda event: self.toggle_line_numbers())
+        self.root.bind("<Control-Shift-l>", lambda event: self.toggle_follow_mode())
+        self.root.bind("<Control-Shift-L>", lambda event: self.toggle_follow_mode())
         self.root.bind("<Control-Shift-g>", lambda event: self.show_word_char_count())
         self.root.bind("<Control-Shift-G>", lambda event: self.show_word_char_count())
         self.root.bind("<F3>", self.search_text)
@@ -134,20 +707,25 @@ class ZenEdit:
         self.root.bind("<Control-F>", lambda event: self.search_text())
         self.root.bind("<Control-g>", lambda event: self.goto_line())
         self.root.bind("<Control-G>", lambda event: self.goto_line())
+        self.root.bind("<Control-Shift-f>", lambda event: self.find_in_files())
+        self.root.bind("<Control-Shift-F>", lambda event: self.find_in_files())
         self.root.bind("<Control-h>", self.replace_text)
         self.root.bind("<Control-H>", self.replace_text)
         self.root.bind("<Control-n>", lambda event: self.new_file())
         self.root.bind("<Control-N>", lambda event: self.new_file())
         self.root.bind("<Control-o>", lambda event: self.open_file())
         self.root.bind("<Control-O>", lambda event: self.open_file())
+        self.root.bind("<Escape>", self.cancel_load)
         self.root.bind("<F10>", lambda event: self.toggle_menu_view())
         self.root.bind("<F11>", self.toggle_full_screen)
+        self.root.bind("<F12>", lambda event: self.toggle_performance_overlay())
         self.root.bind("<Control-Alt-s>", lambda event: self.save_file())
         self.root.bind("<Control-Alt-S>", lambda event: self.save_file())
 
     def setup_menus(self):
-        self.menu = tk.Menu(self.root)
-        self.root.config(menu=self.menu, bg=self.config["root_bg_color"])
+        self.root.config(bg=self.config["root_bg_color"])
+        if not self.fullScreenState:
+            self.root.config(menu=self.menu)
 
         self.file_menu = tk.Menu(self.menu, tearoff=0)
         self.edit_menu = tk.Menu(self.menu, tearoff=0)
@@ -160,6 +738,9 @@ class ZenEdit:
         self.file_menu.add_command(label="Save (CTRL+S)", command=self.save_file)
         self.file_menu.add_command(label="Save As... (CTRL+ALT+S)", command=self.save_as_file)
         self.file_menu.add_separator()
+        self.file_menu.add_command(label="New Tab (CTRL+T)", command=self.new_tab)
+        self.file_menu.add_command(label="Close Tab (CTRL+W)", command=self.close_tab)
+        self.file_menu.add_separator()
         self.file_menu.add_command(label="Exit (CTRL+Q)", command=self.quit)
 
         self.edit_menu.add_command(label="Undo (CTRL+Z)", command=self.undo_text)
@@ -172,6 +753,7 @@ class ZenEdit:
         self.edit_menu.add_command(label="Select All (CTRL+A)", command=self.select_all)
         self.edit_menu.add_command(label="Search (F3)", command=self.search_text)
         self.edit_menu.add_command(label="Replace (Control-H)", command=self.replace_text)
+        self.edit_menu.add_command(label="Find in Files (CTRL+SHIFT+F)", command=self.find_in_files)
         self.edit_menu.add_command(label="Go to Line... (CTRL+G)", command=self.goto_line)
         self.edit_menu.add_separator()
         self.edit_menu.add_command(label="Toggle Line Numbers (F5)", command=self.toggle_line_numbers)
@@ -190,6 +772,13 @@ class ZenEdit:
         self.view_menu.add_command(label="Toggle Caret Cursor Visibility", command=self.toggle_caret_cursor_visibility)
         self.view_menu.add_command(label="Toggle Caret Cursor Blink", command=self.toggle_caret_cursor_blink)
         self.view_menu.add_command(label="Set Caret Cursor Blink Speed", command=self.set_caret_cursor_blink_speed)
+        self.view_menu.add_command(label="Toggle Status Bar", command=self.toggle_status_bar)
+        self.view_menu.add_command(label="Toggle Syntax Highlighting", command=self.toggle_syntax_highlighting)
+        self.view_menu.add_command(label="Toggle Minimap", command=self.toggle_minimap)
+        self.view_menu.add_command(label="Follow File (CTRL+SHIFT+L)", command=self.toggle_follow_mode)
+        self.view_menu.add_separator()
+        self.view_menu.add_command(label="Toggle Performance Overlay (F12)", command=self.toggle_performance_overlay)
+        self.view_menu.add_command(label="Export Performance Trace...", command=self.export_performance_trace)
 
         
         self.format_menu.add_command(label="Change Font", command=self.change_font)
@@ -212,10 +801,12 @@ class ZenEdit:
         self.settings_menu.add_separator()
         self.settings_menu.add_command(label="Set Border Thickness", command=self.set_border_thickness)
         self.settings_menu.add_command(label="Set Caret Cursor Thickness", command=self.set_caret_cursor_thickness)
+        self.settings_menu.add_command(label="Set Compression Level", command=self.set_compression_level)
         self.settings_menu.add_separator()
         self.settings_menu.add_command(label="Reset to Default Theme", command=self.reset_to_default_theme)
         self.settings_menu.add_separator()
         self.settings_menu.add_checkbutton(label="Enable Autosave", onvalue=True, offvalue=False, variable=self.auto_save_enabled, command=self.toggle_auto_save)
+        self.settings_menu.add_command(label="Toggle Performance Instrumentation", command=self.toggle_instrumentation)
 
         self.menu.add_cascade(label="File", menu=self.file_menu)
         self.menu.add_cascade(label="Edit", menu=self.edit_menu)
@@ -225,13 +816,326 @@ class ZenEdit:
         self.menu.add_command(label="About", command=self.show_about)
 
     def auto_save(self):
-            if self.auto_save_enabled.get():  
-                filepath = self.current_file_path if hasattr(self, 'current_file_path') and self.current_file_path else self.auto_save_file
-                with open(filepath, "w") as file:
-                    file.write(self.text_area.get(1.0, tk.END))
-            self.root.after(self.auto_save_interval, self.auto_save)
+        delay = self.auto_save_interval
+        if (self.auto_save_enabled.get() and self.edit_generation != self.auto_save_generation
+                and not self.saves_pending and not self.loading and self.viewer_mmap is None and self.follow is None
+                and not self.follow_partial):
+            idle = (time.monotonic() - self.last_edit_time) * 1000
+            if idle < self.auto_save_debounce:
+                delay = int(self.auto_save_debounce - idle) + 1
+            else:
+                self.write_auto_save()
+        self.auto_save_id = self.root.after(delay, self.auto_save)
+
+    def write_auto_save(self):
+        filepath = self.current_file_path
+        if not filepath:
+            return
+        if self.config.get("auto_save_journal") and self.session_journal is not None:
+            self.record_session_state()
+            self.session_journal.flush()
+            self.auto_save_generation = self.edit_generation
+        elif self.confirm_overwrite(filepath, "Auto Save", ask_again=False):
+            self.start_save(filepath)
+
+    def start_save(self, filepath, on_done=None, save_as=False):
+        generation = self.edit_generation
+        text = self.document.snapshot()
+        file_compression = compression.format_for_path(filepath) if save_as else self.file_compression
+        self.saves_pending += 1
+        self.save_jobs.put((filepath, text, self.file_encoding, file_compression, generation, self.active_tab if save_as else None,
+                            on_done))
+        if self.save_worker is None or not self.save_worker.is_alive():
+            self.save_worker = threading.Thread(target=self.save_worker_loop, daemon=True)
+            self.save_worker.start()
+        if self.saves_pending == 1:
+            self.root.after(self.save_poll_interval, self.poll_save_results)
+
+    def save_worker_loop(self):
+        while True:
+            filepath, text, encoding, file_compression, generation, tab, on_done = self.save_jobs.get()
+            try:
+                self.write_file_atomic(filepath, text, lambda done: self.save_results.put(("progress", filepath, done, None)), encoding,
+                                       file_compression)
+                self.save_results.put(("done", filepath, (generation, tab, file_compression), on_done))
+            except Exception as e:
+                self.save_results.put(("error", filepath, e, on_done))
+            finally:
+                self.save_jobs.task_done()
+
+    def poll_save_results(self):
+        while True:
+            try:
+                kind, filepath, value, on_done = self.save_results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if filepath == getattr(self, 'current_file_path', None):
+                    self.update_title(f"saving {int(value * 100)}%")
+                continue
+            self.saves_pending -= 1
+            if kind == "done":
+                self.finish_save(filepath, *value)
+                if on_done:
+                    on_done(None)
+            else:
+                self.update_title()
+                if on_done:
+                    on_done(value)
+        if self.saves_pending:
+            self.root.after(self.save_poll_interval, self.poll_save_results)
+
+    def finish_save(self, filepath, generation, tab=None, file_compression=None):
+        if tab is not None and tab is self.active_tab:
+            self.current_file_path = filepath
+            self.file_compression = file_compression
+            self.follow_partial = False
+        elif tab is not None:
+            tab.update(path=filepath, compression=file_compression, follow_partial=False)
+        self.auto_save_generation = max(self.auto_save_generation, generation)
+        self.session_checkpoint_due = True
+        for tab in self.tabs:
+            if tab is not self.active_tab and tab["path"] == filepath and tab["generation"] == generation:
+                tab["modified"] = False
+                tab["autosaved"] = True
+        if filepath == getattr(self, 'current_file_path', None):
+            self.disk_stat = session.file_stat(filepath)
+            self.disk_warned = None
+        if self.follow is not None and self.follow["path"] == filepath:
+            try:
+                stat = os.stat(filepath)
+                self.follow.update(offset=stat.st_size, identity=(stat.st_dev, stat.st_ino), pending_cr=False)
+                self.follow["decoder"].reset()
+            except OSError:
+                pass
+        if filepath == getattr(self, 'current_file_path', None) and generation == self.edit_generation:
+            self.text_area.edit_modified(False)
+            self.loaded_size = None
+        self.update_title()
+
+    def wait_for_saves(self):
+        self.save_jobs.join()
+        if self.saves_pending:
+            self.poll_save_results()
+
+    def update_title(self, status=None):
+        filepath = getattr(self, 'current_file_path', None)
+        title = f"ZenEdit - {os.path.basename(filepath)}" if filepath else "ZenEdit"
+        if status is None and self.follow is not None:
+            status = "following"
+        self.root.title(f"{title} ({status})" if status else title)
+        self.update_tab_bar()
+
+    def write_file_atomic(self, filepath, text, progress=None, encoding=None, file_compression=None):
+        started = time.perf_counter()
+        filepath = os.path.realpath(filepath)
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), prefix=".zenedit-", suffix=".tmp")
+        except OSError:
+            with open(filepath, "wb") as raw:
+                size = self.write_file_stream(raw, text, progress, encoding, file_compression)
+            self.instrumentation.record_io("write", filepath, size, started)
+            return
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                size = self.write_file_stream(raw, text, progress, encoding, file_compression)
+            os.chmod(temp_path, os.stat(filepath).st_mode & 0o7777 if os.path.exists(filepath) else self.new_file_mode)
+            os.replace(temp_path, filepath)
+            self.instrumentation.record_io("write", filepath, size, started)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def write_file_stream(self, raw, text, progress, encoding, file_compression):
+        stream = compression.writer(file_compression, raw, self.config["compression_level"]) if file_compression else raw
+        file = io.TextIOWrapper(stream, encoding=encoding)
+        total = len(text)
+        written = 0
+        if isinstance(text, str):
+            chunks = (text[start:start + self.save_chunk_size] for start in range(0, total, self.save_chunk_size))
+        else:
+            chunks = text.chunks(size=self.save_chunk_size)
+        for chunk in chunks:
+            file.write(chunk)
+            written += len(chunk)
+            if progress:
+                progress(written / total)
+        file.flush()
+        file.detach()
+        if stream is not raw:
+            stream.close()
+        raw.flush()
+        os.fsync(raw.fileno())
+        return os.fstat(raw.fileno()).st_size
+
+    def setup_session(self):
+        try:
+            self.session_journal = session.SessionJournal(self.session_root)
+        except OSError:
+            return
+        self.checkpoint_session()
+        self.session_flush_id = self.root.after(self.session_flush_interval, self.flush_session)
+        self.root.after_idle(self.restore_sessions)
+
+    def record_session(self, op, a=0, b=0, payload="", tab=None):
+        if self.session_journal is not None:
+            self.session_journal.record(op, (tab or self.active_tab)["id"], a, b, payload)
+
+    def record_session_open(self, tab, filepath):
+        if filepath:
+            self.record_session(session.OPEN, payload=json.dumps({"path": filepath, **(session.file_stat(filepath) or {})}), tab=tab)
+        else:
+            self.record_session(session.RESET, payload="", tab=tab)
+
+    def record_session_state(self):
+        if self.session_journal is None:
+            return
+        state = {"id": self.active_tab["id"], "path": self.current_file_path, "encoding": self.file_encoding,
+                 "compression": self.file_compression,
+                 "modified": bool(self.text_area.edit_modified()), "insert": self.text_area.index(tk.INSERT), "active": True}
+        if state != self.session_state:
+            self.session_state = state
+            self.record_session(session.STATE, payload=json.dumps(state))
+
+    def flush_session(self):
+        self.record_session_state()
+        if (self.session_checkpoint_due
+                or self.session_journal.records_since_checkpoint >= self.session_checkpoint_records
+                or self.session_journal.bytes_since_checkpoint >= self.session_checkpoint_bytes):
+            self.checkpoint_session()
+        else:
+            self.session_journal.flush()
+        self.session_flush_id = self.root.after(self.session_flush_interval, self.flush_session)
+
+    def checkpoint_session(self):
+        self.session_checkpoint_due = False
+        self.record_session_state()
+        tabs = []
+        for tab in self.tabs:
+            if tab is self.active_tab:
+                meta = dict(self.session_state or {}, id=tab["id"], path=self.current_file_path, encoding=self.file_encoding,
+                            compression=self.file_compression,
+                            modified=bool(self.text_area.edit_modified()), active=True)
+                clean = self.loading or self.viewer_mmap is not None or not meta["modified"]
+                content = self.document.snapshot()
+            else:
+                meta = {"id": tab["id"], "path": tab["path"], "encoding": tab["encoding"], "compression": tab["compression"],
+                        "modified": tab["modified"], "insert": tab["insert"]}
+                clean = not tab["modified"]
+                content = tab["document"] if tab["document"] is not None else tab["compressed"]
+            stat = session.file_stat(meta["path"]) if meta["path"] and clean else None
+            if stat is not None:
+                meta["disk"] = dict(stat, path=meta["path"])
+                content = None
+            elif content is None:
+                content = PieceTable()
+            tabs.append((meta, content))
+        self.session_journal.checkpoint(tabs)
+
+    def restore_sessions(self):
+        orphans = session.find_orphaned_sessions(self.session_root)
+        restored = []
+        for directory, lock in orphans:
+            try:
+                tabs, active = session.read_session(directory)
+            except (OSError, ValueError):
+                continue
+            if any(entry["text"] or entry["ops"] or entry["disk"] for entry in tabs):
+                restored.append((tabs, active))
+        count = sum(len(tabs) for tabs, active in restored)
+        if restored and messagebox.askyesno("Restore Session", f"ZenEdit did not shut down cleanly. Restore {count} open documents?"):
+            for tabs, active in restored:
+                self.restore_session_tabs(tabs, active)
+            self.checkpoint_session()
+            self.session_journal.wait()
+        for directory, lock in orphans:
+            session.remove_session(directory, lock)
+
+    def restore_session_tabs(self, tabs, active):
+        initial = self.active_tab
+        if self.current_file_path or self.loading or self.text_area.edit_modified() or len(self.document):
+            initial = None
+        target = None
+        stale = []
+        for entry in tabs:
+            meta = entry["meta"]
+            text = entry["text"]
+            ops = entry["ops"]
+            if entry["disk"] is not None:
+                path = entry["disk"]["path"]
+                stat = session.file_stat(path)
+                if ops and stat is not None and stat["size"] == entry["disk"].get("size") and stat["mtime"] == entry["disk"].get("mtime"):
+                    try:
+                        text, meta["encoding"] = self.read_text_file(path)
+                    except OSError:
+                        text = None
+                if text is None:
+                    tab = self.find_tab(path) or self.create_tab(path)
+                    tab["insert"] = meta.get("insert", "1.0")
+                    if meta["id"] == active:
+                        target = (tab, [])
+                    if ops:
+                        stale.append((path, ops))
+                    continue
+            tab = self.create_tab(meta.get("path"))
+            tab.update(encoding=meta.get("encoding"), compression=meta.get("compression"), modified=bool(ops) or meta.get("modified", True),
+                       autosaved=not ops, insert=meta.get("insert", "1.0"))
+            if meta["id"] == active:
+                tab["document"] = PieceTable(text)
+                target = (tab, ops)
+            else:
+                tab["undo_history"] = self.create_undo_history()
+                tab["document"] = session.apply_ops(PieceTable(text), ops, tab["undo_history"])
+        for path, ops in stale:
+            try:
+                text, encoding = self.read_text_file(path)
+            except OSError:
+                text, encoding = "", None
+            tab = self.create_tab()
+            history = self.create_undo_history()
+            tab.update(document=session.apply_ops(PieceTable(text), ops, history), undo_history=history, encoding=encoding,
+                       modified=True, autosaved=False)
+        if stale:
+            names = "\n".join(os.path.basename(path) for path, ops in stale)
+            messagebox.showwarning("Restore Session", "These files changed on disk since the last session, so their unsaved edits "
+                                   f"could not be replayed exactly:\n{names}\n\nThe edits were applied to the current contents "
+                                   "in new untitled tabs. Compare them before saving.")
+        if target is None:
+            return
+        tab, ops = target
+        self.switch_tab(tab)
+        if ops:
+            for op, a, arg in ops:
+                if op == session.INSERT:
+                    self.text_area.insert(self.offset_index(a), arg)
+                else:
+                    self.text_area.delete(self.offset_index(a), self.offset_index(arg))
+            self.text_area.edit_modified(True)
+            self.text_area.mark_set(tk.INSERT, tab["insert"])
+            self.text_area.see(tk.INSERT)
+        if initial is not None and initial is not self.active_tab:
+            self.record_session(session.CLOSE, tab=initial)
+            self.tabs.remove(initial)
+            self.update_tab_bar()
+
+    def read_text_file(self, filepath):
+        with open(filepath, "rb") as file:
+            file_compression = compression.detect(file.read(compression.MAGIC_LENGTH))
+            file.seek(0)
+            data = (compression.reader(file_compression, file) if file_compression else file).read()
+        encoding = self.detect_encoding(data[:self.load_first_chunk_size])
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            encoding = "latin-1"
+            text = data.decode(encoding)
+        return self.normalize_newlines(text, False, True)[0], encoding
+
 #File
     def new_file(self):
+        self.cancel_load()
+        self.close_viewer()
         response = None
         if self.text_area.edit_modified():
             response = messagebox.askyesnocancel(
@@ -245,71 +1149,691 @@ class ZenEdit:
             self.text_area.edit_modified(False)
 
     def open_file(self):
-        filepath = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
-        if not filepath:
+        filepaths = filedialog.askopenfilenames(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+        if not filepaths:
             return
+        self.open_files(filepaths)
+
+    def open_files(self, filepaths):
+        for filepath in filepaths[:-1]:
+            if self.find_tab(filepath) is None:
+                self.create_tab(filepath)
+        self.open_tab(filepaths[-1])
+
+    def open_tab(self, filepath):
+        tab = self.find_tab(filepath)
+        if tab is not None:
+            self.switch_tab(tab)
+        elif (self.current_file_path is None and not self.loading and self.viewer_mmap is None
+              and not self.text_area.edit_modified() and len(self.document) == 0):
+            self.load_file(filepath)
+        else:
+            self.switch_tab(self.create_tab(filepath))
+
+    def find_tab(self, filepath):
+        filepath = os.path.abspath(filepath)
+        for tab in self.tabs:
+            path = self.current_file_path if tab is self.active_tab else tab["path"]
+            if path and os.path.abspath(path) == filepath:
+                return tab
+        return None
+
+    def create_tab(self, filepath=None):
+        self.tab_counter += 1
+        tab = {"id": self.tab_counter, "path": filepath, "document": None, "compressed": None, "encoding": None, "modified": False,
+               "autosaved": True, "generation": 0, "insert": "1.0", "yview": 0.0, "used": time.monotonic(),
+               "undo_history": None, "loaded_size": None, "follow": None, "follow_partial": False,
+               "disk_stat": None, "disk_warned": None, "compression": None}
+        self.tabs.append(tab)
+        self.record_session_open(tab, filepath)
+        self.update_tab_bar()
+        return tab
+
+    def new_tab(self, event=None):
+        self.switch_tab(self.create_tab())
+        return "break"
+
+    def close_tab(self, tab=None):
+        if tab is not None:
+            self.switch_tab(tab)
+        if not self.confirm_close("Close Tab", "Do you want to save changes to the current file?"):
+            return
+        self.cancel_load()
+        self.close_viewer()
+        self.clear_buffer()
+        if len(self.tabs) == 1:
+            self.record_session(session.RESET, payload="")
+            self.update_title()
+            return
+        self.record_session(session.CLOSE)
+        index = self.tabs.index(self.active_tab)
+        self.tabs.pop(index)
+        self.active_tab = None
+        self.switch_tab(self.tabs[min(index, len(self.tabs) - 1)])
+
+    def cycle_tab(self, step):
+        if len(self.tabs) > 1:
+            self.switch_tab(self.tabs[(self.tabs.index(self.active_tab) + step) % len(self.tabs)])
+        return "break"
+
+    def switch_tab(self, tab):
+        if tab is self.active_tab:
+            return
+        if self.active_tab is not None:
+            self.record_session_state()
+            self.store_active_tab()
+        self.active_tab = tab
+        self.restore_tab(tab)
+        self.evict_tabs()
+        self.update_tab_bar()
+
+    def store_active_tab(self):
+        tab = self.active_tab
+        if self.loading or self.viewer_mmap is not None:
+            filepath = self.current_file_path
+            self.cancel_load()
+            self.close_viewer()
+            self.record_session_open(tab, filepath)
+            tab.update(path=filepath, document=None, compressed=None, modified=False, autosaved=True)
+        else:
+            if (self.auto_save_enabled.get() and self.edit_generation != self.auto_save_generation and self.follow is None
+                    and not self.follow_partial):
+                self.write_auto_save()
+            tab.update(path=self.current_file_path, document=self.document.snapshot(), compressed=None,
+                       encoding=self.file_encoding, modified=self.text_area.edit_modified(),
+                       autosaved=self.auto_save_generation == self.edit_generation, generation=self.edit_generation,
+                       insert=self.text_area.index(tk.INSERT), yview=self.text_area.yview()[0])
+            tab["undo_history"] = self.undo_history
+            self.undo_history = self.create_undo_history()
+            tab.update(loaded_size=self.loaded_size, follow=self.follow, follow_partial=self.follow_partial, disk_stat=self.disk_stat,
+                       disk_warned=self.disk_warned, compression=self.file_compression)
+        tab["used"] = time.monotonic()
+        self.clear_buffer()
+
+    def clear_buffer(self):
+        self.stop_follow()
+        self.follow_partial = False
+        self.loaded_size = None
+        self.disk_stat = None
+        self.disk_warned = None
+        self.replace_buffer(PieceTable())
+        self.undo_history.clear()
+        self.current_file_path = None
+        self.file_encoding = None
+        self.file_compression = None
+        self.text_area.edit_modified(False)
+        self.auto_save_generation = self.edit_generation
+
+    def restore_tab(self, tab):
+        tab["used"] = time.monotonic()
+        if tab["document"] is None and tab["compressed"] is None:
+            if tab["path"]:
+                self.load_file(tab["path"])
+            else:
+                self.update_title()
+            return
+        document = tab["document"]
+        if document is None:
+            document = PieceTable(zlib.decompress(tab["compressed"]).decode("utf-8", "surrogatepass"))
+        tab.update(document=None, compressed=None)
+        self.replace_buffer(document)
+        if tab["undo_history"] is not None:
+            self.undo_history = tab["undo_history"]
+            tab["undo_history"] = None
+        self.current_file_path = tab["path"]
+        self.file_encoding = tab["encoding"]
+        self.file_compression = tab["compression"]
+        self.text_area.edit_modified(tab["modified"])
+        if tab["autosaved"]:
+            self.auto_save_generation = self.edit_generation
+        self.text_area.mark_set(tk.INSERT, tab["insert"])
+        self.text_area.yview_moveto(tab["yview"])
+        self.loaded_size = tab["loaded_size"]
+        self.follow_partial = tab["follow_partial"]
+        self.disk_stat = tab["disk_stat"]
+        self.disk_warned = tab["disk_warned"]
+        if tab["follow"] is not None:
+            self.resume_follow(tab["follow"])
+            tab["follow"] = None
+        self.update_title()
+
+    def replace_buffer(self, document):
+        self.text_area.config(state=tk.NORMAL)
+        self.root.tk.call(self.text_area_orig, "delete", "1.0", "end")
+        for chunk in document.chunks(size=self.load_chunk_size):
+            self.root.tk.call(self.text_area_orig, "insert", "end-1c", chunk)
+        self.on_text_resync(document)
+        self.text_area.event_generate("<<Change>>", when="tail")
+
+    def tab_memory(self, tab):
+        if tab["document"] is not None:
+            return len(tab["document"])
+        return len(tab["compressed"]) if tab["compressed"] is not None else 0
+
+    def evict_tabs(self):
+        resident = sorted((tab for tab in self.tabs if tab is not self.active_tab and self.tab_memory(tab)),
+                          key=lambda tab: tab["used"])
+        total = sum(self.tab_memory(tab) for tab in resident)
+        for tab in resident:
+            if total <= self.config["tab_memory_budget"]:
+                break
+            total -= self.tab_memory(tab)
+            if tab["path"] and not tab["modified"]:
+                if tab["undo_history"] is not None:
+                    tab["undo_history"].clear()
+                tab.update(document=None, compressed=None, undo_history=None)
+            elif tab["document"] is not None:
+                tab["compressed"] = zlib.compress(tab["document"].get().encode("utf-8", "surrogatepass"), 1)
+                tab["document"] = None
+                total += len(tab["compressed"])
+
+    def update_tab_bar(self):
+        if not hasattr(self, "tab_bar"):
+            return
+        titles = []
+        for tab in self.tabs:
+            active = tab is self.active_tab
+            path = self.current_file_path if active else tab["path"]
+            modified = self.text_area.edit_modified() if active else tab["modified"]
+            titles.append((os.path.basename(path) if path else "Untitled") + (" *" if modified else ""))
+        layout = (titles, self.tabs.index(self.active_tab) if self.active_tab in self.tabs else -1,
+                  self.config["root_bg_color"], self.config["bg_color"], self.config["fg_color"])
+        if layout == self.tab_bar_layout:
+            return
+        self.tab_bar_layout = layout
+        for label in self.tab_bar.winfo_children():
+            label.destroy()
+        if len(self.tabs) < 2:
+            self.tab_bar.pack_forget()
+            return
+        self.tab_bar.config(bg=self.config["root_bg_color"])
+        for tab, title in zip(self.tabs, titles):
+            active = tab is self.active_tab
+            label = tk.Label(self.tab_bar, text=title, padx=10, pady=2,
+                             bg=self.config["bg_color"] if active else self.config["root_bg_color"],
+                             fg=self.config["fg_color"])
+            label.pack(side="left")
+            label.bind("<Button-1>", lambda event, tab=tab: self.switch_tab(tab))
+            label.bind("<Button-2>", lambda event, tab=tab: self.close_tab(tab))
+        if not self.tab_bar.winfo_ismapped():
+            self.tab_bar.pack(side="top", fill="x", before=self.frame)
+
+    def load_file(self, filepath):
+        self.cancel_load()
+        self.close_viewer()
+        self.stop_follow()
+        self.follow_partial = False
         try:
-            with open(filepath, "r") as file:
-                self.text_area.delete(1.0, tk.END)
-                self.text_area.insert(tk.END, file.read())
-            self.current_file_path = filepath  
-            self.root.title(f"ZenEdit - {os.path.basename(filepath)}")
+            self.load_total = os.path.getsize(filepath)
+            file_compression = compression.detect_file(filepath)
+            if (file_compression is None and self.load_total >= self.config["large_file_threshold"]
+                    and self.open_large_file(filepath)):
+                return
+            file = open(filepath, "rb")
         except Exception as e:
             messagebox.showerror("Open File", f"Failed to open file: {e}")
+            return
+        self.undo_history.clear()
+        self.disk_stat = session.file_stat(filepath)
+        self.disk_warned = None
+        self.loading = True
+        self.text_area.delete(1.0, tk.END)
+        self.text_area.config(state=tk.DISABLED)
+        self.current_file_path = filepath  
+        self.record_session_open(self.active_tab, filepath)
+        self.file_encoding = None
+        self.file_compression = file_compression
+        self.load_read = 0
+        self.load_queue = queue.Queue(maxsize=16)
+        self.load_cancel = threading.Event()
+        threading.Thread(target=self.load_worker, args=(file, file_compression, self.load_queue, self.load_cancel),
+                         daemon=True).start()
+        self.load_poll_id = self.root.after(1, self.poll_load_queue)
+
+    def load_worker(self, file, file_compression, load_queue, cancel):
+        started = time.perf_counter()
+        size = 0
+        try:
+            with file:
+                reader = compression.reader(file_compression, file) if file_compression else file
+                chunk = reader.read(self.load_first_chunk_size)
+                encoding = self.detect_encoding(chunk)
+                decoder = codecs.getincrementaldecoder(encoding)()
+                pending_cr = False
+                while not cancel.is_set():
+                    final = not chunk
+                    try:
+                        text = decoder.decode(chunk, final)
+                    except UnicodeDecodeError:
+                        file.seek(0)
+                        reader = compression.reader(file_compression, file) if file_compression else file
+                        chunk = reader.read(self.load_chunk_size)
+                        encoding = "latin-1"
+                        decoder = codecs.getincrementaldecoder(encoding)()
+                        pending_cr = False
+                        size = 0
+                        self.put_load_message(load_queue, cancel, ("restart", None, 0, encoding))
+                        continue
+                    text, pending_cr = self.normalize_newlines(text, pending_cr, final)
+                    position = file.tell()
+                    self.put_load_message(load_queue, cancel, ("chunk", text, position - size, encoding))
+                    size = position
+                    if final:
+                        break
+                    chunk = reader.read(self.load_chunk_size)
+            self.instrumentation.record_io("read", file.name, size, started)
+            self.put_load_message(load_queue, cancel, ("done", None, 0, None))
+        except Exception as e:
+            self.put_load_message(load_queue, cancel, ("error", e, 0, None))
+
+    def put_load_message(self, load_queue, cancel, message):
+        while not cancel.is_set():
+            try:
+                load_queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def detect_encoding(self, chunk):
+        for bom, encoding in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF32_LE, "utf-32"),
+                              (codecs.BOM_UTF32_BE, "utf-32"), (codecs.BOM_UTF16_LE, "utf-16"),
+                              (codecs.BOM_UTF16_BE, "utf-16")):
+            if chunk.startswith(bom):
+                return encoding
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(chunk, False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return "latin-1"
+
+    def normalize_newlines(self, text, pending_cr, final):
+        if pending_cr:
+            text = "\r" + text
+        pending_cr = text.endswith("\r") and not final
+        if pending_cr:
+            text = text[:-1]
+        return text.replace("\r\n", "\n").replace("\r", "\n"), pending_cr
+
+    def poll_load_queue(self):
+        if not self.loading:
+            return
+        deadline = time.monotonic() + self.load_batch_time
+        while time.monotonic() < deadline:
+            try:
+                kind, value, size, encoding = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "chunk":
+                self.file_encoding = encoding
+                self.load_read += size
+                self.text_area.config(state=tk.NORMAL)
+                self.text_area.insert(tk.END, value)
+                self.text_area.config(state=tk.DISABLED)
+            elif kind == "restart":
+                self.file_encoding = encoding
+                self.load_read = 0
+                self.text_area.config(state=tk.NORMAL)
+                self.text_area.delete(1.0, tk.END)
+                self.text_area.config(state=tk.DISABLED)
+            elif kind == "done":
+                self.finish_load()
+                return
+            else:
+                self.stop_load()
+                self.current_file_path = None
+                self.record_session(session.RESET, payload=self.document.snapshot())
+                self.update_title()
+                messagebox.showerror("Open File", f"Failed to open file: {value}")
+                return
+        self.update_title(f"loading {int(self.load_read * 100 / max(self.load_total, 1))}%, Esc to cancel")
+        self.load_poll_id = self.root.after(self.load_poll_interval, self.poll_load_queue)
+
+    def stop_load(self):
+        self.loading = False
+        self.load_cancel.set()
+        self.root.after_cancel(self.load_poll_id)
+        self.text_area.config(state=tk.NORMAL)
+        self.undo_history.clear()
+        self.reset_highlight()
+
+    def finish_load(self):
+        filepath = self.current_file_path
+        self.stop_load()
+        self.text_area.edit_modified(False)
+        self.text_area.mark_set(tk.INSERT, "1.0")
+        self.loaded_size = self.load_read
+        if self.active_tab is not None and self.active_tab["follow"] is not None:
+            self.active_tab["follow"] = None
+            self.start_follow(self.loaded_size)
+            self.text_area.see(tk.END)
+        if self.pending_goto is not None and self.pending_goto[0] == os.path.abspath(filepath):
+            self.goto_position(*self.pending_goto[1:])
+        self.pending_goto = None
+        self.update_title()
+        self.auto_save_generation = self.edit_generation
+
+    def cancel_load(self, event=None):
+        self.pending_goto = None
+        if self.loading:
+            self.stop_load()
+            self.current_file_path = None
+            self.record_session(session.RESET, payload=self.document.snapshot())
+            self.update_title()
+
+    def open_large_file(self, filepath):
+        file = open(filepath, "rb")
+        viewer_mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        encoding = self.detect_encoding(viewer_mmap[:self.load_first_chunk_size])
+        if encoding in ("utf-16", "utf-32"):
+            viewer_mmap.close()
+            file.close()
+            return False
+        self.viewer_file = file
+        self.viewer_mmap = viewer_mmap
+        self.viewer_encoding = encoding
+        self.viewer_top = 0
+        self.viewer_rendered = False
+        self.viewer_shift_id = None
+        self.line_offsets = array('Q', [0])
+        self.viewer_indexed = threading.Event()
+        self.viewer_cancel = threading.Event()
+        threading.Thread(target=self.build_line_index, daemon=True,
+                         args=(viewer_mmap, self.line_offsets, self.viewer_indexed, self.viewer_cancel)).start()
+        self.text_area.delete(1.0, tk.END)
+        self.text_area.config(state=tk.DISABLED)
+        self.undo_history.clear()
+        self.current_file_path = filepath
+        self.record_session_open(self.active_tab, filepath)
+        self.viewer_poll_id = self.root.after(1, self.poll_line_index)
+        return True
+
+    def build_line_index(self, viewer_mmap, offsets, indexed, cancel):
+        try:
+            pos = 0
+            while pos < len(viewer_mmap):
+                if cancel.is_set():
+                    return
+                block = viewer_mmap[pos:pos + self.viewer_index_block]
+                if block.endswith(b"\r") and viewer_mmap[pos + len(block):pos + len(block) + 1] == b"\n":
+                    block += b"\n"
+                ends = array('Q', accumulate(map(len, block.splitlines(True)), initial=pos))
+                del ends[0]
+                if not block.endswith((b"\n", b"\r")):
+                    ends.pop()
+                offsets.extend(ends)
+                pos += len(block)
+            indexed.set()
+        except ValueError:
+            pass
+
+    def poll_line_index(self):
+        if self.viewer_mmap is None:
+            return
+        if not self.viewer_rendered and (self.viewer_indexed.is_set() or len(self.line_offsets) > self.viewer_window):
+            self.viewer_rendered = True
+            self.render_viewer_window(0, 0)
+        if self.viewer_indexed.is_set():
+            self.update_title("read-only")
+        else:
+            self.update_title(f"read-only, indexing {self.line_offsets[-1] * 100 // len(self.viewer_mmap)}%")
+            self.viewer_poll_id = self.root.after(100, self.poll_line_index)
+
+    def viewer_line_count(self):
+        return len(self.line_offsets) if self.viewer_indexed.is_set() else len(self.line_offsets) - 1
+
+    def render_viewer_window(self, top, see_line):
+        count = self.viewer_line_count()
+        top = max(0, min(top, count - self.viewer_window))
+        end = min(top + self.viewer_window, count)
+        start_byte = self.line_offsets[top]
+        end_byte = self.line_offsets[end] if end < len(self.line_offsets) else len(self.viewer_mmap)
+        data = self.viewer_mmap[start_byte:min(end_byte, start_byte + self.viewer_max_bytes)]
+        text = self.normalize_newlines(data.decode(self.viewer_encoding, errors="replace"), False, True)[0]
+        self.viewer_top = top
+        self.text_area.config(state=tk.NORMAL)
+        self.text_area.delete(1.0, tk.END)
+        self.text_area.insert(1.0, text[:-1] if text.endswith("\n") else text)
+        self.text_area.config(state=tk.DISABLED)
+        self.text_area.edit_modified(False)
+        self.text_area.yview(f"{see_line - top + 1}.0")
+
+    def on_viewer_scroll(self, first, last):
+        if self.viewer_mmap is None or not self.viewer_rendered or self.viewer_shift_id:
+            return
+        near_end = float(last) > 0.9 and self.viewer_top + self.viewer_window < self.viewer_line_count()
+        near_start = float(first) < 0.1 and self.viewer_top > 0
+        if near_end or near_start:
+            self.viewer_shift_id = self.root.after_idle(self.shift_viewer_window)
+
+    def shift_viewer_window(self):
+        self.viewer_shift_id = None
+        line = self.viewer_top + int(self.text_area.index("@0,0").split(".")[0]) - 1
+        self.render_viewer_window(line - self.viewer_window // 2, line)
+
+    def viewer_byte_offset(self, index):
+        line, column = map(int, self.text_area.index(index).split("."))
+        prefix = self.text_area.get(f"{line}.0", f"{line}.{column}")
+        return self.line_offsets[self.viewer_top + line - 1] + len(prefix.encode(self.viewer_encoding, errors="replace"))
+
+    def viewer_search(self, query, nocase, next, on_done):
+        self.cancel_viewer_search()
+        cancel = self.viewer_search_cancel = threading.Event()
+        needle = query.encode(self.viewer_encoding, errors="replace")
+        pattern = re.compile(re.escape(needle), re.IGNORECASE if nocase else 0)
+        viewer_mmap = self.viewer_mmap
+        limit = len(viewer_mmap) if self.viewer_indexed.is_set() else self.line_offsets[-1]
+        start = self.viewer_byte_offset(tk.INSERT) + 1 if next else 0
+        result = queue.Queue()
+
+        def find(first, last):
+            for pos in range(first, last, self.viewer_index_block):
+                if cancel.is_set():
+                    return None
+                match = pattern.search(viewer_mmap[pos:min(pos + self.viewer_index_block + len(needle) - 1, last)])
+                if match:
+                    return pos + match.start(), pos + match.end()
+            return None
+
+        def worker():
+            try:
+                span = find(start, limit)
+                if span is None and next:
+                    span = find(0, min(start + len(needle) - 1, limit))
+                result.put(span)
+            except ValueError:
+                result.put(None)
+
+        def poll():
+            if cancel.is_set():
+                return
+            try:
+                span = result.get_nowait()
+            except queue.Empty:
+                self.root.after(50, poll)
+                return
+            self.viewer_search_cancel = None
+            self.update_title("read-only")
+            if span is None:
+                on_done(None)
+                return
+            line = bisect.bisect_right(self.line_offsets, span[0]) - 1
+            head = viewer_mmap[self.line_offsets[line]:span[0]].decode(self.viewer_encoding, errors="replace")
+            found = viewer_mmap[span[0]:span[1]].decode(self.viewer_encoding, errors="replace")
+            if self.tk_astral_units == 2:
+                column, length = textops.tk_column(head), textops.tk_column(found)
+            else:
+                column, length = len(head), len(found)
+            self.render_viewer_window(line - self.viewer_window // 4, line)
+            row = line - self.viewer_top + 1
+            on_done((f"{row}.{column}", f"{row}.{column + length}"))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.update_title("read-only, searching")
+        self.root.after(50, poll)
+
+    def cancel_viewer_search(self):
+        if self.viewer_search_cancel is not None:
+            self.viewer_search_cancel.set()
+            self.viewer_search_cancel = None
+
+    def count_viewer_words(self):
+        viewer_mmap = self.viewer_mmap
+        encoding = self.viewer_encoding
+        result = queue.Queue()
+
+        def worker():
+            words = characters = 0
+            previous = b" "
+            continuation_bytes = bytes(range(0x80, 0xC0))
+            try:
+                for pos in range(0, len(viewer_mmap), self.viewer_index_block):
+                    block = viewer_mmap[pos:pos + self.viewer_index_block]
+                    words += len(block.split())
+                    if not previous.isspace() and not block[:1].isspace():
+                        words -= 1
+                    characters += len(block) - block.count(b"\r\n")
+                    if previous == b"\r" and block[:1] == b"\n":
+                        characters -= 1
+                    if encoding.startswith("utf-8"):
+                        characters -= len(block) - len(block.translate(None, continuation_bytes))
+                    previous = block[-1:]
+                result.put((words, characters))
+            except ValueError as e:
+                result.put(e)
+
+        def poll():
+            try:
+                counts = result.get_nowait()
+            except queue.Empty:
+                self.root.after(50, poll)
+                return
+            if isinstance(counts, Exception):
+                messagebox.showerror("Word/Character Count", f"Failed to count words: {counts}")
+            else:
+                messagebox.showinfo("Word/Character Count", f"Words: {counts[0]}\nCharacters: {counts[1]}")
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(50, poll)
+
+    def close_viewer(self):
+        if self.viewer_mmap is None:
+            return
+        self.viewer_cancel.set()
+        self.cancel_viewer_search()
+        self.root.after_cancel(self.viewer_poll_id)
+        if self.viewer_shift_id:
+            self.root.after_cancel(self.viewer_shift_id)
+        self.text_area.config(state=tk.NORMAL)
+        self.text_area.delete(1.0, tk.END)
+        self.text_area.edit_modified(False)
+        self.auto_save_generation = self.edit_generation
+        self.viewer_mmap.close()
+        self.viewer_file.close()
+        self.viewer_mmap = None
+        self.current_file_path = None
+        self.record_session(session.RESET, payload="")
+        self.update_title()
 
     def save_file(self, event=None):
+        if self.loading:
+            messagebox.showinfo("Save File", "Please wait until the file has finished loading.")
+            return
+        if self.viewer_mmap is not None:
+            messagebox.showinfo("Save File", "Large files are opened read-only and cannot be saved.")
+            return
         filepath = self.current_file_path if hasattr(self, 'current_file_path') and self.current_file_path else None
         if not filepath:
-            filepath = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
-            if not filepath:
-                return
-            self.current_file_path = filepath 
+            self.save_as_file()
+            return
 
-        try:
-            with open(filepath, "w") as file:
-                file.write(self.text_area.get(1.0, tk.END))
-            self.root.title(f"ZenEdit - {os.path.basename(filepath)}")
-        except Exception as e:
-            messagebox.showerror("Save File", f"Failed to save file: {e}")
+        if self.follow_partial:
+            messagebox.showinfo("Save File", "This buffer was trimmed or rotated while following the file and no longer "
+                                "matches it. Choose a new file name to save the text.")
+            self.save_as_file()
+            return
+
+        if not self.confirm_overwrite(filepath, "Save File"):
+            return
+
+        def on_done(error):
+            if error:
+                messagebox.showerror("Save File", f"Failed to save file: {error}")
+        self.start_save(filepath, on_done)
 
     def save_as_file(self):
+        if self.loading:
+            messagebox.showinfo("Save As File", "Please wait until the file has finished loading.")
+            return
+        if self.viewer_mmap is not None:
+            messagebox.showinfo("Save As File", "Large files are opened read-only and cannot be saved.")
+            return
         filepath = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
         if not filepath:
             return
-        try:
-            with open(filepath, "w") as file:
-                file.write(self.text_area.get(1.0, tk.END))
-            self.current_file_path = filepath  
-            self.root.title(f"ZenEdit - {os.path.basename(filepath)}")
-        except Exception as e:
-            messagebox.showerror("Save As File", f"Failed to save file: {e}")
+        def on_done(error):
+            if error:
+                messagebox.showerror("Save As File", f"Failed to save file: {error}")
+        self.start_save(filepath, on_done, save_as=True)
+
+    def confirm_close(self, title, message):
+        if self.loading or self.viewer_mmap is not None or not self.text_area.edit_modified():
+            return True
+        response = messagebox.askyesnocancel(title, message)
+        if response is None:
+            return False
+        if response:
+            self.save_file()
+            self.wait_for_saves()
+            return not self.text_area.edit_modified()
+        return True
 
     def quit(self):
-        response = False
-        if self.text_area.edit_modified():
-            response = messagebox.askyesnocancel("Save on Exit", "Do you want to save the changes before exiting?")
-        if response is True:
-            self.save_file()
-        elif response is None:
-            return
-        if response is not None:
-            self.root.destroy()
+        for tab in [self.active_tab] + [tab for tab in self.tabs if tab is not self.active_tab]:
+            if tab is not self.active_tab:
+                if not tab["modified"]:
+                    continue
+                self.switch_tab(tab)
+            if not self.confirm_close("Save on Exit", "Do you want to save the changes before exiting?"):
+                return
+        if self.find_cancel is not None:
+            self.find_cancel.set()
+        if self.find_pool is not None:
+            self.find_pool.shutdown(wait=False, cancel_futures=True)
+        self.wait_for_saves()
+        self.flush_config(wait=True)
+        if self.session_journal is not None:
+            self.session_journal.close(remove=True)
+        self.root.destroy()
 
 #Edit
     def undo_text(self, event=None):
-        try:
-            self.text_area.edit_undo()
-        except tk.TclError:
-            pass
+        if not self.loading and self.viewer_mmap is None:
+            group = self.undo_history.undo()
+            if group:
+                self.apply_undo_group(reversed(group), True)
         return "break"
 
     def redo_text(self, event=None):
-        try:
-            self.text_area.edit_redo()
-        except tk.TclError:
-            pass
+        if not self.loading and self.viewer_mmap is None:
+            group = self.undo_history.redo()
+            if group:
+                self.apply_undo_group(group, False)
         return "break"
 
+    def apply_undo_group(self, deltas, undo):
+        self.undo_applying = True
+        try:
+            for op, offset, text in deltas:
+                if (op == "insert") == undo:
+                    self.text_area.delete(self.offset_index(offset), self.offset_index(offset + len(text)))
+                else:
+                    self.text_area.insert(self.offset_index(offset), text)
+                    offset += len(text)
+        finally:
+            self.undo_applying = False
+        self.text_area.mark_set(tk.INSERT, self.offset_index(offset))
+        self.text_area.see(tk.INSERT)
+
     def copy_text(self, event=None):
             self.text_area.event_generate("<<Copy>>")
             return "break"
@@ -335,23 +1859,57 @@ class ZenEdit:
             search_entry.focus_set()
             case_sensitive = tk.BooleanVar(value=False)
             tk.Checkbutton(search_window, text="Case Sensitive", variable=case_sensitive).pack(side="left")
+            use_regex = tk.BooleanVar(value=False)
+            tk.Checkbutton(search_window, text="Regex", variable=use_regex).pack(side="left")
+            whole_word = tk.BooleanVar(value=False)
+            tk.Checkbutton(search_window, text="Whole Word", variable=whole_word).pack(side="left")
+            self.search_status = tk.StringVar()
+            tk.Label(search_window, textvariable=self.search_status, width=14).pack(side="left")
             highlight_tag = "search_highlight"
             highlight_background = self.text_area.cget("selectbackground")
             highlight_foreground = self.text_area.cget("selectforeground")
             self.text_area.tag_configure(highlight_tag, background=highlight_background, foreground=highlight_foreground)
+            self.text_area.tag_configure("search_match", underline=True)
+            update_id = None
+
+            def update_index(*args):
+                nonlocal update_id
+                if update_id:
+                    search_window.after_cancel(update_id)
+                    update_id = None
+                search_query = search_entry.get()
+                if not search_query or self.viewer_mmap is not None:
+                    self.clear_search_index()
+                    return
+                try:
+                    pattern = textops.compile_pattern(search_query, case_sensitive.get(), use_regex.get(), whole_word.get())
+                except re.error:
+                    self.clear_search_index()
+                    self.search_status.set("Invalid pattern")
+                    return
+                self.build_search_index(pattern)
 
-            def do_search(next=False):
+            def schedule_update(event=None):
+                nonlocal update_id
+                if update_id:
+                    search_window.after_cancel(update_id)
+                update_id = search_window.after(self.search_debounce, update_index)
+
+            def do_search(next=False, previous=False):
                 search_query = search_entry.get()
                 if not search_query:
                     return
-                start_idx = '1.0' if not next else self.text_area.index(tk.INSERT) + '+1c'
-                search_args = {'nocase': not case_sensitive.get(), 'regexp': False}
                 self.text_area.tag_remove(highlight_tag, "1.0", tk.END) 
-                search_idx = self.text_area.search(search_query, start_idx, stopindex=tk.END, **search_args)
-                if not search_idx and next:
-                    search_idx = self.text_area.search(search_query, "1.0", stopindex=tk.END, **search_args)
+                if self.viewer_mmap is not None:
+                    self.viewer_search(search_query, not case_sensitive.get(), next or previous, show_found)
+                    return
+                if update_id or self.search_pattern is None:
+                    update_index()
+                show_found(self.find_search_match(next, previous) if self.search_pattern is not None else None)
+
+            def show_found(found):
+                search_idx, end_idx = found if found else ("", "")
                 if search_idx:
-                    end_idx = f"{search_idx}+{len(search_query)}c"
                     self.text_area.tag_add(highlight_tag, search_idx, end_idx)
                     self.text_area.mark_set(tk.INSERT, end_idx)
                     self.text_area.see(search_idx)
@@ -362,6 +1920,11 @@ class ZenEdit:
                     messagebox.showinfo("Search", "Text not found.")
 
             def close_search():
+                if update_id:
+                    search_window.after_cancel(update_id)
+                self.cancel_viewer_search()
+                self.clear_search_index()
+                self.search_status = None
                 self.text_area.tag_remove(highlight_tag, "1.0", tk.END)
                 if hasattr(self, 'last_search_start') and hasattr(self, 'last_search_end'):
                     self.text_area.tag_add(tk.SEL, self.last_search_start, self.last_search_end)
@@ -369,10 +1932,137 @@ class ZenEdit:
                     self.text_area.see(self.last_search_start)
                 search_window.destroy()
             search_window.protocol("WM_DELETE_WINDOW", close_search)
+            for variable in (case_sensitive, use_regex, whole_word):
+                variable.trace('w', update_index)
             tk.Button(search_window, text="Find", command=do_search).pack(side="left")
+            tk.Button(search_window, text="Previous", command=lambda: do_search(previous=True)).pack(side="left")
             tk.Button(search_window, text="Next", command=lambda: do_search(next=True)).pack(side="left")
             tk.Button(search_window, text="Close", command=close_search).pack(side="left")
+            search_entry.bind("<KeyRelease>", lambda event: schedule_update() if event.keysym not in ("Return", "Escape") else None)
             search_entry.bind("<Return>", lambda event: do_search(next=True))
+            search_entry.bind("<Shift-Return>", lambda event: do_search(previous=True))
+
+    def build_search_index(self, pattern):
+        self.search_pattern = pattern
+        self.search_dirty = None
+        self.search_rebuild = False
+        self.search_pending_edits = 0
+        self.search_current = None
+        self.search_multiline = textops.may_span_lines(pattern)
+        text = self.buffer_text()
+        wide_astral = self.tk_astral_units == 2
+        self.search_matches = [(line, column, end_line, end_column)
+                               for match, line, column, end_line, end_column in textops.iter_match_indices(text, pattern, 1, wide_astral)
+                               if (end_line, end_column) > (line, column)]
+        self.refresh_search_view()
+
+    def clear_search_index(self):
+        self.search_pattern = None
+        self.search_matches = []
+        if self.minimap_lengths is not None:
+            self.schedule_minimap()
+        self.search_dirty = None
+        self.search_current = None
+        for after_id in (self.search_rescan_id, self.search_highlight_id):
+            if after_id:
+                self.root.after_cancel(after_id)
+        self.search_rescan_id = self.search_highlight_id = None
+        self.text_area.tag_remove("search_match", "1.0", tk.END)
+        if self.search_status is not None:
+            self.search_status.set("")
+
+    def update_search_index_for_edit(self, op, start, arg):
+        if not self.search_rebuild:
+            self.search_pending_edits += 1
+            if self.search_pending_edits > 1000 or self.search_multiline:
+                self.search_rebuild = True
+                self.search_matches = []
+        if not self.search_rebuild:
+            line, last, shift = self.edit_line_span(op, start, arg)
+            matches = self.search_matches
+            lo = bisect.bisect_left(matches, (line,))
+            hi = bisect.bisect_left(matches, (last + 1,))
+            if shift:
+                matches[hi:] = [(match_line + shift, column, end_line + shift, end_column)
+                                for match_line, column, end_line, end_column in matches[hi:]]
+            del matches[lo:hi]
+            self.search_dirty = self.merge_dirty_lines(self.search_dirty, op, line, last, shift)
+        if not self.search_rescan_id:
+            self.search_rescan_id = self.root.after_idle(self.rescan_search_index)
+
+    def rescan_search_index(self):
+        self.search_rescan_id = None
+        if self.search_pattern is None:
+            return
+        if self.search_rebuild:
+            self.build_search_index(self.search_pattern)
+            return
+        self.search_pending_edits = 0
+        if not self.search_dirty:
+            return
+        first, last = self.search_dirty
+        self.search_dirty = None
+        text = self.buffer_lines(first, last)
+        matches = self.search_matches
+        lo = bisect.bisect_left(matches, (first,))
+        hi = bisect.bisect_left(matches, (last + 1,))
+        wide_astral = self.tk_astral_units == 2
+        matches[lo:hi] = [(line, column, end_line, end_column)
+                          for match, line, column, end_line, end_column in textops.iter_match_indices(text, self.search_pattern, first,
+                                                                                                       wide_astral)
+                          if (end_line, end_column) > (line, column)]
+        self.search_current = None
+        self.refresh_search_view()
+
+    def refresh_search_view(self):
+        self.update_search_status()
+        if self.minimap_lengths is not None:
+            self.schedule_minimap()
+        if not self.search_highlight_id:
+            self.search_highlight_id = self.root.after_idle(self.highlight_visible_matches)
+
+    def update_search_status(self):
+        if self.search_status is None:
+            return
+        total = len(self.search_matches)
+        if self.search_current is not None and total:
+            self.search_status.set(f"{self.search_current + 1} of {total}")
+        else:
+            self.search_status.set(f"{total} matches" if total != 1 else "1 match")
+
+    def highlight_visible_matches(self):
+        self.search_highlight_id = None
+        self.text_area.tag_remove("search_match", "1.0", tk.END)
+        if self.search_pattern is None:
+            return
+        first = int(self.text_area.index("@0,0").split(".")[0])
+        last = int(self.text_area.index(f"@0,{self.text_area.winfo_height()}").split(".")[0])
+        lo = bisect.bisect_left(self.search_matches, (first,))
+        hi = min(bisect.bisect_left(self.search_matches, (last + 1,)), lo + 2000)
+        for line, column, end_line, end_column in self.search_matches[lo:hi]:
+            self.text_area.tag_add("search_match", f"{line}.{column}", f"{end_line}.{end_column}")
+
+    def find_search_match(self, next=False, previous=False):
+        if self.search_rescan_id:
+            self.root.after_cancel(self.search_rescan_id)
+            self.rescan_search_index()
+        matches = self.search_matches
+        if not matches:
+            return None
+        if previous:
+            reference = getattr(self, 'last_search_start', None) or tk.INSERT
+            current = (bisect.bisect_left(matches, self.index_tuple(reference)) - 1) % len(matches)
+        elif next:
+            current = bisect.bisect_left(matches, self.index_tuple(tk.INSERT)) % len(matches)
+        else:
+            current = 0
+        self.search_current = current
+        self.update_search_status()
+        line, column, end_line, end_column = matches[current]
+        return f"{line}.{column}", f"{end_line}.{end_column}"
+
+    def index_tuple(self, index):
+        return tuple(map(int, self.text_area.index(index).split(".")))
 
     def replace_text(self, event=None):
         replace_window = tk.Toplevel(self.root)
@@ -385,34 +2075,24 @@ class ZenEdit:
         replace_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
         case_sensitive = tk.BooleanVar(value=False)
         tk.Checkbutton(replace_window, text="Case Sensitive", variable=case_sensitive).pack(side=tk.LEFT)
+        use_regex = tk.BooleanVar(value=False)
+        tk.Checkbutton(replace_window, text="Regex", variable=use_regex).pack(side=tk.LEFT)
 
         def do_replace():
             search_query = find_entry.get()
             replacement = replace_entry.get()
             if search_query and replacement is not None:
-                all_text = self.text_area.get("1.0", tk.END)
-                count = 0
-
-                if case_sensitive.get():
-                    count = all_text.count(search_query)
-                    updated_text = all_text.replace(search_query, replacement)
-                else:
-                    lower_text = all_text.lower()
-                    lower_query = search_query.lower()
-                    count = lower_text.count(lower_query)
-                    
-                    updated_text = all_text[:0]
-                    start = 0
-                    while True:
-                        idx = lower_text.find(lower_query, start)
-                        if idx == -1:
-                            updated_text += all_text[start:]
-                            break
-                        updated_text += all_text[start:idx] + replacement
-                        start = idx + len(search_query)
-
-                self.text_area.delete("1.0", tk.END)
-                self.text_area.insert("1.0", updated_text)
+                if self.loading or self.viewer_mmap is not None:
+                    messagebox.showinfo("Replace", "Replace is not available while the file is loading or opened read-only.")
+                    return
+                try:
+                    pattern = textops.compile_pattern(search_query, case_sensitive.get(), use_regex.get())
+                    segments, count = textops.find_replace_segments(self.buffer_text(), pattern, replacement, use_regex.get(),
+                                                                      self.tk_astral_units == 2)
+                except (re.error, IndexError) as e:
+                    messagebox.showerror("Replace", f"Invalid pattern: {e}")
+                    return
+                self.apply_replace_segments(segments)
                 messagebox.showinfo("Replace", f"Replaced {count} occurrences of '{search_query}' with '{replacement}'.")
                 replace_window.destroy()
         replace_button = tk.Button(replace_window, text="Replace All", command=do_replace)
@@ -424,15 +2104,218 @@ class ZenEdit:
 
         find_entry.focus_set()
 
+    def apply_replace_segments(self, segments):
+        if not segments:
+            return
+        self.undo_history.begin_group()
+        try:
+            for start_line, start_column, end_line, end_column, end, parts in reversed(segments):
+                self.replace_range(f"{start_line}.{start_column}", f"{end_line}.{end_column}", "".join(parts))
+        finally:
+            self.undo_history.end_group()
+            self.text_area.event_generate("<<Change>>", when="tail")
+
+    def replace_range(self, start, end, text):
+        if start != end:
+            self.on_text_edit("delete", start, end)
+        if text:
+            self.on_text_edit("insert", start, text)
+        self.root.tk.call(self.text_area_orig, "replace", start, end, text)
+
+    def find_in_files(self):
+            find_window = tk.Toplevel(self.root)
+            find_window.title("Find in Files")
+            options_frame = tk.Frame(find_window)
+            options_frame.pack(side="top", fill="x")
+            tk.Label(options_frame, text="Find:").grid(row=0, column=0, sticky="w")
+            query_entry = tk.Entry(options_frame)
+            query_entry.grid(row=0, column=1, columnspan=4, sticky="ew")
+            tk.Label(options_frame, text="Folder:").grid(row=1, column=0, sticky="w")
+            folder_entry = tk.Entry(options_frame)
+            folder_entry.grid(row=1, column=1, columnspan=3, sticky="ew")
+            folder = os.path.dirname(self.current_file_path) if self.current_file_path else os.getcwd()
+            folder_entry.insert(0, os.path.abspath(folder))
+            options_frame.columnconfigure(1, weight=1)
+            case_sensitive = tk.BooleanVar(value=False)
+            use_regex = tk.BooleanVar(value=False)
+            whole_word = tk.BooleanVar(value=False)
+            use_index = tk.BooleanVar(value=self.config["find_use_index"])
+            for column, (text, variable) in enumerate((("Case Sensitive", case_sensitive), ("Regex", use_regex),
+                                                       ("Whole Word", whole_word), ("Use Index", use_index)), 1):
+                tk.Checkbutton(options_frame, text=text, variable=variable).grid(row=2, column=column, sticky="w")
+            results_frame = tk.Frame(find_window)
+            results_frame.pack(side="top", fill="both", expand=True)
+            results_list = tk.Listbox(results_frame, width=100, height=20, activestyle="none")
+            scrollbar = tk.Scrollbar(results_frame, command=results_list.yview)
+            results_list.config(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side="right", fill="y")
+            results_list.pack(side="left", fill="both", expand=True)
+            status = tk.StringVar()
+            tk.Label(find_window, textvariable=status, anchor="w").pack(side="bottom", fill="x")
+            hits = []
+            search = {"results": None, "root": None, "started": 0.0}
+
+            def browse():
+                directory = filedialog.askdirectory(parent=find_window, initialdir=folder_entry.get())
+                if directory:
+                    folder_entry.delete(0, tk.END)
+                    folder_entry.insert(0, directory)
+
+            def stop():
+                if self.find_cancel is not None:
+                    self.find_cancel.set()
+                    self.find_cancel = None
+                if self.find_poll_id is not None:
+                    self.root.after_cancel(self.find_poll_id)
+                    self.find_poll_id = None
+
+            def start(event=None):
+                query = query_entry.get()
+                root = os.path.abspath(folder_entry.get())
+                if not query:
+                    return
+                if not os.path.isdir(root):
+                    messagebox.showerror("Find in Files", f"Failed to search: {root} is not a folder", parent=find_window)
+                    return
+                try:
+                    textops.compile_pattern(query, case_sensitive.get(), use_regex.get(), whole_word.get())
+                except re.error as e:
+                    messagebox.showerror("Find in Files", f"Failed to search: {e}", parent=find_window)
+                    return
+                stop()
+                if use_index.get() != self.config["find_use_index"]:
+                    self.config["find_use_index"] = use_index.get()
+                    self.save_config()
+                options = {"query": query, "case_sensitive": case_sensitive.get(), "regex": use_regex.get(),
+                           "whole_word": whole_word.get(), "max_matches": self.config["find_max_results"],
+                           "max_size": self.config["find_max_file_size"],
+                           "max_index_size": self.config["find_max_index_size"]}
+                if self.find_pool is None:
+                    self.find_pool = futures.ProcessPoolExecutor(max_workers=self.find_workers,
+                                                                 mp_context=multiprocessing.get_context("spawn"))
+                hits.clear()
+                results_list.delete(0, tk.END)
+                search.update(results=queue.Queue(), root=root, started=time.perf_counter())
+                self.find_cancel = threading.Event()
+                threading.Thread(target=self.find_worker, args=(root, options, use_index.get(), search["results"], self.find_cancel),
+                                 daemon=True).start()
+                status.set("Searching...")
+                self.find_poll_id = self.root.after(self.find_poll_interval, self.poll_find_results, search, hits, results_list, status)
+
+            def open_hit(event=None):
+                selection = results_list.curselection()
+                if selection:
+                    path, line, column, length, preview = hits[selection[0]]
+                    self.open_file_at(path, line, column, length)
+
+            def close():
+                stop()
+                find_window.destroy()
+
+            tk.Button(options_frame, text="Browse...", command=browse).grid(row=1, column=4, sticky="ew")
+            tk.Button(options_frame, text="Search", command=start).grid(row=0, column=5, sticky="ew")
+            tk.Button(options_frame, text="Stop", command=stop).grid(row=1, column=5, sticky="ew")
+            query_entry.bind("<Return>", start)
+            results_list.bind("<Double-Button-1>", open_hit)
+            results_list.bind("<Return>", open_hit)
+            find_window.bind("<Escape>", lambda event: close())
+            find_window.protocol("WM_DELETE_WINDOW", close)
+            query_entry.focus_set()
+
+    def find_worker(self, root, options, use_index, results, cancel):
+        def emit(kind, value):
+            results.put((kind, value))
+
+        with self.find_lock:
+            if cancel.is_set():
+                return
+            try:
+                index = None
+                if use_index:
+                    index = self.find_indexes.get(root)
+                    if index is None:
+                        index = self.find_indexes[root] = findfiles.TrigramIndex.load(findfiles.index_path(self.find_index_root, root))
+                counts = findfiles.find_in_files(root, options, self.find_pool, index, emit, cancel, self.find_workers)
+                results.put(("done", counts))
+            except Exception as e:
+                results.put(("error", e))
+
+    def poll_find_results(self, search, hits, results_list, status):
+        self.find_poll_id = None
+        if not results_list.winfo_exists():
+            return
+        lines = []
+        finished = None
+        limit = self.config["find_max_results"]
+        while finished is None:
+            try:
+                kind, value = search["results"].get_nowait()
+            except queue.Empty:
+                break
+            if kind == "hits":
+                for hit in value[:max(0, limit - len(hits))]:
+                    hits.append(hit)
+                    path, line, column, length, preview = hit
+                    lines.append(f"{os.path.relpath(path, search['root'])}:{line}:{column + 1}: {preview}")
+                if len(hits) >= limit and self.find_cancel is not None:
+                    self.find_cancel.set()
+                    finished = ("limit", None)
+            elif kind == "progress":
+                status.set(f"Searching... {value['scanned']} files scanned, {len(hits)} matches")
+            else:
+                finished = (kind, value)
+        if lines:
+            results_list.insert(tk.END, *lines)
+        if finished is None:
+            self.find_poll_id = self.root.after(self.find_poll_interval, self.poll_find_results, search, hits, results_list, status)
+            return
+        self.find_cancel = None
+        kind, value = finished
+        elapsed = time.perf_counter() - search["started"]
+        if kind == "error":
+            if self.find_pool is not None:
+                self.find_pool.shutdown(wait=False, cancel_futures=True)
+                self.find_pool = None
+            status.set("Search failed")
+            messagebox.showerror("Find in Files", f"Failed to search: {value}", parent=results_list.winfo_toplevel())
+        elif kind == "limit":
+            status.set(f"Stopped after {len(hits)} matches")
+        else:
+            status.set(f"{len(hits)} matches in {value['files']} files ({value['scanned']} files scanned, {elapsed:.2f} s)")
+
     def goto_line(self):
             line_number = simpledialog.askinteger("Go to Line", "Enter line number:")
             if line_number is not None and line_number > 0:
-                index = f"{line_number}.0"
-                if self.text_area.compare(index, "<=", "end"):
-                    self.text_area.see(index)
-                    self.text_area.mark_set("insert", index)
-                    self.text_area.tag_remove(tk.SEL, "1.0", tk.END)
-                    self.text_area.tag_add(tk.SEL, index, f"{index} lineend")
+                self.goto_position(line_number)
+
+    def goto_position(self, line_number, column=0, length=None):
+            row = line_number
+            if self.viewer_mmap is not None:
+                if line_number > self.viewer_line_count():
+                    return
+                self.render_viewer_window(line_number - 1 - self.viewer_window // 4, line_number - 1)
+                row = line_number - self.viewer_top
+            end = None if length is None else column + length
+            if self.tk_astral_units == 2 and (column or end):
+                text = self.text_area.get(f"{row}.0", f"{row}.0 lineend")
+                column = textops.tk_column(text, column)
+                end = None if end is None else textops.tk_column(text, end)
+            index = f"{row}.{column}"
+            if self.text_area.compare(index, "<=", "end"):
+                self.text_area.see(index)
+                self.text_area.mark_set("insert", index)
+                self.text_area.tag_remove(tk.SEL, "1.0", tk.END)
+                self.text_area.tag_add(tk.SEL, index, f"{index} lineend" if end is None else f"{row}.{end}")
+
+    def open_file_at(self, filepath, line_number, column=0, length=None):
+        filepath = os.path.abspath(filepath)
+        self.open_files([filepath])
+        if not self.current_file_path or os.path.abspath(self.current_file_path) != filepath:
+            return
+        if self.loading:
+            self.pending_goto = (filepath, line_number, column, length)
+        else:
+            self.goto_position(line_number, column, length)
 #View
     def toggle_full_screen(self, event=None):
         self.fullScreenState = not self.fullScreenState
@@ -452,22 +2335,454 @@ class ZenEdit:
             self.root.update_idletasks()
 
     def toggle_line_numbers(self):
-            lines = self.text_area.get('1.0', 'end-1c').split('\n')
-            if lines[0].split(".")[0].isdigit():
-                stripped_lines = [line.split('. ', 1)[-1] if '. ' in line else line for line in lines]
+        show = not self.config["show_line_numbers"]
+        if show:
+            self.line_numbers.pack(side="left", fill="y", before=self.text_area)
+        else:
+            self.line_numbers.pack_forget()
+        self.config["show_line_numbers"] = show
+        self.schedule_line_numbers()
+        self.save_config()
+
+    def schedule_line_numbers(self, event=None):
+        if not self.line_numbers_id and self.config["show_line_numbers"]:
+            self.line_numbers_id = self.root.after_idle(self.redraw_line_numbers)
+
+    def redraw_line_numbers(self):
+        self.line_numbers_id = None
+        offset = self.viewer_top if self.viewer_mmap is not None else 0
+        last_line = int(self.text_area.index("end-1c").split(".")[0]) + offset
+        if self.viewer_mmap is not None:
+            last_line = max(last_line, self.viewer_line_count())
+        fg = self.text_area.cget("fg")
+        width = self.fonts.measure("9" * len(str(last_line))) + 12
+        self.line_numbers.config(width=width, bg=self.text_area.cget("bg"))
+        self.line_numbers.delete("all")
+        index = self.text_area.index("@0,0")
+        while self.text_area.compare(index, "<", "end"):
+            info = self.text_area.dlineinfo(index)
+            if info is None:
+                break
+            line = int(index.split(".")[0])
+            self.line_numbers.create_text(width - 6, info[1], anchor="ne", text=str(line + offset),
+                                          font=self.current_font, fill=fg)
+            next_index = self.text_area.index(f"{index}+1line")
+            if next_index == index:
+                break
+            index = next_index
+
+    def toggle_minimap(self):
+        if self.minimap.winfo_ismapped():
+            self.minimap.pack_forget()
+            self.minimap_lengths = None
+            self.minimap_dirty = None
+        else:
+            self.minimap.pack(side="right", fill="y", before=self.text_area)
+            self.minimap_lengths = array('I')
+            self.minimap_rebuild = True
+            self.schedule_minimap()
+        self.config["show_minimap"] = self.minimap_lengths is not None
+        self.save_config()
+
+    def update_minimap_for_edit(self, op, start, arg):
+        if not self.minimap_rebuild:
+            self.minimap_pending_edits += 1
+            if self.minimap_pending_edits > 1000:
+                self.minimap_rebuild = True
+        if not self.minimap_rebuild:
+            line, last, shift = self.edit_line_span(op, start, arg)
+            if op == "delete":
+                del self.minimap_lengths[line:last]
+            elif shift:
+                self.minimap_lengths[line:line] = array('I', [0]) * shift
+            self.minimap_dirty = self.merge_dirty_lines(self.minimap_dirty, op, line, last, shift)
+        self.schedule_minimap()
+
+    def schedule_minimap(self):
+        if not self.minimap_id and self.minimap_lengths is not None:
+            self.minimap_id = self.root.after(self.minimap_delay, self.refresh_minimap)
+
+    def refresh_minimap(self):
+        self.minimap_id = None
+        if self.minimap_lengths is None:
+            return
+        if self.viewer_mmap is not None:
+            self.minimap.delete("all")
+            self.minimap_bands = []
+            self.minimap_layout = None
+            self.minimap_rebuild = True
+            return
+        lengths = self.minimap_lengths
+        first = last = None
+        if self.minimap_rebuild:
+            lengths = self.minimap_lengths = array('I', map(len, self.buffer_text().split("\n")))
+            self.minimap_rebuild = False
+            self.minimap_dirty = None
+            self.minimap_layout = None
+        elif self.minimap_dirty:
+            first, last = self.minimap_dirty
+            last = min(last, len(lengths))
+            self.minimap_dirty = None
+            for line_number, line in enumerate(self.buffer_lines(first, last).split("\n"), first - 1):
+                lengths[line_number] = len(line)
+        self.minimap_pending_edits = 0
+        width = self.minimap.winfo_width()
+        rows = max(1, self.minimap.winfo_height() // self.minimap_row_height)
+        per_band = -(-len(lengths) // rows)
+        count = -(-len(lengths) // per_band)
+        layout = (width, per_band, self.text_area.cget("fg"), self.text_area.cget("bg"), self.config["selection_color"])
+        if layout != self.minimap_layout:
+            self.minimap.delete("all")
+            self.minimap.config(bg=layout[3])
+            self.minimap_bands = []
+            self.minimap_layout = layout
+            self.minimap_color = self.blend_colors(layout[2], layout[3])
+            first, last = 1, len(lengths)
+        elif len(lengths) != self.minimap_line_count and first is not None:
+            last = len(lengths)
+        self.minimap_line_count = len(lengths)
+        bands = self.minimap_bands
+        row_height = self.minimap_row_height
+        scale = width / self.minimap_columns
+        matches = self.search_matches
+        first_band = (first - 1) // per_band if first is not None else count
+        last_band = (last - 1) // per_band + 1 if last is not None else 0
+        for band in range(count):
+            start = band * per_band
+            if first_band <= band < last_band or band >= len(bands):
+                size = min(width, round(max(lengths[start:start + per_band]) * scale))
             else:
-                stripped_lines = [f"{i+1}. {line}" for i, line in enumerate(lines)]
-            self.text_area.delete('1.0', 'end')
-            self.text_area.insert('1.0', '\n'.join(stripped_lines))
+                size = bands[band][0]
+            hit = bool(matches) and bisect.bisect_left(matches, (start + 1,)) < bisect.bisect_left(matches, (start + per_band + 1,))
+            if band < len(bands) and bands[band][:2] == (size, hit):
+                continue
+            fill = layout[4] if hit else self.minimap_color
+            y = band * row_height
+            right = max(size, 4) if hit else size
+            if band < len(bands):
+                item = bands[band][2]
+                self.minimap.coords(item, 0, y, right, y + row_height)
+                self.minimap.itemconfigure(item, fill=fill)
+                bands[band] = (size, hit, item)
+            else:
+                bands.append((size, hit, self.minimap.create_rectangle(0, y, right, y + row_height, fill=fill, width=0)))
+        for size, hit, item in bands[count:]:
+            self.minimap.delete(item)
+        del bands[count:]
+        self.draw_minimap_viewport(*self.text_area.yview())
+
+    def blend_colors(self, first, second):
+        channels = [(a + b) // 2 // 256 for a, b in zip(self.root.winfo_rgb(first), self.root.winfo_rgb(second))]
+        return "#{:02x}{:02x}{:02x}".format(*channels)
+
+    def draw_minimap_viewport(self, first, last):
+        height = len(self.minimap_bands) * self.minimap_row_height
+        if not self.minimap.find_withtag("viewport"):
+            self.minimap.create_rectangle(0, 0, 0, 0, outline=self.text_area.cget("fg"), tags="viewport")
+        self.minimap.coords("viewport", 0, first * height, self.minimap.winfo_width() - 1, max(last * height, first * height + 2))
+        self.minimap.tag_raise("viewport")
+
+    def on_minimap_click(self, event):
+        height = len(self.minimap_bands) * self.minimap_row_height
+        if not height:
+            return
+        first, last = self.text_area.yview()
+        self.text_area.yview_moveto(min(max(event.y / height, 0.0), 1.0) - (last - first) / 2)
 
     def show_word_char_count(self):
-            text_content = self.text_area.get(1.0, "end-1c")
-            words = len(text_content.split())
-            characters = len(text_content)
+            if self.viewer_mmap is not None:
+                self.count_viewer_words()
+                return
+            if self.line_word_counts is not None:
+                self.refresh_stats()
+                words = self.total_words
+                characters = self.total_chars
+            else:
+                words, characters = textops.count_words(self.buffer_text())
             messagebox.showinfo(
                 "Word/Character Count", f"Words: {words}\nCharacters: {characters}"
             )
 
+    def toggle_status_bar(self):
+        show = not self.config["show_status_bar"]
+        if show:
+            self.status_bar.pack(side="bottom", fill="x", before=self.frame)
+            self.rebuild_stats()
+        else:
+            self.status_bar.pack_forget()
+            self.line_word_counts = None
+        self.config["show_status_bar"] = show
+        self.save_config()
+
+    def toggle_instrumentation(self):
+        self.config["instrumentation"] = not self.config["instrumentation"]
+        self.save_config()
+        self.set_instrumentation(self.config["instrumentation"] or self.performance_overlay is not None)
+
+    def toggle_performance_overlay(self):
+        if self.performance_overlay is not None:
+            self.root.after_cancel(self.performance_overlay_id)
+            self.performance_overlay.destroy()
+            self.performance_overlay = None
+            self.set_instrumentation(self.config["instrumentation"])
+            return
+        self.set_instrumentation(True)
+        self.performance_overlay = tk.Label(self.frame, justify="left", anchor="nw", font=("Courier", 9),
+                                            bg="#000000", fg="#00ff00", padx=6, pady=4)
+        self.performance_overlay.place(relx=1.0, x=-8, y=8, anchor="ne")
+        self.refresh_performance_overlay()
+
+    def refresh_performance_overlay(self):
+        window = self.performance_overlay_window
+        recent = self.instrumentation.recent(window)
+        lines = [f"Slowest operations, last {window:.0f} s"]
+        for kind, name, start, duration, thread, args in self.instrumentation.slowest(8, window):
+            lines.append(f"{duration * 1000:8.1f} ms  {kind:<7} {name[:40]}")
+        stalls = [event[3] for event in recent if event[0] == "stall"]
+        io_bytes = sum(event[5]["bytes"] for event in recent if event[0] == "io")
+        lines.append(f"Stalls: {len(stalls)} (max {max(stalls, default=0) * 1000:.0f} ms)  "
+                     f"I/O: {io_bytes / (1024 * 1024):.1f} MB")
+        self.performance_overlay.config(text="\n".join(lines))
+        self.performance_overlay_id = self.root.after(self.performance_overlay_interval, self.refresh_performance_overlay)
+
+    def export_performance_trace(self):
+        if not self.instrumentation.events:
+            messagebox.showinfo("Export Performance Trace", "No performance data has been recorded yet. Enable instrumentation or the performance overlay first.")
+            return
+        filepath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Chrome Trace Files", "*.json"), ("All Files", "*.*")])
+        if not filepath:
+            return
+        try:
+            self.instrumentation.export_chrome_trace(filepath)
+        except OSError as e:
+            messagebox.showerror("Export Performance Trace", f"Failed to export trace: {e}")
+
+    def confirm_overwrite(self, filepath, title, ask_again=True):
+        stat = session.file_stat(filepath)
+        if filepath != self.current_file_path or self.disk_stat is None or stat is None or stat == self.disk_stat:
+            return True
+        if stat == self.disk_warned and not ask_again:
+            return False
+        self.disk_warned = stat
+        return messagebox.askyesno(title, f"{os.path.basename(filepath)} was changed by another program. "
+                                          "Overwrite it with your version?")
+
+    def check_file_changes(self):
+        filepath = self.current_file_path
+        stat = None
+        if (self.config["watch_external_changes"] and filepath and not self.loading and self.viewer_mmap is None
+                and self.follow is None and not self.saves_pending and self.reload_job is None):
+            stat = session.file_stat(filepath)
+        if stat is not None and stat != self.disk_stat and stat != self.disk_warned:
+            if self.disk_stat is None:
+                self.disk_stat = stat
+            elif not self.text_area.edit_modified():
+                self.start_reload(filepath, stat)
+            else:
+                self.disk_warned = stat
+                if messagebox.askyesno("File Changed", f"{os.path.basename(filepath)} was changed by another program. "
+                                                       "Reload it and discard your changes?"):
+                    self.start_reload(filepath, stat)
+        self.watch_id = self.root.after(self.watch_interval, self.check_file_changes)
+
+    def start_reload(self, filepath, stat):
+        if filepath != self.current_file_path or self.loading or self.viewer_mmap is not None:
+            return
+        self.reload_job = (filepath, stat, self.edit_generation)
+        threading.Thread(target=self.reload_worker, args=(self.reload_job, self.document.snapshot()), daemon=True).start()
+        self.root.after(self.reload_poll_interval, self.poll_reload)
+
+    def reload_worker(self, job, document):
+        try:
+            text, encoding = self.read_text_file(job[0])
+            self.reload_results.put((job, textops.line_diff(document.get(), text), encoding))
+        except Exception as e:
+            self.reload_results.put((job, e, None))
+
+    def poll_reload(self):
+        try:
+            job, edits, encoding = self.reload_results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.reload_poll_interval, self.poll_reload)
+            return
+        self.reload_job = None
+        filepath, stat, generation = job
+        if isinstance(edits, Exception):
+            messagebox.showerror("Reload File", f"Failed to reload file: {edits}")
+            return
+        if filepath != self.current_file_path or generation != self.edit_generation or self.loading or self.viewer_mmap is not None:
+            return
+        self.undo_history.begin_group()
+        try:
+            for start, end, text in reversed(edits):
+                self.replace_range(self.offset_index(start), self.offset_index(end), text)
+        finally:
+            self.undo_history.end_group()
+            self.text_area.event_generate("<<Change>>", when="tail")
+        self.file_encoding = encoding
+        self.disk_stat = stat
+        self.disk_warned = None
+        self.loaded_size = None
+        self.text_area.edit_modified(False)
+        self.auto_save_generation = self.edit_generation
+        self.update_title()
+
+    def toggle_follow_mode(self):
+        if self.follow is not None:
+            self.stop_follow()
+            self.update_title()
+            return
+        if not self.current_file_path or self.loading or self.viewer_mmap is not None:
+            messagebox.showinfo("Follow File", "Follow mode needs a loaded file that is not open in the large file viewer.")
+            return
+        if self.file_compression is not None:
+            messagebox.showinfo("Follow File", "Follow mode is not available for compressed files.")
+            return
+        self.start_follow(self.loaded_size)
+        self.update_title()
+
+    def start_follow(self, offset):
+        try:
+            stat = os.stat(self.current_file_path)
+        except OSError as e:
+            messagebox.showerror("Follow File", f"Failed to follow file: {e}")
+            return
+        if offset is None or offset > stat.st_size:
+            offset = stat.st_size
+        self.resume_follow({"path": self.current_file_path, "offset": offset, "identity": (stat.st_dev, stat.st_ino),
+                            "decoder": codecs.getincrementaldecoder(self.file_encoding or "utf-8")(errors="replace"),
+                            "pending_cr": False})
+
+    def resume_follow(self, follow):
+        self.follow = follow
+        self.follow_id = self.root.after(0, self.poll_follow)
+
+    def stop_follow(self):
+        if self.follow_id is not None:
+            self.root.after_cancel(self.follow_id)
+            self.follow_id = None
+        if self.follow is not None:
+            self.disk_stat = session.file_stat(self.follow["path"])
+        self.follow = None
+
+    def poll_follow(self):
+        self.follow_id = None
+        follow = self.follow
+        try:
+            stat = os.stat(follow["path"])
+        except OSError:
+            stat = None
+        if stat is not None:
+            if (stat.st_dev, stat.st_ino) != follow["identity"] or stat.st_size < follow["offset"]:
+                self.follow_partial = True
+                follow.update(offset=0, identity=(stat.st_dev, stat.st_ino), pending_cr=False)
+                follow["decoder"].reset()
+            if stat.st_size > follow["offset"]:
+                started = time.perf_counter()
+                try:
+                    with open(follow["path"], "rb") as file:
+                        file.seek(follow["offset"])
+                        chunk = file.read(min(stat.st_size - follow["offset"], self.follow_read_limit))
+                except OSError:
+                    chunk = b""
+                self.instrumentation.record_io("follow", follow["path"], len(chunk), started)
+                follow["offset"] += len(chunk)
+                text, follow["pending_cr"] = self.normalize_newlines(follow["decoder"].decode(chunk), follow["pending_cr"], False)
+                self.append_follow_text(text)
+        behind = stat is not None and stat.st_size > follow["offset"]
+        self.follow_id = self.root.after(1 if behind else self.follow_poll_interval, self.poll_follow)
+
+    def append_follow_text(self, text):
+        if not text:
+            return
+        at_bottom = self.text_area.yview()[1] >= 1.0
+        modified = self.text_area.edit_modified()
+        self.follow_applying = True
+        try:
+            self.text_area.insert(tk.END, text)
+            excess = int(self.text_area.index("end-1c").split(".")[0]) - self.config["follow_max_lines"]
+            if excess > 0:
+                self.text_area.delete("1.0", f"{excess + 1}.0")
+                self.undo_history.clear()
+                self.follow_partial = True
+        finally:
+            self.follow_applying = False
+        self.text_area.edit_modified(modified)
+        if modified:
+            self.session_checkpoint_due = True
+        else:
+            self.auto_save_generation = self.edit_generation
+        if at_bottom:
+            self.text_area.see(tk.END)
+
+    def toggle_syntax_highlighting(self):
+        self.config["syntax_highlighting"] = not self.config["syntax_highlighting"]
+        self.save_config()
+        self.schedule_highlight()
+
+    def rebuild_stats(self):
+        text = self.buffer_text()
+        self.line_word_counts = [len(line.split()) for line in text.split("\n")]
+        self.total_words = sum(self.line_word_counts)
+        self.total_chars = len(text)
+        self.stats_dirty = None
+        self.stats_rebuild = False
+        self.stats_pending_edits = 0
+        self.schedule_status_bar()
+
+    def update_stats_for_edit(self, op, start, arg):
+        if not self.stats_rebuild:
+            self.stats_pending_edits += 1
+            if self.stats_pending_edits > 1000:
+                self.stats_rebuild = True
+        if not self.stats_rebuild:
+            line, last, shift = self.edit_line_span(op, start, arg)
+            counts = self.line_word_counts
+            self.total_chars = len(self.document)
+            if op == "delete":
+                self.total_words -= sum(counts[line:last])
+                del counts[line:last]
+            else:
+                counts[line:line] = [0] * shift
+            self.stats_dirty = self.merge_dirty_lines(self.stats_dirty, op, line, last, shift)
+        if not self.stats_update_id:
+            self.stats_update_id = self.root.after_idle(self.refresh_stats)
+
+    def refresh_stats(self):
+        if self.stats_update_id:
+            self.root.after_cancel(self.stats_update_id)
+            self.stats_update_id = None
+        if self.line_word_counts is None:
+            return
+        if self.stats_rebuild:
+            self.rebuild_stats()
+            return
+        self.stats_pending_edits = 0
+        if self.stats_dirty:
+            counts = self.line_word_counts
+            first, last = self.stats_dirty
+            last = min(last, len(counts))
+            self.stats_dirty = None
+            lines = self.buffer_lines(first, last).split("\n")
+            for line_number, line in enumerate(lines, first - 1):
+                words = len(line.split())
+                self.total_words += words - counts[line_number]
+                counts[line_number] = words
+        self.schedule_status_bar()
+
+    def schedule_status_bar(self, event=None):
+        if not self.status_bar_id and self.line_word_counts is not None:
+            self.status_bar_id = self.root.after_idle(self.update_status_bar)
+
+    def update_status_bar(self):
+        self.status_bar_id = None
+        line, column = self.index_tuple(tk.INSERT)
+        if self.viewer_mmap is not None:
+            self.status_bar.config(text=f"Ln {line + self.viewer_top}, Col {column + 1}    Lines: {self.viewer_line_count()}    (read-only)")
+            return
+        self.status_bar.config(text=f"Ln {line}, Col {column + 1}    Words: {self.total_words}    "
+                                    f"Characters: {self.total_chars}    Lines: {len(self.line_word_counts)}")
+
     def set_text_area_size(self):
         current_dimensions = f"{self.frame.winfo_width()}x{self.frame.winfo_height()}"
         dimensions = simpledialog.askstring("Text Area Size", "Enter size in pixels (width x height):", initialvalue=current_dimensions)
@@ -498,33 +2813,46 @@ class ZenEdit:
     def toggle_text_blink(self, event=None):
         if hasattr(self, 'is_blinking') and self.is_blinking:
             self.is_blinking = False
-            if hasattr(self, 'blink_id'):
-                self.root.after_cancel(self.blink_id)
-                del self.blink_id
-            self.text_area.tag_remove("blink", "1.0", "end")
+            self.remove_effect("blink")
+            self.text_area.config(fg=self.blink_foreground)
         else:
             blink_speed = simpledialog.askinteger("Blink Speed", "Enter blink speed in milliseconds:", initialvalue=500)
             if blink_speed is not None:
                 self.blink_speed = blink_speed
                 self.is_blinking = True
-                self.text_area.tag_configure("blink", foreground=self.text_area.cget("foreground"), background=self.text_area.cget("background"))
+                self.blink_foreground = self.text_area.cget("foreground")
                 self.start_blinking()
 
     def start_blinking(self):
-        if not self.is_blinking:
-            return
-        if "blink" not in self.text_area.tag_names():
-            self.text_area.tag_configure("blink", foreground=self.text_area.cget("foreground"), background=self.text_area.cget("background"))
-        
-        current_fg_color = self.text_area.tag_cget("blink", "foreground")
-        bg_color = self.text_area.cget("background")
-        new_color = bg_color if current_fg_color == self.text_area.cget("foreground") else self.text_area.cget("foreground")
-
-        self.text_area.tag_configure("blink", foreground=new_color)
-        self.text_area.tag_add("blink", "1.0", "end")
+        self.blink_hidden = False
+        self.blink_next = time.monotonic() + self.blink_speed / 1000
+        self.add_effect("blink", self.blink_frame)
 
-        if self.is_blinking:
-            self.blink_id = self.root.after(self.blink_speed, self.start_blinking)
+    def blink_frame(self, now):
+        if not self.is_blinking:
+            return False
+        if now >= self.blink_next:
+            self.blink_hidden = not self.blink_hidden
+            self.text_area.config(fg=self.text_area.cget("background") if self.blink_hidden else self.blink_foreground)
+            self.blink_next = now + self.blink_speed / 1000
+        return True
+
+    def add_effect(self, name, callback):
+        self.effects[name] = callback
+        if not self.effects_id:
+            self.effects_id = self.root.after(self.effects_frame_interval, self.run_effects)
+
+    def remove_effect(self, name):
+        self.effects.pop(name, None)
+
+    def run_effects(self):
+        self.effects_id = None
+        now = time.monotonic()
+        for name, callback in list(self.effects.items()):
+            if not callback(now):
+                self.effects.pop(name, None)
+        if self.effects:
+            self.effects_id = self.root.after(self.effects_frame_interval, self.run_effects)
 
     def toggle_typing_effect(self):
         if not self.effect_tw_active:
@@ -539,28 +2867,35 @@ class ZenEdit:
             self.interrupt_typing_effect()
 
     def start_typing_effect(self, speed):
-        content = self.text_area.get("1.0", "end-1c")
         self.text_area.tag_configure("invisible", foreground=self.text_area.cget("bg"))
         self.text_area.tag_add("invisible", "1.0", "end")
+        self.text_area.mark_set("effect_reveal", "1.0")
+        self.text_area.mark_gravity("effect_reveal", "left")
+        self.typing_speed = speed / 1000
+        self.typing_start = time.monotonic()
+        self.typing_revealed = 0
         self.effect_tw_active = True
+        self.add_effect("typing", self.reveal_characters)
 
-        def reveal_character(index):
-            if index < len(content) and self.effect_tw_active:
-                pos = f"1.0 + {index} chars"
-                self.text_area.tag_remove("invisible", pos)
-                self.text_area.mark_set("insert", f"{pos} + 1c")
-                self.text_area.see("insert")
-                self.root.after(speed, reveal_character, index + 1)
-            else:
-                self.text_area.tag_remove("invisible", "1.0", "end")
-                self.effect_tw_active = False
-                self.typing_effect_menu_label = "Start Typing Effect"
-                self.view_menu.entryconfig(0, label=self.typing_effect_menu_label)
-
-        reveal_character(0)
+    def reveal_characters(self, now):
+        if not self.effect_tw_active:
+            return False
+        due = int((now - self.typing_start) / self.typing_speed) - self.typing_revealed
+        if due > 0:
+            index = self.text_area.index(f"effect_reveal + {due} chars")
+            self.text_area.tag_remove("invisible", "effect_reveal", index)
+            self.text_area.mark_set("effect_reveal", index)
+            self.text_area.mark_set("insert", index)
+            self.text_area.see("insert")
+            self.typing_revealed += due
+            if self.text_area.compare(index, ">=", "end-1c"):
+                self.interrupt_typing_effect()
+                return False
+        return True
 
     def interrupt_typing_effect(self):
         self.effect_tw_active = False
+        self.remove_effect("typing")
         self.text_area.tag_remove("invisible", "1.0", "end")
         self.typing_effect_menu_label = "Start Typing Effect"
         self.view_menu.entryconfig(0, label=self.typing_effect_menu_label)
@@ -616,9 +2951,14 @@ class ZenEdit:
         font_window = tk.Toplevel(self.root)
         font_window.title("Choose Font")
         font_window.geometry("500x310")
-        font_listbox = tk.Listbox(font_window, width=30, height=10, exportselection=False)
+        list_frame = tk.Frame(font_window)
+        list_frame.pack(side="left", fill="y")
+        filter_text = tk.StringVar()
+        filter_entry = tk.Entry(list_frame, textvariable=filter_text)
+        filter_entry.pack(side="top", fill="x")
+        font_listbox = tk.Listbox(list_frame, width=30, height=10, exportselection=False)
         font_listbox.pack(side="left", fill="y")
-        scrollbar = tk.Scrollbar(font_window, command=font_listbox.yview)
+        scrollbar = tk.Scrollbar(list_frame, command=font_listbox.yview)
         scrollbar.pack(side="left", fill="y")
         font_listbox.config(yscrollcommand=scrollbar.set)
         preview_text = "The quick brown fox jumps over the lazy dog"
@@ -631,44 +2971,56 @@ class ZenEdit:
         tk.Checkbutton(font_window, text="Italic", variable=is_italic).pack()
         size_entry = tk.Spinbox(font_window, from_=8, to=72, textvariable=font_size, wrap=True)
         size_entry.pack()
+        selected_family = [self.config["font_family"]]
 
         def update_preview(*args):
             if font_listbox.curselection():
-                index = font_listbox.curselection()[0]
-                font_name = font_listbox.get(index)
-            else:
-                font_name = self.config["font_family"]
-            bold = 'bold' if is_bold.get() else 'normal'
-            italic = 'italic' if is_italic.get() else 'roman'
-            size = font_size.get()
-            preview_font = font.Font(family=font_name, size=size, weight=bold, slant=italic)
-            preview_label.config(font=preview_font)
-
-        def apply_font(*args): 
-            self.config["font_family"] = font_listbox.get(font_listbox.curselection()) or self.config.get("font_family", "Arial")
-            self.config["font_size"] = font_size.get()
+                selected_family[0] = font_listbox.get(font_listbox.curselection()[0])
+            try:
+                size = font_size.get()
+            except tk.TclError:
+                return
+            preview_label.config(font=self.fonts.configure_preview(selected_family[0], size, is_bold.get(), is_italic.get()))
+
+        def fill_font_list(*args):
+            families = self.fonts.families(filter_text.get())
+            font_listbox.delete(0, tk.END)
+            if families:
+                font_listbox.insert(tk.END, *families)
+            if selected_family[0] in families:
+                index = families.index(selected_family[0])
+                font_listbox.selection_set(index)
+                font_listbox.see(index)
+
+        def apply_font(*args):
+            try:
+                self.config["font_size"] = font_size.get()
+            except tk.TclError:
+                messagebox.showerror("Invalid Size", "Font size must be a whole number.")
+                return
+            self.config["font_family"] = selected_family[0]
             self.config["font_bold"] = is_bold.get()
             self.config["font_italic"] = is_italic.get()
-            self.current_font = font.Font(
-                family=self.config["font_family"],
-                size=self.config["font_size"],
-                weight='bold' if self.config.get("font_bold", False) else 'normal',
-                slant='italic' if self.config.get("font_italic", False) else 'roman',
-            )
-            self.text_area.config(font=self.current_font)
+            self.apply_font_config()
             self.save_config()
             font_window.destroy()
         font_listbox.bind("<<ListboxSelect>>", update_preview)
         is_bold.trace('w', update_preview)
         is_italic.trace('w', update_preview)
         font_size.trace('w', update_preview)
+        filter_text.trace('w', fill_font_list)
         font_window.bind('<Return>', apply_font)
-        for fnt in font.families():
-            font_listbox.insert(tk.END, fnt)
         apply_button = tk.Button(font_window, text="Apply", command=apply_font)
         apply_button.pack(pady=10)
+        filter_entry.focus_set()
+
+        update_preview()
+        font_window.after_idle(fill_font_list)
 
-        update_preview() 
+    def apply_font_config(self):
+        self.fonts.configure(self.config["font_family"], self.config["font_size"],
+                             self.config["font_bold"], self.config["font_italic"])
+        self.schedule_line_numbers()
 
     def change_font_size(self):
             font_size = simpledialog.askinteger(
@@ -676,13 +3028,7 @@ class ZenEdit:
             )
             if font_size:
                 self.config["font_size"] = font_size
-                self.current_font = font.Font(
-                    family=self.config["font_family"],
-                    size=font_size,
-                    weight="bold" if self.config.get("font_bold", False) else "normal",
-                    slant="italic" if self.config.get("font_italic", False) else "roman",
-                )
-                self.text_area.config(font=self.current_font)
+                self.apply_font_config()
                 self.save_config()
 
     def set_line_spacing(self):
@@ -774,6 +3120,7 @@ class ZenEdit:
             if color:
                 self.config["fg_color"] = color
                 self.text_area.config(fg=color)
+                self.blink_foreground = color
                 self.save_config()
 
     def change_caret_cursor_color(self):
@@ -813,6 +3160,13 @@ class ZenEdit:
         else:
             messagebox.showerror("Invalid Thickness", "Border thickness must be a non-negative integer.")
 
+    def set_compression_level(self):
+        level = simpledialog.askinteger("Compression Level", "Compression level for gzip, bz2 and xz files (1-9):",
+                                        initialvalue=self.config["compression_level"], minvalue=1, maxvalue=9)
+        if level is not None:
+            self.config["compression_level"] = level
+            self.save_config()
+
     def set_caret_cursor_thickness(self):
         thickness = simpledialog.askinteger("Caret Cursor Thickness", "Enter caret cursor thickness:", initialvalue=self.config.get("insertwidth", 2), minvalue=1)
         if thickness is not None and thickness > 0:
@@ -833,12 +3187,8 @@ class ZenEdit:
     def apply_config(self):
                 self.root.config(bg=self.config["root_bg_color"])
 
-                current_font = font.Font(family=self.config["font_family"],
-                                        size=self.config["font_size"],
-                                        weight="bold" if self.config["font_bold"] else "normal",
-                                        slant="italic" if self.config["font_italic"] else "roman")
-                self.text_area.config(font=current_font,
-                                    bg=self.config["bg_color"],
+                self.apply_font_config()
+                self.text_area.config(bg=self.config["bg_color"],
                                     fg=self.config["fg_color"],
                                     insertbackground=self.config["caret_cursor_color"],
                                     selectbackground=self.config["selection_color"],
@@ -862,12 +3212,15 @@ class ZenEdit:
     def show_about(self):
         messagebox.showinfo("About ZenEdit", "ZenEdit v1.0\nA simple text editor built with Tkinter. by Seehrum")
 
-    def save_config(self):
-        with open(self.config_file, 'w') as file:
-            json.dump(self.config, file, indent=4)
-
 if __name__ == "__main__":
+    startup_profile = StartupProfile(STARTED) if "--profile-startup" in sys.argv[1:] else None
+    filepaths = [arg for arg in sys.argv[1:] if arg != "--profile-startup"]
+    if startup_profile is not None:
+        startup_profile.mark("imports")
     root = tk.Tk()
-    editor = ZenEdit(root)
+    editor = ZenEdit(root, startup_profile)
+    if filepaths:
+        editor.open_files(filepaths)
+        editor.mark_startup("command-line files opened")
     root.protocol("WM_DELETE_WINDOW", editor.quit)
     root.mainloop()
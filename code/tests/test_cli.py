@@ -0,0 +1,42 @@
+import pytest
+
+from zenedit import cli
+
+
+def test_number_to_output_dir_and_summary(tmp_path, capsys):
+    source = tmp_path / "notes.txt"
+    source.write_text("a\nb\n")
+    out = tmp_path / "out"
+    assert cli.main(["-j", "1", "number", "--output-dir", str(out), str(source)]) == 0
+    assert (out / "notes.txt").read_text() == "1. a\n2. b\n"
+    assert "Processed 1 file," in capsys.readouterr().err
+
+
+def test_replace_in_place(tmp_path, capsys):
+    paths = [tmp_path / "a.txt", tmp_path / "b.txt"]
+    for path in paths:
+        path.write_text("cat cat\n")
+    assert cli.main(["-j", "1", "replace", "cat", "dog", "--in-place"] + [str(path) for path in paths]) == 0
+    assert [path.read_text() for path in paths] == ["dog dog\n", "dog dog\n"]
+    captured = capsys.readouterr()
+    assert "2 replacements" in captured.out and "Processed 2 files," in captured.err
+
+
+def test_output_dir_rejects_colliding_basenames(tmp_path, capsys):
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "data.txt").write_text(name)
+    out = tmp_path / "out"
+    with pytest.raises(SystemExit) as error:
+        cli.main(["number", "--output-dir", str(out), str(tmp_path / "one" / "data.txt"), str(tmp_path / "two" / "data.txt")])
+    assert error.value.code == 2
+    assert "would both be written to" in capsys.readouterr().err
+    assert not out.exists()
+
+
+def test_output_dir_rejects_overwriting_an_input(tmp_path, capsys):
+    source = tmp_path / "data.txt"
+    source.write_text("keep me\n")
+    with pytest.raises(SystemExit):
+        cli.main(["number", "--output-dir", str(tmp_path), str(source)])
+    assert source.read_text() == "keep me\n"
@@ -0,0 +1,38 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from zenedit import compression
+
+
+@pytest.mark.parametrize("name, compress", [("gzip", gzip.compress), ("bz2", bz2.compress), ("xz", lzma.compress)])
+def test_detect_and_round_trip(name, compress, tmp_path):
+    data = "café \U0001F600\n".encode("utf-8") * 100
+    assert compression.detect(compress(data)[:compression.MAGIC_LENGTH]) == name
+    path = tmp_path / "rotated.log.1"
+    with open(path, "wb") as file:
+        with compression.writer(name, file, 6) as stream:
+            stream.write(data)
+    assert compression.detect_file(str(path)) == name
+    with open(path, "rb") as file:
+        with compression.reader(name, file) as stream:
+            assert stream.read() == data
+
+
+def test_plain_text_starting_with_bzh_is_not_bzip2(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"BZh is the bzip2 magic\n")
+    assert compression.detect_file(str(path)) is None
+    assert compression.detect(b"BZh") is None
+    assert compression.detect(b"BZh0") is None
+    assert compression.detect(b"BZh9") == "bz2"
+
+
+def test_format_for_path():
+    assert compression.format_for_path("a.GZ") == "gzip"
+    assert compression.format_for_path("a.tar.bz2") == "bz2"
+    assert compression.format_for_path("a.xz") == "xz"
+    assert compression.format_for_path("a.txt") is None
@@ -0,0 +1,88 @@
+import concurrent.futures
+import json
+import os
+import threading
+import zlib
+
+from zenedit import findfiles
+
+
+def options(query, **overrides):
+    values = {"query": query, "case_sensitive": False, "regex": False, "whole_word": False,
+              "max_size": 1 << 20, "max_index_size": 1 << 20, "max_matches": 100}
+    values.update(overrides)
+    return values
+
+
+def search(root, index, query, **overrides):
+    hits = []
+
+    def emit(kind, value):
+        if kind == "hits":
+            hits.extend(value)
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        counts = findfiles.find_in_files(str(root), options(query, **overrides), executor, index, emit, threading.Event(), 2)
+    return sorted((os.path.relpath(path, root), line, column) for path, line, column, length, text in hits), counts
+
+
+def make_tree(root):
+    (root / "pkg").mkdir()
+    (root / ".git").mkdir()
+    (root / "a.txt").write_text("alpha\nneedle here\n")
+    (root / "pkg" / "b.py").write_text("x = 'Needle'\n")
+    (root / "pkg" / "c.bin").write_bytes(b"needle\0")
+    (root / ".git" / "d.txt").write_text("needle\n")
+
+
+def test_find_in_files_matches_and_skips(tmp_path):
+    make_tree(tmp_path)
+    hits, counts = search(tmp_path, None, "needle")
+    assert hits == [("a.txt", 2, 0), (os.path.join("pkg", "b.py"), 1, 5)]
+    assert counts["files"] == 2 and counts["scanned"] == 3
+    hits, counts = search(tmp_path, None, "ne+dle", regex=True, case_sensitive=True)
+    assert hits == [("a.txt", 2, 0)]
+
+
+def test_index_round_trips_as_json_and_tracks_changes(tmp_path):
+    root = tmp_path / "tree"
+    root.mkdir()
+    make_tree(root)
+    path = findfiles.index_path(str(tmp_path / "index"), str(root))
+    index = findfiles.TrigramIndex(path)
+    assert search(root, index, "needle")[0] == search(root, None, "needle")[0]
+    assert not index.dirty and os.path.exists(path)
+    with open(path, "rb") as file:
+        assert json.loads(zlib.decompress(file.read()))["version"] == findfiles.INDEX_VERSION
+    loaded = findfiles.TrigramIndex.load(path)
+    assert loaded.entries == index.entries
+    assert list(loaded.candidates(findfiles.trigrams("needle"))) != []
+    assert list(loaded.candidates(findfiles.trigrams("quick brown fox jumps"))) == [
+        (p, m, s) for p, (m, s, bits, mask) in loaded.entries.items() if bits == findfiles.ALWAYS]
+    (root / "pkg" / "b.py").write_text("x = 'haystack'\n")
+    (root / "e.txt").write_text("needle again\n")
+    os.remove(root / "a.txt")
+    hits, counts = search(root, loaded, "needle")
+    assert hits == [("e.txt", 1, 0)]
+    assert str(root / "a.txt") not in loaded.entries
+
+
+def test_unchanged_directories_are_not_listed_again(tmp_path, monkeypatch):
+    make_tree(tmp_path)
+    old = os.stat(tmp_path).st_mtime_ns - 10 * 10**9
+    for directory in (tmp_path, tmp_path / "pkg"):
+        os.utime(directory, ns=(old, old))
+    directories = {}
+    first = sorted(findfiles.iter_files(str(tmp_path), 1 << 20, directories))
+    assert set(directories) == {str(tmp_path), str(tmp_path / "pkg")}
+    listed = []
+    monkeypatch.setattr(findfiles, "list_directory", lambda directory: listed.append(directory))
+    assert sorted(findfiles.iter_files(str(tmp_path), 1 << 20, directories)) == first
+    assert listed == []
+
+
+def test_index_ignores_corrupt_or_foreign_files(tmp_path):
+    path = tmp_path / "x.index"
+    for data in (b"", b"not zlib", b"\x80\x04\x95garbage"):
+        path.write_bytes(data)
+        assert findfiles.TrigramIndex.load(str(path)).entries == {}
@@ -0,0 +1,69 @@
+import types
+
+import pytest
+
+from zenedit import fonts
+
+
+class FakeFont:
+    created = 0
+
+    def __init__(self, root=None, **options):
+        FakeFont.created += 1
+        self.options = options
+        self.calls = {"measure": 0, "metrics": 0}
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def measure(self, text):
+        self.calls["measure"] += 1
+        return len(text) * self.options["size"]
+
+    def metrics(self):
+        self.calls["metrics"] += 1
+        return {"linespace": self.options["size"] + 2}
+
+
+@pytest.fixture
+def font_module(monkeypatch):
+    listed = []
+
+    def families(root):
+        listed.append(root)
+        return ("Noto Sans", "Courier", "DejaVu Sans Mono", "Courier", "arial")
+
+    FakeFont.created = 0
+    monkeypatch.setattr(fonts, "font", types.SimpleNamespace(Font=FakeFont, families=families))
+    return listed
+
+
+def test_family_list_is_loaded_once_and_filtered(font_module):
+    service = fonts.FontService("root", "Courier", 12)
+    assert font_module == []
+    assert service.families() == ["arial", "Courier", "DejaVu Sans Mono", "Noto Sans"]
+    assert service.families("SANS") == ["DejaVu Sans Mono", "Noto Sans"]
+    assert font_module == ["root"]
+
+
+def test_configure_reuses_the_named_font(font_module):
+    service = fonts.FontService("root", "Courier", 12)
+    editor_font = service.font
+    service.configure("Courier", 14, bold=True)
+    assert service.font is editor_font and FakeFont.created == 1
+    assert editor_font.options == {"family": "Courier", "size": 14, "weight": "bold", "slant": "roman"}
+    preview = service.configure_preview("Noto Sans", 10, italic=True)
+    assert service.configure_preview("Noto Sans", 11) is preview and FakeFont.created == 2
+    assert preview.options["size"] == 11 and preview.options["slant"] == "roman"
+
+
+def test_measurements_are_cached_until_the_font_changes(font_module):
+    service = fonts.FontService("root", "Courier", 10)
+    assert service.measure("abc") == service.measure("abc") == 30
+    assert service.metrics("linespace") == service.metrics("linespace") == 12
+    assert service.font.calls == {"measure": 1, "metrics": 1}
+    service.configure("Courier", 10)
+    assert service.measure("abc") == 30 and service.font.calls["measure"] == 1
+    service.configure("Courier", 20)
+    assert service.measure("abc") == 60 and service.metrics("linespace") == 22
+    assert service.font.calls == {"measure": 2, "metrics": 2}
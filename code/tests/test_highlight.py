@@ -0,0 +1,60 @@
+from zenedit import highlight
+from zenedit.piece_table import PieceTable
+
+
+def lex_all(lexer, text):
+    document = PieceTable(text)
+    states, converged, tokens = highlight.lex_lines(lexer, document, 1, 1, document.line_count, lexer.initial_state, [], 0)
+    return states, tokens
+
+
+def words(line, tokens):
+    return [(line[start:end], token) for start, end, token in tokens]
+
+
+def test_lexer_for_path():
+    assert isinstance(highlight.lexer_for_path("a/b.PY"), highlight.PythonLexer)
+    assert isinstance(highlight.lexer_for_path("notes.md"), highlight.MarkdownLexer)
+    assert isinstance(highlight.lexer_for_path("data.json"), highlight.JsonLexer)
+    assert highlight.lexer_for_path("notes.txt") is None
+    assert highlight.lexer_for_path(None) is None
+
+
+def test_python_tokens_and_triple_quoted_state():
+    lexer = highlight.PythonLexer()
+    line = "def run(self): return 0x1F  # done"
+    tokens, state = lexer.tokenize(line, "")
+    assert words(line, tokens) == [("def", "keyword"), ("run", "definition"), ("self", "constant"), ("return", "keyword"),
+                                   ("0x1F", "number"), ("# done", "comment")]
+    states, tokens = lex_all(lexer, 'x = """doc\nstill doc\nend""" + 1\n')
+    assert states[:3] == ['"""', '"""', ""]
+    assert tokens[1] == [(0, 9, "string")]
+    assert tokens[2][0] == (0, 6, "string")
+
+
+def test_json_keys_and_markdown_fences():
+    line = '{"name": "zen", "size": -1.5e3, "ok": true}'
+    assert words(line, highlight.JsonLexer().tokenize(line, "")[0]) == [
+        ('"name"', "key"), ('"zen"', "string"), ('"size"', "key"), ("-1.5e3", "number"), ('"ok"', "key"), ("true", "constant")]
+    states, tokens = lex_all(highlight.MarkdownLexer(), "# Title\n```\n# not a heading\n```\n- **bold** `code`\n")
+    assert states[:4] == ["", "```", "```", ""]
+    assert tokens[0] == [(0, 7, "heading")]
+    assert tokens[2] == [(0, 15, "code")]
+    line = "- **bold** `code`"
+    assert words(line, tokens[4]) == [("-", "list"), ("**bold**", "strong"), ("`code`", "code")]
+
+
+def test_lex_lines_converges_with_cached_states():
+    lexer = highlight.PythonLexer()
+    document = PieceTable("a = 1\n" * 50)
+    states, converged, tokens = highlight.lex_lines(lexer, document, 1, 1, 50, "", [], 0)
+    document.insert(0, "b = 2\n")
+    states, converged, tokens = highlight.lex_lines(lexer, document, 1, 40, 45, "", states, 1)
+    assert converged and len(tokens) == 6
+
+
+def test_tokens_in_tk_columns():
+    lexer = highlight.PythonLexer()
+    document = PieceTable("s = '\U0001F600' # x")
+    states, converged, tokens = highlight.lex_lines(lexer, document, 1, 1, 1, "", [], 0, wide_astral=True)
+    assert tokens == [[(4, 8, "string"), (9, 12, "comment")]]
@@ -0,0 +1,55 @@
+import io
+import json
+import threading
+import time
+
+from zenedit.instrument import Instrumentation, StartupProfile
+
+
+def test_wrap_records_only_while_enabled():
+    instrumentation = Instrumentation(min_duration=0)
+    handler = instrumentation.wrap("on_key", lambda value: value * 2, detail=True)
+    assert handler(2) == 4
+    assert not instrumentation.events
+    instrumentation.enabled = True
+    assert handler(3) == 6
+    kind, name, start, duration, thread, args = instrumentation.events[0]
+    assert (kind, name, thread, args) == ("handler", "on_key 3", threading.get_ident(), None)
+    assert duration >= 0
+
+
+def test_ring_buffer_keeps_the_newest_events():
+    instrumentation = Instrumentation(capacity=3)
+    instrumentation.enabled = True
+    for number in range(5):
+        instrumentation.record("stall", f"stall {number}", time.perf_counter(), 0.01)
+    assert [event[1] for event in instrumentation.events] == ["stall 2", "stall 3", "stall 4"]
+
+
+def test_slowest_ranks_recent_events():
+    instrumentation = Instrumentation()
+    instrumentation.enabled = True
+    now = time.perf_counter()
+    instrumentation.record("handler", "old", now - 60, 5.0)
+    for name, duration in (("fast", 0.002), ("slow", 0.3), ("medium", 0.05)):
+        instrumentation.record("handler", name, now, duration)
+    assert [event[1] for event in instrumentation.slowest(2, window=10)] == ["slow", "medium"]
+
+
+def test_chrome_trace_export(tmp_path):
+    instrumentation = Instrumentation()
+    instrumentation.enabled = True
+    instrumentation.record_io("read", "/tmp/data.txt", 42, time.perf_counter())
+    path = tmp_path / "trace.json"
+    instrumentation.export_chrome_trace(str(path))
+    trace = json.loads(path.read_text())
+    event = trace["traceEvents"][0]
+    assert (event["name"], event["cat"], event["ph"], event["args"]["bytes"]) == ("read data.txt", "io", "X", 42)
+
+
+def test_startup_profile_report():
+    profile = StartupProfile(time.perf_counter())
+    profile.mark("ui built")
+    output = io.StringIO()
+    profile.report(output)
+    assert output.getvalue().rstrip().endswith("ui built")
@@ -0,0 +1,59 @@
+import random
+
+from zenedit.piece_table import PieceTable
+
+
+def test_insert_and_delete():
+    document = PieceTable("hello world")
+    document.insert(5, ",")
+    document.insert(len(document), "!\n")
+    document.delete(0, 1)
+    document.insert(0, "J")
+    assert document.get() == "Jello, world!\n"
+    assert document.get(7, 12) == "world"
+    assert len(document) == 14
+
+
+def test_lines_and_positions():
+    document = PieceTable("one\ntwo\n")
+    document.insert(4, "1.5\n")
+    assert document.line_count == 4
+    assert document.lines(2, 3) == "1.5\ntwo"
+    assert document.line_start(3) == 8
+    assert document.line_end(3) == 11
+    assert document.position(9) == (3, 1)
+    assert document.offset(2, 99) == 7
+    assert document.position(len(document)) == (4, 0)
+
+
+def test_snapshot_is_unaffected_by_later_edits():
+    document = PieceTable("abc")
+    snapshot = document.snapshot()
+    document.insert(1, "x")
+    document.delete(2, 4)
+    assert snapshot.get() == "abc"
+    assert document.get() == "ax"
+
+
+def test_random_edits_match_a_string():
+    rng = random.Random(7)
+    document = PieceTable()
+    text = ""
+    for _ in range(500):
+        if text and rng.random() < 0.4:
+            start = rng.randrange(len(text))
+            end = rng.randrange(start, min(len(text), start + 10) + 1)
+            document.delete(start, end)
+            text = text[:start] + text[end:]
+        else:
+            offset = rng.randrange(len(text) + 1)
+            insert = "".join(rng.choice("ab\n") for _ in range(rng.randrange(1, 6)))
+            document.insert(offset, insert)
+            text = text[:offset] + insert + text[offset:]
+    assert document.get() == text
+    assert document.line_count == text.count("\n") + 1
+    for offset in range(0, len(text) + 1, 7):
+        line, column = document.position(offset)
+        assert line == text.count("\n", 0, offset) + 1
+        assert column == offset - (text.rfind("\n", 0, offset) + 1)
+        assert document.line_start(line) + column == offset
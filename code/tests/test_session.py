@@ -0,0 +1,83 @@
+import json
+
+from zenedit import session
+from zenedit.piece_table import PieceTable
+from zenedit.undo import UndoHistory
+
+
+def test_checkpoint_and_journal_round_trip(tmp_path):
+    journal = session.SessionJournal(str(tmp_path))
+    try:
+        journal.checkpoint([({"id": 1, "path": None, "active": True}, PieceTable("hello\n")),
+                            ({"id": 2, "path": "notes.txt"}, PieceTable("notes"))])
+        journal.record(session.INSERT, 1, 5, payload=" world")
+        journal.record(session.INSERT, 1, 11, payload="!")
+        journal.record(session.DELETE, 2, 0, 2)
+        journal.record(session.STATE, 2, payload=json.dumps({"id": 2, "insert": "1.3", "active": True}))
+        journal.wait()
+        tabs, active = session.read_session(journal.directory)
+    finally:
+        journal.close()
+    by_id = {tab["meta"]["id"]: tab for tab in tabs}
+    assert active == 2
+    assert session.apply_ops(PieceTable(by_id[1]["text"]), by_id[1]["ops"]).get() == "hello world!\n"
+    assert session.apply_ops(PieceTable(by_id[2]["text"]), by_id[2]["ops"]).get() == "tes"
+    assert by_id[2]["meta"]["insert"] == "1.3"
+
+
+def test_new_checkpoint_supersedes_journal(tmp_path):
+    journal = session.SessionJournal(str(tmp_path))
+    try:
+        journal.record(session.RESET, 1, payload="old")
+        journal.record(session.INSERT, 1, 3, payload="er")
+        journal.checkpoint([({"id": 1, "path": None}, PieceTable("older"))])
+        journal.record(session.INSERT, 1, 5, payload="!")
+        journal.record(session.OPEN, 3, payload=json.dumps({"path": "a.txt", "size": 1, "mtime": 2}))
+        journal.record(session.INSERT, 3, 0, payload="x")
+        journal.record(session.CLOSE, 3)
+        journal.wait()
+        tabs, active = session.read_session(journal.directory)
+    finally:
+        journal.close()
+    assert len(tabs) == 1
+    assert tabs[0]["text"] == "older"
+    assert session.apply_ops(PieceTable(tabs[0]["text"]), tabs[0]["ops"]).get() == "older!"
+
+
+def test_disk_backed_tab_keeps_stat_and_ops(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("abc")
+    stat = session.file_stat(str(path))
+    journal = session.SessionJournal(str(tmp_path / "sessions"))
+    try:
+        journal.checkpoint([({"id": 1, "path": str(path), "disk": dict(stat, path=str(path))}, None)])
+        journal.record(session.INSERT, 1, 3, payload="d")
+        journal.wait()
+        tabs, active = session.read_session(journal.directory)
+    finally:
+        journal.close()
+    assert tabs[0]["text"] is None
+    assert tabs[0]["disk"] == dict(stat, path=str(path))
+    assert tabs[0]["ops"] == [(session.INSERT, 3, "d")]
+
+
+def test_apply_ops_clamps_to_document_length():
+    document = session.apply_ops(PieceTable("ab"), [(session.INSERT, 10, "c"), (session.DELETE, 1, 50)])
+    assert document.get() == "a"
+
+
+def test_apply_ops_records_undo_history():
+    history = UndoHistory()
+    ops = [(session.INSERT, 5, " world"), (session.DELETE, 0, 1), (session.INSERT, 0, "J")]
+    document = session.apply_ops(PieceTable("hello"), ops, history)
+    assert document.get() == "Jello world"
+    while True:
+        group = history.undo()
+        if group is None:
+            break
+        for op, offset, text in reversed(group):
+            if op == "insert":
+                document.delete(offset, offset + len(text))
+            else:
+                document.insert(offset, text)
+    assert document.get() == "hello"
@@ -0,0 +1,87 @@
+import random
+import re
+
+from zenedit import textops
+
+
+def test_compile_pattern_options():
+    assert textops.compile_pattern("a.c").search("abc") is None
+    assert textops.compile_pattern("a.c", regex=True).search("abc")
+    assert textops.compile_pattern("ABC").search("xabcx")
+    assert textops.compile_pattern("ABC", case_sensitive=True).search("xabcx") is None
+    assert textops.compile_pattern("cat", whole_word=True).findall("cat catalog cat") == ["cat", "cat"]
+
+
+def test_replace_line_is_literal_unless_expanded():
+    pattern = textops.compile_pattern("(o)", regex=True)
+    assert textops.replace_line("foo", pattern, r"\1x") == (r"f\1x\1x", 2)
+    assert textops.replace_line("foo", pattern, r"\1x", expand=True) == ("foxox", 2)
+
+
+def test_find_replace_segments_merge_matches_on_one_line():
+    segments, count = textops.find_replace_segments("aXbXc\nX", re.compile("X"), "-")
+    assert count == 3
+    assert segments == [[1, 1, 1, 4, 4, ["-", "b", "-"]], [2, 0, 2, 1, 7, ["-"]]]
+
+
+def test_number_lines_and_split_lines():
+    assert list(textops.number_lines(["a\n", "b"], 3)) == ["3. a\n", "4. b"]
+    assert textops.split_lines("a\nb\n") == ["a\n", "b\n"]
+    assert textops.split_lines("a\nb") == ["a\n", "b"]
+    assert textops.split_lines("") == []
+    assert textops.count_words("one two\nthree") == (3, 13)
+
+
+def apply_edits(old, edits):
+    for start, end, text in reversed(edits):
+        old = old[:start] + text + old[end:]
+    return old
+
+
+def test_line_diff_edits_only_changed_lines():
+    old = "a\nb\nc\nd\n"
+    new = "a\nB\nc\nd\ne\n"
+    edits = textops.line_diff(old, new)
+    assert edits == [(2, 4, "B\n"), (8, 8, "e\n")]
+    assert apply_edits(old, edits) == new
+
+
+def test_line_diff_identical_text():
+    assert textops.line_diff("same\ntext", "same\ntext") == []
+
+
+def test_line_diff_random_round_trip():
+    rng = random.Random(3)
+    for _ in range(500):
+        old = "".join(rng.choice(["a\n", "b\n", "c", "\n", "dd\n"]) for _ in range(rng.randrange(12)))
+        new = "".join(rng.choice(["a\n", "b\n", "c", "\n", "dd\n"]) for _ in range(rng.randrange(12)))
+        edits = textops.line_diff(old, new)
+        assert apply_edits(old, edits) == new
+        assert all(start <= end for start, end, text in edits)
+        assert all(edits[i][1] <= edits[i + 1][0] for i in range(len(edits) - 1))
+
+
+def test_line_diff_replaces_a_huge_middle_as_one_hunk():
+    count = textops.DIFF_LINE_LIMIT + 1
+    old = "head\n" + "old\n" * count + "tail\n"
+    new = "head\n" + "new\n" * count + "tail\n"
+    edits = textops.line_diff(old, new)
+    assert edits == [(5, 5 + 4 * count, "new\n" * count)]
+
+
+def test_match_columns_in_tk_units():
+    text = "\U0001F600ab\nx\U0001F600ab"
+    spans = [(line, column, end_line, end_column)
+             for match, line, column, end_line, end_column in textops.iter_match_indices(text, re.compile("ab"), 1, True)]
+    assert spans == [(1, 2, 1, 4), (2, 3, 2, 5)]
+    assert textops.char_column("x\U0001F600ab", 3) == 2
+    assert textops.tk_column("x\U0001F600ab", 2) == 3
+
+
+def test_may_span_lines():
+    assert not textops.may_span_lines(textops.compile_pattern("a.c", regex=True))
+    assert not textops.may_span_lines(textops.compile_pattern(r"\bfoo[a-z]+\d", regex=True))
+    assert not textops.may_span_lines(textops.compile_pattern("[^x] plain", whole_word=True))
+    for query in (r"a\nb", r"\s+", "[^x]", "(?s)a.b", r"\W", r"\x0a"):
+        assert textops.may_span_lines(textops.compile_pattern(query, regex=True)), query
+    assert textops.may_span_lines(textops.compile_pattern("a\nb"))
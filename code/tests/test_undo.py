@@ -0,0 +1,59 @@
+from zenedit.undo import DELTA_OVERHEAD, UndoHistory, group_cost
+
+
+def live_cost(history):
+    return sum(group_cost(group) for group in history.undo_stack) + sum(group_cost(group) for group in history.redo_stack)
+
+
+def test_keystrokes_merge_into_one_delta():
+    history = UndoHistory()
+    for offset, char in enumerate("hello"):
+        history.record("insert", offset, char, now=offset * 0.1)
+    assert list(history.undo_stack) == [[["insert", 0, "hello"]]]
+    assert history.memory == len("hello") + DELTA_OVERHEAD
+
+
+def test_pause_or_whitespace_starts_a_new_delta():
+    history = UndoHistory(merge_interval=1.0)
+    history.record("insert", 0, "a", now=0.0)
+    history.record("insert", 1, "b", now=5.0)
+    history.record("insert", 2, " ", now=5.1)
+    assert len(history.undo_stack) == 3
+    assert history.memory == live_cost(history)
+
+
+def test_backspaces_merge():
+    history = UndoHistory()
+    history.record("delete", 4, "o", now=0.0)
+    history.record("delete", 3, "l", now=0.1)
+    assert list(history.undo_stack) == [[["delete", 3, "lo"]]]
+
+
+def test_undo_and_redo_move_groups():
+    history = UndoHistory()
+    history.begin_group()
+    history.record("insert", 0, "ab")
+    history.record("delete", 0, "a")
+    history.end_group()
+    group = history.undo()
+    assert group == [["insert", 0, "ab"], ["delete", 0, "a"]]
+    assert history.redo() == group
+    history.undo()
+    history.record("insert", 0, "x", now=100.0)
+    assert not history.redo_stack
+    assert history.memory == live_cost(history)
+
+
+def test_memory_tracks_live_cost_and_spills_oldest_groups():
+    history = UndoHistory(memory_limit=2000)
+    for number in range(200):
+        for offset in range(20):
+            history.record("insert", number * 20 + offset, "x", now=number * 10 + offset * 0.01)
+        history.separator()
+    assert history.memory == live_cost(history)
+    assert history.memory <= 2000
+    assert history.undo_spilled
+    for number in reversed(range(200)):
+        assert history.undo() == [["insert", number * 20, "x" * 20]]
+    assert history.undo() is None
+    assert history.memory == live_cost(history)
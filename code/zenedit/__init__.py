@@ -0,0 +1 @@
+"""Display-independent building blocks shared by the ZenEdit editor."""
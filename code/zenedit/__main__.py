@@ -0,0 +1,5 @@
+import sys
+
+from zenedit.cli import main
+
+sys.exit(main())
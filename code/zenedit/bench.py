@@ -0,0 +1,364 @@
+"""Benchmark suite: python -m zenedit.bench [--sizes 1K,1M,...] [--baseline FILE]
+
+Generates documents of each size, drives the real editor through its hot
+paths inside a virtual X server (Xvfb) and writes the timings as JSON.
+Every result has a ``seconds`` figure; latency benchmarks report their
+95th percentile there.  With ``--baseline`` the run is compared against a
+previous results file and exits with status 1 when any benchmark got
+slower by more than ``--threshold``.  ``--update-baseline`` stores the
+new results as the baseline once a run has been accepted.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+         "et dolore magna aliqua zen editor needle haystack").split()
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+DEFAULT_SIZES = "1K,100K,1M,10M,100M,500M"
+EDITOR_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ZenEdit_v1.0.py")
+
+
+def parse_size(text):
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+    return int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+
+
+def generate_document(path, size, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    block_size = 0
+    while block_size < min(size, 1024 * 1024):
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 16))) + "\n"
+        lines.append(line)
+        block_size += len(line)
+    block = "".join(lines).encode("utf-8")
+    with open(path, "wb") as file:
+        written = 0
+        while written < size:
+            chunk = block[:size - written]
+            file.write(chunk)
+            written += len(chunk)
+    return path
+
+
+def start_xvfb():
+    if not shutil.which("Xvfb"):
+        if os.environ.get("DISPLAY"):
+            return None
+        raise RuntimeError("Xvfb is not installed and no DISPLAY is set")
+    number = 99
+    while os.path.exists(f"/tmp/.X{number}-lock"):
+        number += 1
+    server = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        if server.poll() is not None or time.monotonic() > deadline:
+            server.kill()
+            raise RuntimeError("Xvfb did not start")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{number}"
+    return server
+
+
+def load_editor(path):
+    spec = importlib.util.spec_from_file_location("zenedit_app", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def latency_result(samples):
+    return {"seconds": percentile(samples, 0.95), "median": percentile(samples, 0.5),
+            "max": max(samples), "samples": len(samples)}
+
+
+class DialogRecorder:
+    def __init__(self):
+        self.calls = []
+
+    def record(self, kind, args, result=None):
+        self.calls.append((kind,) + args[:2])
+        return result
+
+    def showinfo(self, *args, **kwargs):
+        return self.record("showinfo", args, "ok")
+
+    def showwarning(self, *args, **kwargs):
+        return self.record("showwarning", args, "ok")
+
+    def showerror(self, *args, **kwargs):
+        return self.record("showerror", args, "ok")
+
+    def askyesno(self, *args, **kwargs):
+        return self.record("askyesno", args, False)
+
+    def askyesnocancel(self, *args, **kwargs):
+        return self.record("askyesnocancel", args, False)
+
+    def askokcancel(self, *args, **kwargs):
+        return self.record("askokcancel", args, False)
+
+
+class EditorBench:
+    def __init__(self, module, path, options):
+        self.module = module
+        self.path = path
+        self.options = options
+        self.dialogs = DialogRecorder()
+        module.messagebox = self.dialogs
+        self.root = tk.Tk()
+        self.editor = module.ZenEdit(self.root)
+        self.pump()
+
+    def pump(self, condition=None, timeout=None):
+        deadline = time.perf_counter() + (timeout or self.options.timeout)
+        while True:
+            self.root.update()
+            if condition is None or condition():
+                return
+            if time.perf_counter() > deadline:
+                raise TimeoutError("timed out waiting for the editor")
+            time.sleep(0.0005)
+
+    def timed(self, action, condition=None):
+        started = time.perf_counter()
+        action()
+        self.pump(condition)
+        return {"seconds": time.perf_counter() - started}
+
+    def editable(self):
+        return self.editor.viewer_mmap is None
+
+    def find_widget(self, parent, widget_class, text=None):
+        for child in parent.winfo_children():
+            if isinstance(child, widget_class) and (text is None or child.cget("text") == text):
+                return child
+        return None
+
+    def newest_window(self):
+        return [child for child in self.root.winfo_children() if isinstance(child, tk.Toplevel)][-1]
+
+    def bench_open_file(self):
+        editor = self.editor
+
+        def loaded():
+            return not editor.loading and (editor.viewer_mmap is None or editor.viewer_indexed.is_set())
+        return self.timed(lambda: editor.open_files([self.path]), loaded)
+
+    def bench_typing(self):
+        if not self.editable():
+            return None
+        text_area = self.editor.text_area
+        text_area.mark_set("insert", "1.0")
+        self.pump()
+        samples = []
+        for index in range(self.options.keystrokes):
+            started = time.perf_counter()
+            text_area.insert("insert", "x" if index % 8 else " ")
+            self.root.update_idletasks()
+            samples.append(time.perf_counter() - started)
+        self.pump()
+        return latency_result(samples)
+
+    def bench_scroll(self):
+        text_area = self.editor.text_area
+        text_area.yview_moveto(0)
+        self.pump()
+        samples = []
+        for index in range(self.options.scrolls):
+            started = time.perf_counter()
+            text_area.yview_scroll(1 if index < self.options.scrolls // 2 else -1, "pages")
+            self.root.update()
+            samples.append(time.perf_counter() - started)
+        return latency_result(samples)
+
+    def bench_toggle_line_numbers(self):
+        result = self.timed(self.editor.toggle_line_numbers)
+        self.editor.toggle_line_numbers()
+        self.pump()
+        return result
+
+    def bench_show_word_char_count(self):
+        calls = len(self.dialogs.calls)
+        return self.timed(self.editor.show_word_char_count, lambda: len(self.dialogs.calls) > calls)
+
+    def bench_search_text(self):
+        if not self.editable():
+            return None
+        self.editor.search_text()
+        window = self.newest_window()
+        self.find_widget(window, tk.Entry).insert(0, "needle")
+        result = self.timed(self.find_widget(window, tk.Button, "Find").invoke)
+        self.find_widget(window, tk.Button, "Close").invoke()
+        self.pump()
+        return result
+
+    def bench_replace_text(self):
+        if not self.editable():
+            return None
+        self.editor.replace_text()
+        window = self.newest_window()
+        find_entry, replace_entry = [child for child in window.winfo_children() if isinstance(child, tk.Entry)]
+        find_entry.insert(0, "haystack")
+        replace_entry.insert(0, "hayrick")
+        return self.timed(self.find_widget(window, tk.Button, "Replace All").invoke)
+
+    def bench_save_file(self):
+        if not self.editable():
+            return None
+        self.editor.text_area.insert("1.0", "x")
+        return self.timed(self.editor.save_file, lambda: not self.editor.saves_pending)
+
+    def bench_auto_save(self):
+        if not self.editable():
+            return None
+        editor = self.editor
+        editor.text_area.insert("1.0", "x")
+        editor.last_edit_time = 0.0
+        self.root.after_cancel(editor.auto_save_id)
+        return self.timed(editor.auto_save, lambda: not editor.saves_pending)
+
+    def close(self):
+        self.editor.quit()
+        try:
+            self.root.destroy()
+        except tk.TclError:
+            pass
+
+
+BENCHMARKS = ("open_file", "typing", "scroll", "toggle_line_numbers", "show_word_char_count",
+              "search_text", "replace_text", "save_file", "auto_save")
+
+
+def run_size(module, label, size, options):
+    path = os.path.join(options.workdir, f"bench-{label}.txt")
+    generate_document(path, size)
+    results = {}
+    bench = EditorBench(module, path, options)
+    try:
+        for name in BENCHMARKS:
+            try:
+                result = getattr(bench, "bench_" + name)()
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            if result is not None:
+                results[name] = result
+                print(f"{label:>6} {name:<22} {describe(result)}", file=sys.stderr)
+    finally:
+        bench.close()
+        os.remove(path)
+    return results
+
+
+def describe(result):
+    if "error" in result:
+        return result["error"]
+    return f"{result['seconds'] * 1000:10.2f} ms"
+
+
+def compare(results, baseline, threshold, min_delta):
+    regressions = []
+    for label, benchmarks in results["results"].items():
+        for name, result in benchmarks.items():
+            base = baseline.get("results", {}).get(label, {}).get(name)
+            if not base or "seconds" not in base or "seconds" not in result:
+                continue
+            delta = result["seconds"] - base["seconds"]
+            ratio = result["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            if ratio > 1 + threshold and delta > min_delta:
+                regressions.append((label, name, base["seconds"], result["seconds"], ratio))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m zenedit.bench", description="Benchmark ZenEdit's hot paths.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated document sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--output", default="bench-results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to --baseline as well")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown as a fraction (default: 0.2)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns below this many seconds")
+    parser.add_argument("--keystrokes", type=int, default=200, help="keystrokes timed for typing latency")
+    parser.add_argument("--scrolls", type=int, default=40, help="page scrolls timed for scroll latency")
+    parser.add_argument("--timeout", type=float, default=900, help="seconds to wait for any single operation")
+    parser.add_argument("--editor", default=EDITOR_PATH, help="path of the editor script to benchmark")
+    parser.add_argument("--workdir", help="directory for generated documents (default: a temporary one)")
+    parser.add_argument("--no-xvfb", action="store_true", help="use the current DISPLAY instead of starting Xvfb")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    if options.update_baseline and not options.baseline:
+        parser.error("--update-baseline needs --baseline")
+    try:
+        sizes = [(label.strip(), parse_size(label)) for label in options.sizes.split(",") if label.strip()]
+    except ValueError as e:
+        parser.error(f"invalid size: {e}")
+    output = os.path.abspath(options.output)
+    baseline_path = os.path.abspath(options.baseline) if options.baseline else None
+    temporary = options.workdir is None
+    options.workdir = os.path.abspath(options.workdir or tempfile.mkdtemp(prefix="zenedit-bench-"))
+    os.makedirs(options.workdir, exist_ok=True)
+    server = None if options.no_xvfb else start_xvfb()
+    cwd = os.getcwd()
+    home = os.environ.get("HOME")
+    try:
+        module = load_editor(os.path.abspath(options.editor))
+        os.chdir(options.workdir)
+        os.environ["HOME"] = options.workdir
+        results = {"version": 1, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                   "tk": tk.TkVersion, "platform": platform.platform(), "results": {}}
+        for label, size in sizes:
+            results["results"][label] = run_size(module, label, size, options)
+    finally:
+        os.chdir(cwd)
+        if home is not None:
+            os.environ["HOME"] = home
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if temporary:
+            shutil.rmtree(options.workdir, ignore_errors=True)
+
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Wrote {output}", file=sys.stderr)
+    status = 0
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, options.threshold, options.min_delta)
+        for label, name, before, after, ratio in regressions:
+            print(f"REGRESSION {label} {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)", file=sys.stderr)
+        if regressions and not options.update_baseline:
+            status = 1
+        elif not regressions:
+            print(f"No regressions against {baseline_path}", file=sys.stderr)
+    if options.update_baseline:
+        with open(baseline_path, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Updated baseline {baseline_path}", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Headless batch processing: python -m zenedit {replace,number,count} FILE..."""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from zenedit import textops
+
+
+def output_path(path, output_dir):
+    return os.path.join(output_dir, os.path.basename(path))
+
+
+def plural(count, noun):
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+def open_output(path, options):
+    if options["output_dir"]:
+        return open(output_path(path, options["output_dir"]), "w",
+                    encoding=options["encoding"], errors="surrogateescape", newline=""), None
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".zenedit-", suffix=".tmp")
+    return os.fdopen(fd, "w", encoding=options["encoding"], errors="surrogateescape", newline=""), temp_path
+
+
+def process_file(task):
+    command, path, options = task
+    try:
+        size = os.path.getsize(path)
+        if command == "count":
+            words = characters = lines = 0
+            with open(path, "r", encoding=options["encoding"], errors="surrogateescape") as file:
+                for line in file:
+                    line_words, line_characters = textops.count_words(line)
+                    words += line_words
+                    characters += line_characters
+                    lines += 1
+            return path, size, (words, characters, lines), None
+        count = 0
+        with open(path, "r", encoding=options["encoding"], errors="surrogateescape", newline="") as file:
+            output, temp_path = open_output(path, options)
+            try:
+                with output:
+                    if command == "number":
+                        for line in textops.number_lines(file):
+                            output.write(line)
+                            count += 1
+                    else:
+                        for line in file:
+                            line, replaced = textops.replace_line(line, options["pattern"], options["replacement"], options["regex"])
+                            output.write(line)
+                            count += replaced
+                if temp_path:
+                    os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+                    os.replace(temp_path, path)
+            except BaseException:
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        return path, size, count, None
+    except (OSError, re.error, IndexError) as e:
+        return path, 0, None, str(e)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m zenedit", description="Run ZenEdit text operations on many files.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--encoding", default="utf-8", help="text encoding of the input files (default: utf-8)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replace = commands.add_parser("replace", help="replace every occurrence of a pattern")
+    replace.add_argument("find")
+    replace.add_argument("replacement")
+    replace.add_argument("--regex", action="store_true", help="treat FIND as a regular expression")
+    replace.add_argument("--case-sensitive", action="store_true")
+    replace.add_argument("--whole-word", action="store_true")
+
+    number = commands.add_parser("number", help='prefix every line with "N. "')
+    count = commands.add_parser("count", help="print word, character and line counts")
+
+    for command in (replace, number):
+        target = command.add_mutually_exclusive_group(required=True)
+        target.add_argument("--in-place", action="store_true", help="rewrite the files in place")
+        target.add_argument("--output-dir", help="write results to this directory")
+    for command in (replace, number, count):
+        command.add_argument("files", nargs="+")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    options = {"encoding": args.encoding, "output_dir": getattr(args, "output_dir", None)}
+    if args.command == "replace":
+        try:
+            options["pattern"] = textops.compile_pattern(args.find, args.case_sensitive, args.regex, args.whole_word)
+        except re.error as e:
+            parser.error(f"invalid pattern: {e}")
+        options["replacement"] = args.replacement
+        options["regex"] = args.regex
+    if options["output_dir"]:
+        targets = {}
+        for path in args.files:
+            target = os.path.normcase(os.path.abspath(output_path(path, options["output_dir"])))
+            if os.path.normcase(os.path.realpath(path)) == os.path.normcase(os.path.realpath(target)):
+                parser.error(f"{path} would be overwritten by its own output; use --in-place or another --output-dir")
+            if target in targets:
+                parser.error(f"{targets[target]} and {path} would both be written to {output_path(path, options['output_dir'])}")
+            targets[target] = path
+        os.makedirs(options["output_dir"], exist_ok=True)
+
+    started = time.perf_counter()
+    total_bytes = 0
+    failures = 0
+    tasks = [(args.command, path, options) for path in args.files]
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        for path, size, result, error in executor.map(process_file, tasks, chunksize=max(1, len(tasks) // (args.jobs * 4 or 1))):
+            if error:
+                failures += 1
+                print(f"{path}: {error}", file=sys.stderr)
+                continue
+            total_bytes += size
+            if args.command == "count":
+                words, characters, lines = result
+                print(f"{lines}\t{words}\t{characters}\t{path}")
+            elif args.command == "replace":
+                print(f"{path}: {plural(result, 'replacement')}")
+    elapsed = time.perf_counter() - started
+    megabytes = total_bytes / (1024 * 1024)
+    print(f"Processed {plural(len(tasks) - failures, 'file')}, {megabytes:.1f} MB in {elapsed:.2f} s "
+          f"({megabytes / elapsed if elapsed else 0:.1f} MB/s)", file=sys.stderr)
+    return 1 if failures else 0
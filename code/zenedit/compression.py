@@ -0,0 +1,59 @@
+"""Transparent gzip, bzip2 and xz file access.
+
+Formats are recognised by their magic bytes rather than the file name,
+so a rotated ``app.log.1`` that happens to be gzipped opens like
+``app.log.gz``.  Readers and writers wrap an already-open binary file,
+so callers keep their own chunked, threaded I/O and can still report
+progress from the underlying file's position.
+"""
+import bz2
+import gzip
+import lzma
+import os
+
+FORMATS = {
+    "gzip": (b"\x1f\x8b", (".gz", ".gzip")),
+    "bz2": (b"BZh", (".bz2",)),
+    "xz": (b"\xfd7zXZ\x00", (".xz",)),
+}
+MAGIC_LENGTH = 6
+BZ2_BLOCK_SIZES = frozenset(b"123456789")
+
+
+def detect(header):
+    for name, (magic, extensions) in FORMATS.items():
+        if name == "bz2" and (len(header) < 4 or header[3] not in BZ2_BLOCK_SIZES):
+            continue
+        if header.startswith(magic):
+            return name
+    return None
+
+
+def detect_file(path):
+    with open(path, "rb") as file:
+        return detect(file.read(MAGIC_LENGTH))
+
+
+def format_for_path(path):
+    extension = os.path.splitext(path)[1].lower()
+    for name, (magic, extensions) in FORMATS.items():
+        if extension in extensions:
+            return name
+    return None
+
+
+def reader(name, file):
+    if name == "gzip":
+        return gzip.GzipFile(fileobj=file, mode="rb")
+    if name == "bz2":
+        return bz2.BZ2File(file, "rb")
+    return lzma.LZMAFile(file, "rb")
+
+
+def writer(name, file, level):
+    level = max(1, min(9, level))
+    if name == "gzip":
+        return gzip.GzipFile(fileobj=file, mode="wb", compresslevel=level)
+    if name == "bz2":
+        return bz2.BZ2File(file, "wb", compresslevel=level)
+    return lzma.LZMAFile(file, "wb", preset=level)
@@ -0,0 +1,314 @@
+"""Find in Files: a parallel directory search backed by a trigram index.
+
+The index keeps one trigram signature per file: a bit set holding a hashed
+bit for every distinct three-character sequence in the lowercased text,
+sized at two bits per trigram.  A literal query can only occur in a file
+whose signature contains all of the query's trigram bits, so searches only
+read the candidate files.  Entries record the file's mtime and size and
+are rebuilt when those change.  The index also caches each directory's
+listing under the directory's mtime, so a repeated search only stats the
+files of unchanged directories instead of listing them again.  The index
+is stored on disk as compressed JSON and kept in memory between searches.
+"""
+import concurrent.futures
+import functools
+import json
+import os
+import stat
+import tempfile
+import time
+import zlib
+
+from zenedit import textops
+
+SKIP_DIRECTORIES = frozenset((".git", ".hg", ".svn", "__pycache__", "node_modules", ".tox", ".venv", ".mypy_cache"))
+BINARY_SNIFF = 8192
+ALWAYS = -1
+INDEX_VERSION = 2
+RACY_MTIME_NS = 2 * 10**9
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def trigram_bit(trigram, bits):
+    return zlib.crc32(trigram.encode("utf-8", "surrogatepass")) & (bits - 1)
+
+
+def signature(text, max_bits=1 << 20):
+    grams = trigrams(text.lower())
+    bits = 256
+    while bits < 2 * len(grams) and bits < max_bits:
+        bits <<= 1
+    mask = bytearray(bits // 8)
+    for gram in grams:
+        bit = trigram_bit(gram, bits)
+        mask[bit >> 3] |= 1 << (bit & 7)
+    return bits, int.from_bytes(mask, "little")
+
+
+def query_trigrams(options):
+    if options["regex"] or len(options["query"]) < 3:
+        return None
+    return trigrams(options["query"].lower())
+
+
+def list_directory(directory):
+    subdirectories = []
+    files = []
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRECTORIES:
+                    subdirectories.append(entry.name)
+            elif entry.is_file():
+                files.append(entry.name)
+        except OSError:
+            continue
+    return subdirectories, files
+
+
+def iter_files(root, max_size, directories=None, skip=()):
+    """Yield ``(path, mtime, size)`` for every file under ``root`` of at most ``max_size`` bytes.
+
+    ``directories`` maps a directory to the ``(mtime, subdirectories, files)``
+    it had when last listed; it is updated in place, and pruned of directories
+    under ``root`` that no longer exist once the walk completes.  Files in
+    ``skip`` are neither stat'ed nor yielded.
+    """
+    if directories is None:
+        directories = {}
+    stack = [root]
+    visited = set()
+    while stack:
+        directory = stack.pop()
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+        visited.add(directory)
+        cached = directories.get(directory)
+        if cached is None or cached[0] != mtime:
+            try:
+                subdirectories, files = list_directory(directory)
+            except OSError:
+                continue
+            # A listing taken within the mtime granularity could miss a later change that keeps the same mtime.
+            if time.time_ns() - mtime > RACY_MTIME_NS:
+                directories[directory] = (mtime, subdirectories, files)
+            else:
+                directories.pop(directory, None)
+        else:
+            mtime, subdirectories, files = cached
+        stack.extend(os.path.join(directory, name) for name in subdirectories)
+        for name in files:
+            path = os.path.join(directory, name)
+            if path in skip:
+                continue
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            if stat.S_ISREG(info.st_mode) and info.st_size <= max_size:
+                yield path, info.st_mtime_ns, info.st_size
+    prefix = os.path.join(root, "")
+    for directory in [directory for directory in directories if directory.startswith(prefix) and directory not in visited]:
+        del directories[directory]
+
+
+@functools.lru_cache(maxsize=8)
+def cached_pattern(query, case_sensitive, regex, whole_word):
+    return textops.compile_pattern(query, case_sensitive, regex, whole_word)
+
+
+def search_batch(batch, options):
+    pattern = cached_pattern(options["query"], options["case_sensitive"], options["regex"], options["whole_word"])
+    results = []
+    for path, mtime, size, index in batch:
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            continue
+        if b"\0" in data[:BINARY_SNIFF]:
+            results.append((path, mtime, size, [], (0, 0) if index else None))
+            continue
+        text = data.decode("utf-8", "replace")
+        matches = []
+        for line_number, line in enumerate(text.split("\n"), 1):
+            for match in pattern.finditer(line):
+                matches.append((line_number, match.start(), match.end() - match.start(), line.strip()[:200]))
+                if len(matches) >= options["max_matches"]:
+                    break
+            if len(matches) >= options["max_matches"]:
+                break
+        entry = None
+        if index:
+            entry = signature(text) if size <= options["max_index_size"] else (ALWAYS, 0)
+        results.append((path, mtime, size, matches, entry))
+    return results
+
+
+class TrigramIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.directories = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        try:
+            with open(path, "rb") as file:
+                data = json.loads(zlib.decompress(file.read()))
+            if data["version"] == INDEX_VERSION:
+                entries = {path: (int(mtime), int(size), int(bits), int(mask, 16))
+                           for path, (mtime, size, bits, mask) in data["entries"].items()}
+                directories = {directory: (int(mtime), list(subdirectories), list(files))
+                               for directory, (mtime, subdirectories, files) in data["directories"].items()}
+                index.entries, index.directories = entries, directories
+        except (OSError, ValueError, TypeError, KeyError, AttributeError, zlib.error):
+            pass
+        return index
+
+    def save(self):
+        if not self.dirty or not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".index-", suffix=".tmp")
+        try:
+            data = {
+                "version": INDEX_VERSION,
+                "entries": {path: (mtime, size, bits, format(mask, "x")) for path, (mtime, size, bits, mask) in self.entries.items()},
+                "directories": self.directories,
+            }
+            with os.fdopen(fd, "wb") as file:
+                file.write(zlib.compress(json.dumps(data, separators=(",", ":")).encode("ascii"), 1))
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.dirty = False
+
+    def fresh(self, path, mtime, size):
+        entry = self.entries.get(path)
+        return entry is not None and entry[0] == mtime and entry[1] == size
+
+    def update(self, path, mtime, size, bits, mask):
+        self.entries[path] = (mtime, size, bits, mask)
+        self.dirty = True
+
+    def remove(self, paths):
+        for path in paths:
+            if self.entries.pop(path, None) is not None:
+                self.dirty = True
+
+    def candidates(self, grams, prefix=""):
+        masks = {}
+        for path, (mtime, size, bits, mask) in self.entries.items():
+            if not path.startswith(prefix):
+                continue
+            if bits == ALWAYS:
+                yield path, mtime, size
+                continue
+            if bits == 0:
+                continue
+            wanted = masks.get(bits)
+            if wanted is None:
+                wanted = 0
+                for gram in grams:
+                    wanted |= 1 << trigram_bit(gram, bits)
+                masks[bits] = wanted
+            if mask & wanted == wanted:
+                yield path, mtime, size
+
+
+def index_path(directory, root):
+    key = zlib.crc32(os.path.abspath(root).encode("utf-8", "surrogateescape"))
+    return os.path.join(directory, f"{os.path.basename(os.path.abspath(root)) or 'root'}-{key:08x}.index")
+
+
+def find_in_files(root, options, executor, index, emit, cancel, workers, batch_size=32):
+    """Search every file under ``root``, calling ``emit(kind, value)`` as results arrive.
+
+    Files the index rules out are never read.  Fresh candidates are searched
+    first, so repeated searches report hits before the directory walk that
+    picks up new and modified files has finished; the walk itself reuses the
+    index's cached listing of every directory whose mtime is unchanged.
+    """
+    grams = query_trigrams(options) if index is not None else None
+    prefix = os.path.join(os.path.abspath(root), "")
+    pending = set()
+    batch = []
+    searched = set()
+    seen = set()
+    counts = {"scanned": 0, "files": 0, "matches": 0}
+
+    def collect(timeout):
+        done, not_done = concurrent.futures.wait(pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+        pending.difference_update(done)
+        hits = []
+        for future in done:
+            for path, mtime, size, matches, entry in future.result():
+                if entry is not None:
+                    index.update(path, mtime, size, *entry)
+                if matches:
+                    counts["files"] += 1
+                    counts["matches"] += len(matches)
+                    hits.extend((path,) + match for match in matches)
+        if hits:
+            emit("hits", hits)
+        if done:
+            emit("progress", dict(counts))
+
+    def submit(item):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            pending.add(executor.submit(search_batch, batch[:], options))
+            batch.clear()
+        while len(pending) >= workers * 4 and not cancel.is_set():
+            collect(None)
+        if pending:
+            collect(0)
+
+    if grams is not None:
+        for path, mtime, size in list(index.candidates(grams, prefix)):
+            if cancel.is_set():
+                break
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            if info.st_mtime_ns == mtime and info.st_size == size:
+                searched.add(path)
+                submit((path, mtime, size, False))
+    counts["scanned"] = len(searched)
+    seen.update(searched)
+    directories = dict(index.directories) if index is not None else None
+    for path, mtime, size in iter_files(root, options["max_size"], directories, searched):
+        if cancel.is_set():
+            break
+        counts["scanned"] += 1
+        seen.add(path)
+        if index is not None and index.fresh(path, mtime, size):
+            if grams is None:
+                submit((path, mtime, size, False))
+            continue
+        submit((path, mtime, size, index is not None))
+    if batch and not cancel.is_set():
+        pending.add(executor.submit(search_batch, batch[:], options))
+    while pending and not cancel.is_set():
+        collect(None)
+    for future in pending:
+        future.cancel()
+    if index is not None and not cancel.is_set():
+        if directories != index.directories:
+            index.directories = directories
+            index.dirty = True
+        index.remove([path for path in index.entries if path.startswith(prefix) and path not in seen])
+        index.save()
+    return counts
@@ -0,0 +1,67 @@
+"""Font service shared by the editor and its dialogs.
+
+Tk builds a fresh font list and a new named font for every ``font.Font``
+call, which is slow on systems with many installed fonts and leaks named
+fonts.  The service loads the family list once, on first use, and keeps
+one editor font and one preview font that are reconfigured in place.
+Text widgets pick up changes to a named font automatically, so nothing
+has to be reattached.  Measurements are memoized until the font changes.
+"""
+from tkinter import font
+
+MEASURE_CACHE_LIMIT = 4096
+
+
+class FontService:
+    def __init__(self, root, family, size, bold=False, italic=False):
+        self.root = root
+        self.family_list = None
+        self.folded_families = None
+        self.font_options = self.options(family, size, bold, italic)
+        self.font = font.Font(root=root, **self.font_options)
+        self.preview = None
+        self.measurements = {}
+        self.font_metrics = None
+
+    def options(self, family, size, bold, italic):
+        return {"family": family, "size": size, "weight": "bold" if bold else "normal",
+                "slant": "italic" if italic else "roman"}
+
+    def configure(self, family, size, bold=False, italic=False):
+        options = self.options(family, size, bold, italic)
+        if options == self.font_options:
+            return
+        self.font_options = options
+        self.font.configure(**options)
+        self.measurements.clear()
+        self.font_metrics = None
+
+    def configure_preview(self, family, size, bold=False, italic=False):
+        options = self.options(family, size, bold, italic)
+        if self.preview is None:
+            self.preview = font.Font(root=self.root, **options)
+        else:
+            self.preview.configure(**options)
+        return self.preview
+
+    def families(self, query=""):
+        if self.family_list is None:
+            self.family_list = sorted(set(font.families(self.root)), key=str.casefold)
+            self.folded_families = [family.casefold() for family in self.family_list]
+        if not query:
+            return self.family_list
+        query = query.casefold()
+        return [family for family, folded in zip(self.family_list, self.folded_families) if query in folded]
+
+    def measure(self, text):
+        width = self.measurements.get(text)
+        if width is None:
+            if len(self.measurements) >= MEASURE_CACHE_LIMIT:
+                self.measurements.clear()
+            width = self.measurements[text] = self.font.measure(text)
+        return width
+
+    def metrics(self, option):
+        if self.font_metrics is None:
+            self.font_metrics = self.font.metrics()
+        return self.font_metrics[option]
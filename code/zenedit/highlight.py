@@ -0,0 +1,210 @@
+"""Line-oriented lexers for viewport syntax highlighting.
+
+A lexer turns one line plus the state left by the previous line into a
+list of ``(start, end, token)`` column ranges and the state for the next
+line.  States are short strings, so the editor can cache one per line,
+re-lex from an edited line until the new states match the cached ones,
+and hand a range of lines to a worker thread with just its start state.
+"""
+import keyword
+import os
+import re
+
+from zenedit import textops
+
+TOKEN_STYLES = {
+    "keyword": {"foreground": "#569cd6"},
+    "constant": {"foreground": "#4fc1ff"},
+    "definition": {"foreground": "#dcdcaa"},
+    "decorator": {"foreground": "#c586c0"},
+    "string": {"foreground": "#ce9178"},
+    "number": {"foreground": "#b5cea8"},
+    "comment": {"foreground": "#6a9955"},
+    "key": {"foreground": "#9cdcfe"},
+    "heading": {"foreground": "#569cd6"},
+    "quote": {"foreground": "#6a9955"},
+    "list": {"foreground": "#c586c0"},
+    "code": {"foreground": "#ce9178"},
+    "strong": {"foreground": "#dcdcaa"},
+    "emphasis": {"foreground": "#d7ba7d"},
+    "link": {"foreground": "#4fc1ff", "underline": True},
+}
+
+
+class Lexer:
+    initial_state = ""
+
+    def tokenize(self, line, state):
+        return [], state
+
+
+class PythonLexer(Lexer):
+    token_pattern = re.compile(r"""
+        (?P<comment>\#.*)
+      | (?P<string>[rRbBuUfF]{0,2}(?:'''|\"\"\"|'(?:\\.|[^'\\])*'?|"(?:\\.|[^"\\])*"?))
+      | (?P<decorator>^\s*@[\w.]+)
+      | (?P<number>\b(?:0[xXoObB][0-9a-fA-F_]+|\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?[jJ]?)\b)
+      | (?P<name>[A-Za-z_]\w*)
+    """, re.VERBOSE)
+    keywords = frozenset(keyword.kwlist)
+    constants = frozenset(("True", "False", "None", "self", "cls"))
+
+    def tokenize(self, line, state):
+        tokens = []
+        pos = 0
+        if state:
+            close = line.find(state)
+            if close == -1:
+                return ([(0, len(line), "string")] if line else []), state
+            pos = close + 3
+            tokens.append((0, pos, "string"))
+        definition = False
+        while True:
+            match = self.token_pattern.search(line, pos)
+            if match is None:
+                return tokens, ""
+            kind = match.lastgroup
+            start, end = match.span()
+            pos = end
+            if kind == "name":
+                text = match.group()
+                if definition:
+                    tokens.append((start, end, "definition"))
+                elif text in self.constants:
+                    tokens.append((start, end, "constant"))
+                elif text in self.keywords:
+                    tokens.append((start, end, "keyword"))
+                definition = text in ("def", "class")
+                continue
+            definition = False
+            if kind == "string":
+                quote = match.group().lstrip("rRbBuUfF")[:3]
+                if quote in ('"""', "'''"):
+                    close = line.find(quote, end)
+                    if close == -1:
+                        tokens.append((start, len(line), "string"))
+                        return tokens, quote
+                    end = pos = close + 3
+            elif kind == "decorator":
+                start = line.index("@", start)
+            tokens.append((start, end, kind))
+
+
+class JsonLexer(Lexer):
+    token_pattern = re.compile(r"""
+        (?P<string>"(?:\\.|[^"\\])*"?)(?P<colon>\s*:)?
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<constant>\b(?:true|false|null)\b)
+    """, re.VERBOSE)
+
+    def tokenize(self, line, state):
+        tokens = []
+        for match in self.token_pattern.finditer(line):
+            if match.group("string") is not None:
+                tokens.append((match.start(), match.end("string"), "key" if match.group("colon") else "string"))
+            else:
+                tokens.append((match.start(), match.end(), match.lastgroup))
+        return tokens, state
+
+
+class MarkdownLexer(Lexer):
+    fence_pattern = re.compile(r" {0,3}(`{3,}|~{3,})")
+    heading_pattern = re.compile(r" {0,3}#{1,6}(?:\s|$)")
+    quote_pattern = re.compile(r" {0,3}>")
+    list_pattern = re.compile(r"\s*(?:[-*+]|\d+[.)])(?=\s)")
+    inline_pattern = re.compile(r"""
+        (?P<code>(`+).*?(?<!`)\2(?!`))
+      | (?P<link>!?\[[^\]]*\]\([^)]*\))
+      | (?P<strong>\*\*(?=\S).+?(?<=\S)\*\*|__(?=\S).+?(?<=\S)__)
+      | (?P<emphasis>\*(?=[^\s*]).+?(?<=[^\s*])\*|\b_(?=[^\s_]).+?(?<=[^\s_])_\b)
+    """, re.VERBOSE)
+
+    def tokenize(self, line, state):
+        fence = self.fence_pattern.match(line)
+        if state:
+            if fence and fence.group(1)[0] == state[0] and len(fence.group(1)) >= len(state) and not line[fence.end():].strip():
+                state = ""
+            return ([(0, len(line), "code")] if line else []), state
+        if fence:
+            return [(0, len(line), "code")], fence.group(1)
+        if self.heading_pattern.match(line):
+            return [(0, len(line), "heading")], state
+        if self.quote_pattern.match(line):
+            return [(0, len(line), "quote")], state
+        tokens = []
+        pos = 0
+        bullet = self.list_pattern.match(line)
+        if bullet:
+            pos = bullet.end()
+            tokens.append((bullet.end() - len(bullet.group().lstrip()), pos, "list"))
+        for match in self.inline_pattern.finditer(line, pos):
+            tokens.append((match.start(), match.end(), match.lastgroup))
+        return tokens, state
+
+
+LEXERS = {}
+
+
+def register_lexer(lexer_class, *extensions):
+    for extension in extensions:
+        LEXERS[extension.lower()] = lexer_class
+
+
+def lexer_for_path(path):
+    if not path:
+        return None
+    lexer_class = LEXERS.get(os.path.splitext(path)[1].lower())
+    return lexer_class() if lexer_class else None
+
+
+register_lexer(PythonLexer, ".py", ".pyw", ".pyi")
+register_lexer(JsonLexer, ".json", ".geojson", ".ipynb")
+register_lexer(MarkdownLexer, ".md", ".markdown", ".mdown", ".mkd")
+
+
+def iter_lines(document, first, last, block=4096):
+    for start in range(first, last + 1, block):
+        yield from document.lines(start, min(start + block - 1, last)).split("\n")
+
+
+def lex_lines(lexer, document, start_line, first, last, state, cached, dirty_last, wide_astral=False):
+    """Lex lines ``start_line``..``last`` of a document snapshot.
+
+    ``state`` is the state at the start of ``start_line`` and ``cached[i]``
+    the previously cached state at the start of line ``start_line + i + 1``.
+    Once a freshly computed state past ``dirty_last`` matches the cache,
+    every cached state after it is still correct, so lexing jumps straight
+    to ``first``.  Returns the new states (starting with the state at the
+    start of ``start_line + 1``), whether they converged with the cache and
+    the tokens of lines ``first``..``last``, in Tk 8.6 columns if
+    ``wide_astral`` is set.
+    """
+    states = []
+    tokens = []
+    converged = False
+    line = start_line
+    for text in iter_lines(document, start_line, first - 1):
+        state = lexer.tokenize(text, state)[1]
+        states.append(state)
+        index = line - start_line
+        if line >= dirty_last and index < len(cached) and cached[index] == state:
+            converged = True
+            if first - 1 - start_line < len(cached):
+                state = cached[first - 1 - start_line]
+                break
+            converged = False
+        line += 1
+    jumped = converged
+    line = first
+    for text in iter_lines(document, first, last):
+        line_tokens, state = lexer.tokenize(text, state)
+        if wide_astral and textops.ASTRAL.search(text):
+            line_tokens = [(textops.tk_column(text, start), textops.tk_column(text, end), token) for start, end, token in line_tokens]
+        tokens.append(line_tokens)
+        if not jumped and not converged:
+            states.append(state)
+            index = line - start_line
+            if line >= dirty_last and index < len(cached) and cached[index] == state:
+                converged = True
+        line += 1
+    return states, converged, tokens
@@ -0,0 +1,84 @@
+"""Opt-in timing of event handlers, event-loop stalls and file I/O.
+
+Events go into a fixed-size ring buffer as ``(kind, name, start, duration,
+thread, args)`` tuples with ``time.perf_counter`` timestamps.  Appending to
+a bounded deque is atomic, so worker threads record their I/O directly.
+While recording is off, a wrapped callback costs one attribute check.
+The buffer can be exported in the Chrome trace event format, which
+chrome://tracing and Perfetto open directly.  StartupProfile collects the
+timing marks printed by ``--profile-startup``.
+"""
+import collections
+import json
+import os
+import sys
+import threading
+import time
+
+
+class Instrumentation:
+    def __init__(self, capacity=20000, min_duration=0.001):
+        self.enabled = False
+        self.min_duration = min_duration
+        self.events = collections.deque(maxlen=capacity)
+        self.origin = time.perf_counter()
+
+    def wrap(self, name, callback, detail=False):
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return callback(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                if duration >= self.min_duration:
+                    label = f"{name} {args[0]}" if detail and args else name
+                    self.events.append(("handler", label, start, duration, threading.get_ident(), None))
+        return wrapper
+
+    def record(self, kind, name, start, duration, args=None):
+        if self.enabled:
+            self.events.append((kind, name, start, duration, threading.get_ident(), args))
+
+    def record_io(self, name, path, size, start):
+        if self.enabled:
+            self.record("io", f"{name} {os.path.basename(path)}", start, time.perf_counter() - start,
+                        {"path": path, "bytes": size})
+
+    def clear(self):
+        self.events.clear()
+
+    def recent(self, window):
+        since = time.perf_counter() - window
+        return [event for event in list(self.events) if event[2] + event[3] >= since]
+
+    def slowest(self, count=8, window=10.0):
+        return sorted(self.recent(window), key=lambda event: event[3], reverse=True)[:count]
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        for kind, name, start, duration, thread, args in list(self.events):
+            events.append({"name": name, "cat": kind, "ph": "X", "pid": pid, "tid": thread,
+                           "ts": round((start - self.origin) * 1e6, 1), "dur": round(duration * 1e6, 1),
+                           "args": args or {}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w") as file:
+            json.dump(self.chrome_trace(), file)
+
+
+class StartupProfile:
+    def __init__(self, started):
+        self.marks = [("start", started)]
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+
+    def report(self, file=sys.stderr):
+        started = previous = self.marks[0][1]
+        for label, moment in self.marks[1:]:
+            print(f"{(moment - started) * 1000:8.1f} ms  (+{(moment - previous) * 1000:6.1f} ms)  {label}", file=file)
+            previous = moment
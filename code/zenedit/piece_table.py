@@ -0,0 +1,178 @@
+"""Piece-table document model mirrored from ZenEdit's Tk text widget.
+
+The table is a persistent treap of pieces: every edit builds new nodes
+along one path and never mutates existing ones, so a snapshot is just a
+reference to the current root and can be read from another thread while
+editing continues.
+"""
+import bisect
+import random
+import re
+from array import array
+
+
+class Buffer:
+    __slots__ = ("text", "newlines")
+
+    def __init__(self, text):
+        self.text = text
+        if "\n" in text:
+            self.newlines = array("Q", [match.start() for match in re.finditer("\n", text)])
+        else:
+            self.newlines = array("Q")
+
+    def count_newlines(self, start, end):
+        return bisect.bisect_left(self.newlines, end) - bisect.bisect_left(self.newlines, start)
+
+
+class Node:
+    __slots__ = ("buffer", "start", "length", "newlines", "priority", "left", "right", "size", "lines")
+
+    def __init__(self, buffer, start, length, priority, left=None, right=None, newlines=None):
+        self.buffer = buffer
+        self.start = start
+        self.length = length
+        self.newlines = buffer.count_newlines(start, start + length) if newlines is None else newlines
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = length + (left.size if left else 0) + (right.size if right else 0)
+        self.lines = self.newlines + (left.lines if left else 0) + (right.lines if right else 0)
+
+    def with_children(self, left, right):
+        return Node(self.buffer, self.start, self.length, self.priority, left, right, self.newlines)
+
+
+def merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        return left.with_children(left.left, merge(left.right, right))
+    return right.with_children(merge(left, right.left), right.right)
+
+
+def split(node, offset):
+    if node is None:
+        return None, None
+    left_size = node.left.size if node.left else 0
+    if offset <= left_size:
+        left, right = split(node.left, offset)
+        return left, node.with_children(right, node.right)
+    offset -= left_size
+    if offset >= node.length:
+        left, right = split(node.right, offset - node.length)
+        return node.with_children(node.left, left), right
+    left = Node(node.buffer, node.start, offset, node.priority, node.left, None)
+    right = Node(node.buffer, node.start + offset, node.length - offset, node.priority, None, node.right)
+    return left, right
+
+
+def iter_nodes(node):
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+class PieceTable:
+    def __init__(self, text="", root=None):
+        self.root = root
+        if text:
+            self.root = Node(Buffer(text), 0, len(text), random.random())
+
+    def __len__(self):
+        return self.root.size if self.root else 0
+
+    @property
+    def line_count(self):
+        return (self.root.lines if self.root else 0) + 1
+
+    def snapshot(self):
+        return PieceTable(root=self.root)
+
+    def insert(self, offset, text):
+        if not text:
+            return
+        left, right = split(self.root, offset)
+        self.root = merge(merge(left, Node(Buffer(text), 0, len(text), random.random())), right)
+
+    def delete(self, start, end):
+        if end <= start:
+            return
+        left, rest = split(self.root, start)
+        self.root = merge(left, split(rest, end - start)[1])
+
+    def line_start(self, line):
+        newlines = line - 1
+        if newlines <= 0:
+            return 0
+        node = self.root
+        offset = 0
+        while node is not None:
+            left_lines = node.left.lines if node.left else 0
+            if newlines <= left_lines:
+                node = node.left
+                continue
+            newlines -= left_lines
+            offset += node.left.size if node.left else 0
+            if newlines <= node.newlines:
+                positions = node.buffer.newlines
+                position = positions[bisect.bisect_left(positions, node.start) + newlines - 1]
+                return offset + position - node.start + 1
+            newlines -= node.newlines
+            offset += node.length
+            node = node.right
+        return len(self)
+
+    def line_end(self, line):
+        if line >= self.line_count:
+            return len(self)
+        return self.line_start(line + 1) - 1
+
+    def offset(self, line, column=0):
+        return min(self.line_start(line) + column, self.line_end(line))
+
+    def position(self, offset):
+        node = self.root
+        remaining = offset
+        newlines = 0
+        while node is not None:
+            left_size = node.left.size if node.left else 0
+            if remaining < left_size:
+                node = node.left
+                continue
+            newlines += node.left.lines if node.left else 0
+            remaining -= left_size
+            if remaining < node.length:
+                newlines += node.buffer.count_newlines(node.start, node.start + remaining)
+                break
+            newlines += node.newlines
+            remaining -= node.length
+            node = node.right
+        return newlines + 1, offset - self.line_start(newlines + 1)
+
+    def chunks(self, start=0, end=None, size=None):
+        root = self.root
+        if end is not None:
+            root = split(root, end)[0]
+        if start:
+            root = split(root, start)[1]
+        for node in iter_nodes(root):
+            text = node.buffer.text
+            if size is None or node.length <= size:
+                yield text[node.start:node.start + node.length]
+                continue
+            for position in range(node.start, node.start + node.length, size):
+                yield text[position:min(position + size, node.start + node.length)]
+
+    def get(self, start=0, end=None):
+        return "".join(self.chunks(start, end))
+
+    def lines(self, first, last):
+        return self.get(self.line_start(first), self.line_end(last))
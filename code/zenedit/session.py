@@ -0,0 +1,285 @@
+"""Per-session write-ahead edit journal used for crash recovery.
+
+A session directory holds a checkpoint of every open document plus
+numbered journal segments with the edits made since.  The UI thread only
+queues records; packing, writing and fsync happen on a background
+thread.  Each checkpoint starts a new segment, so recovery replays at most
+the edits made after the most recent checkpoint.
+"""
+import json
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+from zenedit.piece_table import PieceTable
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+INSERT, DELETE, RESET, OPEN, CLOSE, STATE = range(1, 7)
+
+FIELDS = struct.Struct("<BIQQ")
+RECORD = struct.Struct("<BIQQII")
+CHECKPOINT_MAGIC = b"ZENCKPT1"
+TRAILER = struct.Struct("<QQQ")
+
+
+def encode_text(text):
+    return text.encode("utf-8", "surrogatepass")
+
+
+def decode_text(data):
+    return data.decode("utf-8", "surrogatepass")
+
+
+def pack_record(op, tab, a=0, b=0, payload=b""):
+    crc = zlib.crc32(payload, zlib.crc32(FIELDS.pack(op, tab, a, b)))
+    return RECORD.pack(op, tab, a, b, len(payload), crc) + payload
+
+
+def iter_records(data):
+    pos = 0
+    while pos + RECORD.size <= len(data):
+        op, tab, a, b, length, crc = RECORD.unpack_from(data, pos)
+        payload = data[pos + RECORD.size:pos + RECORD.size + length]
+        if len(payload) < length or zlib.crc32(payload, zlib.crc32(FIELDS.pack(op, tab, a, b))) != crc:
+            return
+        yield op, tab, a, b, payload
+        pos += RECORD.size + length
+
+
+def lock_file(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    elif msvcrt is not None:
+        msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def file_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+class SessionJournal:
+    def __init__(self, root_directory):
+        os.makedirs(root_directory, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix=f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-", dir=root_directory)
+        self.lock = open(os.path.join(self.directory, "lock"), "a+")
+        lock_file(self.lock)
+        self.segment = 0
+        self.pending = []
+        self.records_since_checkpoint = 0
+        self.bytes_since_checkpoint = 0
+        self.jobs = queue.Queue()
+        self.writer = threading.Thread(target=self.writer_loop, daemon=True)
+        self.writer.start()
+
+    def record(self, op, tab, a=0, b=0, payload=""):
+        last = self.pending[-1] if self.pending else None
+        if last is not None and last[0] == op and last[1] == tab:
+            if op == INSERT and last[2] + len(last[4]) == a:
+                last[4] += payload
+                self.bytes_since_checkpoint += len(payload)
+                return
+            if op == DELETE and b == last[2]:
+                last[2] = a
+                return
+            if op == DELETE and a == last[2]:
+                last[3] += b - a
+                return
+        self.pending.append([op, tab, a, b, payload])
+        self.records_since_checkpoint += 1
+        self.bytes_since_checkpoint += RECORD.size + (len(payload) if isinstance(payload, (str, bytes)) else len(payload) * 2)
+
+    def flush(self):
+        if self.pending:
+            self.jobs.put(("records", self.segment, self.pending))
+            self.pending = []
+
+    def checkpoint(self, tabs):
+        self.flush()
+        self.segment += 1
+        self.records_since_checkpoint = 0
+        self.bytes_since_checkpoint = 0
+        self.jobs.put(("checkpoint", self.segment, tabs))
+
+    def wait(self):
+        self.flush()
+        self.jobs.join()
+
+    def close(self, remove=True):
+        self.flush()
+        self.jobs.put(("close", remove, None))
+        self.writer.join()
+
+    def segment_path(self, segment):
+        return os.path.join(self.directory, f"journal-{segment:08d}")
+
+    def writer_loop(self):
+        while True:
+            kind, value, data = self.jobs.get()
+            try:
+                if kind == "records":
+                    self.write_records(value, data)
+                elif kind == "checkpoint":
+                    write_checkpoint(self.directory, value, data)
+                    for name in os.listdir(self.directory):
+                        if name.startswith("journal-") and int(name[8:]) < value:
+                            os.remove(os.path.join(self.directory, name))
+                else:
+                    self.lock.close()
+                    if value:
+                        shutil.rmtree(self.directory, ignore_errors=True)
+                    return
+            except (OSError, ValueError):
+                pass
+            finally:
+                self.jobs.task_done()
+
+    def write_records(self, segment, records):
+        with open(self.segment_path(segment), "ab") as file:
+            for op, tab, a, b, payload in records:
+                if isinstance(payload, PieceTable):
+                    payload = "".join(payload.chunks())
+                file.write(pack_record(op, tab, a, b, encode_text(payload) if isinstance(payload, str) else payload))
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def write_checkpoint(directory, segment, tabs):
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(CHECKPOINT_MAGIC)
+            metas = []
+            for meta, content in tabs:
+                meta = dict(meta)
+                if isinstance(content, PieceTable):
+                    meta["offset"] = file.tell()
+                    for chunk in content.chunks(size=1024 * 1024):
+                        file.write(encode_text(chunk))
+                    meta["length"] = file.tell() - meta["offset"]
+                elif isinstance(content, bytes):
+                    meta["offset"] = file.tell()
+                    meta["length"] = len(content)
+                    meta["compressed"] = True
+                    file.write(content)
+                metas.append(meta)
+            header = json.dumps(metas).encode("utf-8")
+            offset = file.tell()
+            file.write(header)
+            file.write(TRAILER.pack(segment, offset, len(header)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, os.path.join(directory, "checkpoint"))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def read_checkpoint(directory):
+    try:
+        with open(os.path.join(directory, "checkpoint"), "rb") as file:
+            data = file.read()
+    except OSError:
+        return 0, []
+    if not data.startswith(CHECKPOINT_MAGIC) or len(data) < len(CHECKPOINT_MAGIC) + TRAILER.size:
+        return 0, []
+    segment, offset, length = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+    metas = json.loads(data[offset:offset + length].decode("utf-8"))
+    for meta in metas:
+        if "offset" in meta:
+            blob = data[meta["offset"]:meta["offset"] + meta["length"]]
+            meta["text"] = decode_text(zlib.decompress(blob) if meta.get("compressed") else blob)
+    return segment, metas
+
+
+def read_session(directory):
+    segment, metas = read_checkpoint(directory)
+    tabs = {}
+    active = None
+    for meta in metas:
+        tabs[meta["id"]] = {"meta": meta, "text": meta.pop("text", None), "disk": meta.pop("disk", None), "ops": []}
+        if meta.get("active"):
+            active = meta["id"]
+    segments = sorted(int(name[8:]) for name in os.listdir(directory)
+                      if name.startswith("journal-") and name[8:].isdigit())
+    for number in segments:
+        if number < segment:
+            continue
+        with open(os.path.join(directory, f"journal-{number:08d}"), "rb") as file:
+            data = file.read()
+        for op, tab_id, a, b, payload in iter_records(data):
+            if op == CLOSE:
+                tabs.pop(tab_id, None)
+                continue
+            tab = tabs.setdefault(tab_id, {"meta": {"id": tab_id}, "text": "", "disk": None, "ops": []})
+            if op == INSERT:
+                tab["ops"].append((op, a, decode_text(payload)))
+            elif op == DELETE:
+                tab["ops"].append((op, a, b))
+            elif op == RESET:
+                tab.update(text=decode_text(payload), disk=None, ops=[])
+            elif op == OPEN:
+                tab.update(text=None, disk=json.loads(payload.decode("utf-8")), ops=[])
+            elif op == STATE:
+                tab["meta"].update(json.loads(payload.decode("utf-8")))
+                if tab["meta"].get("active"):
+                    active = tab_id
+    return list(tabs.values()), active
+
+
+def apply_ops(document, ops, history=None):
+    for op, a, arg in ops:
+        size = len(document)
+        if op == INSERT:
+            if history is not None:
+                history.record("insert", min(a, size), arg)
+            document.insert(min(a, size), arg)
+        else:
+            start, end = min(a, size), min(arg, size)
+            if history is not None:
+                history.record("delete", start, document.get(start, end))
+            document.delete(start, end)
+    return document
+
+
+def find_orphaned_sessions(root_directory):
+    orphans = []
+    try:
+        names = sorted(os.listdir(root_directory))
+    except OSError:
+        return orphans
+    for name in names:
+        directory = os.path.join(root_directory, name)
+        try:
+            lock = open(os.path.join(directory, "lock"), "a+")
+        except OSError:
+            continue
+        try:
+            lock_file(lock)
+        except OSError:
+            lock.close()
+            continue
+        orphans.append((directory, lock))
+    return orphans
+
+
+def remove_session(directory, lock):
+    lock.close()
+    shutil.rmtree(directory, ignore_errors=True)
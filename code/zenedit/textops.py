@@ -0,0 +1,142 @@
+"""Pure text operations shared by the editor and the batch CLI."""
+import difflib
+import re
+
+DIFF_LINE_LIMIT = 20000
+ASTRAL = re.compile("[\U00010000-\U0010ffff]")
+LINE_SPANNING = re.compile(r"[\n\t]|\[\^|\\[nsWDxuUN0-7tvrf]")
+
+
+def char_column(text, column):
+    """Convert a Tk 8.6 column, which counts characters outside the BMP as two, into an index into ``text``."""
+    if not ASTRAL.search(text, 0, column):
+        return min(column, len(text))
+    units = 0
+    for index, char in enumerate(text):
+        if units >= column:
+            return index
+        units += 2 if char > "\uffff" else 1
+    return len(text)
+
+
+def tk_column(text, column=None):
+    """Return the Tk 8.6 column of ``text[:column]``."""
+    column = len(text) if column is None else column
+    return column + len(ASTRAL.findall(text, 0, column))
+
+
+def compile_pattern(query, case_sensitive=False, regex=False, whole_word=False):
+    pattern = query if regex else re.escape(query)
+    if whole_word:
+        pattern = rf"\b(?:{pattern})\b"
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+def may_span_lines(pattern):
+    """Return whether ``pattern`` could match a newline, erring towards True."""
+    return bool(pattern.flags & re.DOTALL) or LINE_SPANNING.search(pattern.pattern) is not None
+
+
+def iter_match_indices(text, pattern, first_line=1, wide_astral=False):
+    """Yield each match with its line and column span, in Tk 8.6 columns if ``wide_astral`` is set."""
+    wide_astral = wide_astral and ASTRAL.search(text) is not None
+    line = first_line
+    line_start = 0
+    pos = 0
+    astral_pos = astral = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        newlines = text.count("\n", pos, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind("\n", pos, start) + 1
+            astral_pos, astral = line_start, 0
+        pos = start
+        if text.find("\n", start, end) == -1:
+            end_line, end_line_start = line, line_start
+        else:
+            end_line, end_line_start = line + text.count("\n", start, end), text.rfind("\n", start, end) + 1
+        start_column = start - line_start
+        end_column = end - end_line_start
+        if wide_astral:
+            astral += len(ASTRAL.findall(text, astral_pos, start))
+            astral_pos = start
+            start_column += astral
+            end_column += len(ASTRAL.findall(text, max(start, end_line_start), end))
+            if end_line == line:
+                end_column += astral
+        yield match, line, start_column, end_line, end_column
+
+
+def find_replace_segments(text, pattern, replacement, expand=False, wide_astral=False):
+    segments = []
+    count = 0
+    for match, start_line, start_column, end_line, end_column in iter_match_indices(text, pattern, 1, wide_astral):
+        start, end = match.span()
+        new_text = match.expand(replacement) if expand else replacement
+        count += 1
+        if segments and segments[-1][2] == start_line:
+            segment = segments[-1]
+            segment[5].extend((text[segment[4]:start], new_text))
+            segment[2:5] = [end_line, end_column, end]
+        else:
+            segments.append([start_line, start_column, end_line, end_column, end, [new_text]])
+    return segments, count
+
+
+def replace_line(line, pattern, replacement, expand=False):
+    if expand:
+        return pattern.subn(replacement, line)
+    return pattern.subn(lambda match: replacement, line)
+
+
+def number_lines(lines, start=1):
+    for number, line in enumerate(lines, start):
+        yield f"{number}. {line}"
+
+
+def count_words(text):
+    return len(text.split()), len(text)
+
+
+def split_lines(text):
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def line_diff(old, new):
+    """Return ``(start, end, text)`` edits, in order, that turn ``old`` into ``new``.
+
+    ``start`` and ``end`` are character offsets into ``old``.  Common leading
+    and trailing lines are skipped before diffing; a middle longer than
+    DIFF_LINE_LIMIT lines on both sides is replaced as a single hunk rather
+    than diffed.
+    """
+    old_lines = split_lines(old)
+    new_lines = split_lines(new)
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    old_middle = old_lines[prefix:len(old_lines) - suffix]
+    new_middle = new_lines[prefix:len(new_lines) - suffix]
+    offsets = [sum(map(len, old_lines[:prefix]))]
+    for line in old_middle:
+        offsets.append(offsets[-1] + len(line))
+    if not old_middle and not new_middle:
+        return []
+    if len(old_middle) > DIFF_LINE_LIMIT and len(new_middle) > DIFF_LINE_LIMIT:
+        return [(offsets[0], offsets[-1], "".join(new_middle))]
+    edits = []
+    matcher = difflib.SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag != "equal":
+            edits.append((offsets[old_start], offsets[old_end], "".join(new_middle[new_start:new_end])))
+    return edits
@@ -0,0 +1,164 @@
+"""Bounded undo/redo history made of compact text deltas.
+
+A delta is ``[op, offset, text]`` in document character offsets, where
+``op`` is ``"insert"`` or ``"delete"`` and ``text`` is what was inserted or
+removed.  Consecutive keystrokes merge into one delta.  When the history
+grows past its memory limit, the oldest groups are compressed into an
+anonymous temporary file and read back as undo reaches them.
+"""
+import collections
+import json
+import tempfile
+import time
+import zlib
+
+DELTA_OVERHEAD = 64
+
+
+def group_cost(group):
+    return sum(len(text) + DELTA_OVERHEAD for op, offset, text in group)
+
+
+class UndoHistory:
+    def __init__(self, memory_limit=16 * 1024 * 1024, spill_limit=256 * 1024 * 1024, merge_interval=1.0):
+        self.memory_limit = memory_limit
+        self.spill_limit = spill_limit
+        self.merge_interval = merge_interval
+        self.undo_stack = collections.deque()
+        self.redo_stack = collections.deque()
+        self.memory = 0
+        self.spill_file = None
+        self.undo_spilled = []
+        self.redo_spilled = []
+        self.group_depth = 0
+        self.merging = False
+        self.last_time = 0.0
+
+    def record(self, op, offset, text, now=None):
+        now = time.monotonic() if now is None else now
+        if self.redo_stack or self.redo_spilled:
+            self.memory -= sum(group_cost(group) for group in self.redo_stack)
+            self.redo_stack.clear()
+            self.redo_spilled = []
+        if self.group_depth and self.merging and self.undo_stack:
+            self.undo_stack[-1].append([op, offset, text])
+            self.memory += DELTA_OVERHEAD
+        elif not self.merge(op, offset, text, now):
+            self.undo_stack.append([[op, offset, text]])
+            self.merging = True
+            self.memory += DELTA_OVERHEAD
+        self.memory += len(text)
+        self.last_time = now
+        self.enforce_limits()
+
+    def merge(self, op, offset, text, now):
+        if not self.merging or not self.undo_stack or now - self.last_time > self.merge_interval or len(text) != 1:
+            return False
+        group = self.undo_stack[-1]
+        last = group[-1]
+        if len(group) != 1 or last[0] != op or "\n" in text:
+            return False
+        if op == "insert":
+            if last[1] + len(last[2]) != offset or (text.isspace() and not last[2][-1].isspace()):
+                return False
+            last[2] += text
+        elif offset + 1 == last[1]:
+            last[1] = offset
+            last[2] = text + last[2]
+        elif offset == last[1]:
+            last[2] += text
+        else:
+            return False
+        return True
+
+    def separator(self):
+        if not self.group_depth:
+            self.merging = False
+
+    def begin_group(self):
+        if not self.group_depth:
+            self.undo_stack.append([])
+            self.merging = True
+        self.group_depth += 1
+
+    def end_group(self):
+        self.group_depth -= 1
+        if not self.group_depth:
+            if self.undo_stack and not self.undo_stack[-1]:
+                self.undo_stack.pop()
+            self.merging = False
+
+    def undo(self):
+        return self.move(self.undo_stack, self.undo_spilled, self.redo_stack)
+
+    def redo(self):
+        return self.move(self.redo_stack, self.redo_spilled, self.undo_stack)
+
+    def move(self, source, spilled, target):
+        self.merging = False
+        if not source and spilled:
+            group = self.unspill(spilled.pop())
+            source.append(group)
+            self.memory += group_cost(group)
+        if not source:
+            return None
+        group = source.pop()
+        target.append(group)
+        self.enforce_limits()
+        return group
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.memory = 0
+        self.undo_spilled = []
+        self.redo_spilled = []
+        self.group_depth = 0
+        self.merging = False
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def enforce_limits(self):
+        while self.memory > self.memory_limit:
+            if len(self.undo_stack) > 1:
+                self.undo_spilled.append(self.spill(self.undo_stack.popleft()))
+            elif len(self.redo_stack) > 1:
+                self.redo_spilled.append(self.spill(self.redo_stack.popleft()))
+            else:
+                break
+
+    def spill(self, group):
+        self.memory -= group_cost(group)
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile(prefix="zenedit-undo-")
+        data = zlib.compress(json.dumps(group).encode("utf-8"), 1)
+        self.spill_file.seek(0, 2)
+        entry = (self.spill_file.tell(), len(data))
+        self.spill_file.write(data)
+        live = self.spilled_size() + len(data)
+        for spilled in (self.undo_spilled, self.redo_spilled):
+            while spilled and live > self.spill_limit:
+                live -= spilled.pop(0)[1]
+        if self.spill_file.tell() > 2 * live + 1024 * 1024:
+            entry = self.compact_spill(entry)
+        return entry
+
+    def spilled_size(self):
+        return sum(length for offset, length in self.undo_spilled) + sum(length for offset, length in self.redo_spilled)
+
+    def compact_spill(self, entry):
+        compacted = tempfile.TemporaryFile(prefix="zenedit-undo-")
+        for spilled in (self.undo_spilled, self.redo_spilled, [entry]):
+            for index, (offset, length) in enumerate(spilled):
+                self.spill_file.seek(offset)
+                spilled[index] = (compacted.tell(), length)
+                compacted.write(self.spill_file.read(length))
+        self.spill_file.close()
+        self.spill_file = compacted
+        return spilled[0]
+
+    def unspill(self, entry):
+        offset, length = entry
+        self.spill_file.seek(offset)
+        return json.loads(zlib.decompress(self.spill_file.read(length)).decode("utf-8"))